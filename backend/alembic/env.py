@@ -15,7 +15,7 @@ fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
 # for 'autogenerate' support
-from app.database import Base
+from app.database import Base, engine_options
 from app.models import User, Post, Comment, Like, Notification, Category
 
 target_metadata = Base.metadata
@@ -55,10 +55,12 @@ def run_migrations_online():
     and associate a connection with the context.
 
     """
+    section = config.get_section(config.config_ini_section)
     connectable = engine_from_config(
-        config.get_section(config.config_ini_section),
+        section,
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
+        **engine_options(section["sqlalchemy.url"], pooled=False)
     )
 
     with connectable.connect() as connection:
@@ -0,0 +1,44 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('posts', sa.Column('likes_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('posts', sa.Column('comments_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('posts', sa.Column('last_activity_at', sa.DateTime(), nullable=True))
+
+    # Backfill counters and last activity (the newest comment or like) from
+    # the existing rows
+    op.execute("""
+        UPDATE posts SET
+            likes_count = (SELECT count(*) FROM likes WHERE likes.post_id = posts.id),
+            comments_count = (SELECT count(*) FROM comments WHERE comments.post_id = posts.id),
+            last_activity_at = COALESCE(
+                (SELECT max(activity.created_at) FROM (
+                    SELECT comments.created_at FROM comments WHERE comments.post_id = posts.id
+                    UNION ALL
+                    SELECT likes.created_at FROM likes WHERE likes.post_id = posts.id
+                ) AS activity),
+                posts.created_at
+            )
+    """)
+
+    op.create_index('ix_posts_created_at_id', 'posts', ['created_at', 'id'])
+    op.create_index('ix_posts_likes_count_id', 'posts', ['likes_count', 'id'])
+    op.create_index('ix_posts_comments_count_id', 'posts', ['comments_count', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_posts_comments_count_id', table_name='posts')
+    op.drop_index('ix_posts_likes_count_id', table_name='posts')
+    op.drop_index('ix_posts_created_at_id', table_name='posts')
+    op.drop_column('posts', 'last_activity_at')
+    op.drop_column('posts', 'comments_count')
+    op.drop_column('posts', 'likes_count')
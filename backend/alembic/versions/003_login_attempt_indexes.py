@@ -0,0 +1,29 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def _has_login_attempts():
+    return 'login_attempts' in sa.inspect(op.get_bind()).get_table_names()
+
+
+def upgrade():
+    # login_attempts predates the migrations on some deployments; elsewhere
+    # 018 creates it with these indexes
+    if not _has_login_attempts():
+        return
+    op.create_index('ix_login_attempts_username_created_at', 'login_attempts', ['username', 'created_at'])
+    op.create_index('ix_login_attempts_ip_address_created_at', 'login_attempts', ['ip_address', 'created_at'])
+
+
+def downgrade():
+    if not _has_login_attempts():
+        return
+    op.drop_index('ix_login_attempts_ip_address_created_at', table_name='login_attempts')
+    op.drop_index('ix_login_attempts_username_created_at', table_name='login_attempts')
@@ -0,0 +1,39 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('posts', sa.Column('status', sa.String(), nullable=False, server_default='active'))
+    op.add_column('posts', sa.Column('is_reported', sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.add_column('comments', sa.Column('status', sa.String(), nullable=False, server_default='active'))
+    op.add_column('comments', sa.Column('is_reported', sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.add_column('categories', sa.Column('status', sa.String(), nullable=False, server_default='active'))
+
+    # Filled by the dashboard rollup job on its first run
+    op.create_table(
+        'category_stats',
+        sa.Column('category_id', sa.Integer(), sa.ForeignKey('categories.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('posts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('active_posts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('pending_posts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('reported_posts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('comments', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('likes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table('category_stats')
+    op.drop_column('categories', 'status')
+    op.drop_column('comments', 'is_reported')
+    op.drop_column('comments', 'status')
+    op.drop_column('posts', 'is_reported')
+    op.drop_column('posts', 'status')
@@ -0,0 +1,36 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Backfilled from id 0 by the analytics rollup job on its first runs
+    op.create_table(
+        'analytics_buckets',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('granularity', sa.String(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('metric', sa.String(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=True),
+        sa.Column('value', sa.Integer(), nullable=False),
+    )
+    op.create_index('ix_analytics_buckets_lookup', 'analytics_buckets', ['granularity', 'metric', 'bucket_start'])
+
+    op.create_table(
+        'analytics_watermarks',
+        sa.Column('source', sa.String(), primary_key=True),
+        sa.Column('last_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table('analytics_watermarks')
+    op.drop_index('ix_analytics_buckets_lookup', table_name='analytics_buckets')
+    op.drop_table('analytics_buckets')
@@ -0,0 +1,21 @@
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Per-user (created_at, id) order for the profile activity timeline
+    op.create_index('ix_posts_author_id_created_at_id', 'posts', ['author_id', 'created_at', 'id'])
+    op.create_index('ix_comments_author_id_created_at_id', 'comments', ['author_id', 'created_at', 'id'])
+    op.create_index('ix_likes_user_id_created_at_id', 'likes', ['user_id', 'created_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_likes_user_id_created_at_id', table_name='likes')
+    op.drop_index('ix_comments_author_id_created_at_id', table_name='comments')
+    op.drop_index('ix_posts_author_id_created_at_id', table_name='posts')
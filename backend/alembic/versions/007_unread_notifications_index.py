@@ -0,0 +1,24 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Partial index: read rows, the vast majority over time, are left out
+    op.create_index(
+        'ix_notifications_user_id_unread',
+        'notifications',
+        ['user_id'],
+        postgresql_where=sa.text('read = false'),
+        sqlite_where=sa.text('read = 0')
+    )
+
+
+def downgrade():
+    op.drop_index('ix_notifications_user_id_unread', table_name='notifications')
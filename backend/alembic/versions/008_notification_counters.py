@@ -0,0 +1,31 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('notifications_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('users', sa.Column('unread_notifications_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill counters from the existing rows
+    op.execute("""
+        UPDATE users SET
+            notifications_count = (
+                SELECT count(*) FROM notifications WHERE notifications.user_id = users.id
+            ),
+            unread_notifications_count = (
+                SELECT count(*) FROM notifications
+                WHERE notifications.user_id = users.id AND notifications.read = false
+            )
+    """)
+
+
+def downgrade():
+    op.drop_column('users', 'unread_notifications_count')
+    op.drop_column('users', 'notifications_count')
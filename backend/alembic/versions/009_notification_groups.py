@@ -0,0 +1,19 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('notifications', sa.Column('group_key', sa.String(), nullable=True))
+    op.add_column('notifications', sa.Column('group_count', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    op.drop_column('notifications', 'group_count')
+    op.drop_column('notifications', 'group_key')
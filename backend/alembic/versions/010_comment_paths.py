@@ -0,0 +1,56 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+PATH_SEGMENT_WIDTH = 10
+BACKFILL_BATCH_SIZE = 1000
+
+
+def upgrade():
+    bind = op.get_bind()
+    # Paths are compared bytewise; linguistic collations skip the dots
+    collation = 'C' if bind.dialect.name == 'postgresql' else None
+    op.add_column('comments', sa.Column('path', sa.String(collation=collation), nullable=True))
+
+    # Backfill in id order, so a parent's path is always known first; batches
+    # are id ranges so large tables are neither loaded nor updated at once
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text('SELECT id, parent_id FROM comments WHERE id > :last_id ORDER BY id LIMIT :limit'),
+            {'last_id': last_id, 'limit': BACKFILL_BATCH_SIZE}
+        ).all()
+        if not rows:
+            break
+
+        # Parents from earlier batches already have their path written
+        earlier = {parent_id for _, parent_id in rows if parent_id is not None and parent_id <= last_id}
+        paths = {}
+        if earlier:
+            paths.update(bind.execute(
+                sa.text('SELECT id, path FROM comments WHERE id IN :ids')
+                .bindparams(sa.bindparam('ids', expanding=True)),
+                {'ids': sorted(earlier)}
+            ).all())
+
+        updates = []
+        for comment_id, parent_id in rows:
+            segment = str(comment_id).zfill(PATH_SEGMENT_WIDTH)
+            parent_path = paths.get(parent_id)
+            paths[comment_id] = f'{parent_path}.{segment}' if parent_path else segment
+            updates.append({'id': comment_id, 'path': paths[comment_id]})
+        bind.execute(sa.text('UPDATE comments SET path = :path WHERE id = :id'), updates)
+        last_id = rows[-1][0]
+
+    op.create_index('ix_comments_post_id_path', 'comments', ['post_id', 'path'])
+
+
+def downgrade():
+    op.drop_index('ix_comments_post_id_path', table_name='comments')
+    op.drop_column('comments', 'path')
@@ -0,0 +1,61 @@
+from alembic import op
+from app.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+# PostgreSQL only: on other databases upgrade and downgrade are no-ops, and
+# search runs through the in-process index in services.search instead
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # The generated columns bake the text search configuration in, so it is
+    # the one services.search queries with; changing it needs a new migration
+    language = settings.SEARCH_LANGUAGE
+    if not language.isidentifier():
+        raise ValueError(f"SEARCH_LANGUAGE must be a text search configuration name, got {language!r}")
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Generated columns keep themselves current on every insert and update
+    op.execute(f"""
+        ALTER TABLE posts ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('{language}', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('{language}', coalesce(content, '')), 'B')
+        ) STORED
+    """)
+    op.execute(f"""
+        ALTER TABLE comments ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            to_tsvector('{language}', coalesce(content, ''))
+        ) STORED
+    """)
+    op.create_index('ix_posts_search_vector', 'posts', ['search_vector'], postgresql_using='gin')
+    op.create_index('ix_comments_search_vector', 'comments', ['search_vector'], postgresql_using='gin')
+
+    # Trigram indexes serve fuzzy title matches and the admin ILIKE '%x%' filters
+    for name, table, column in (
+        ('ix_posts_title_trgm', 'posts', 'title'),
+        ('ix_categories_name_trgm', 'categories', 'name'),
+        ('ix_users_username_trgm', 'users', 'username'),
+    ):
+        op.create_index(name, table, [column], postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'})
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_users_username_trgm', table_name='users')
+    op.drop_index('ix_categories_name_trgm', table_name='categories')
+    op.drop_index('ix_posts_title_trgm', table_name='posts')
+    op.drop_index('ix_comments_search_vector', table_name='comments')
+    op.drop_index('ix_posts_search_vector', table_name='posts')
+    op.drop_column('comments', 'search_vector')
+    op.drop_column('posts', 'search_vector')
@@ -0,0 +1,21 @@
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Category feeds filter on category_id IN (subtree) and sort by recency
+    op.create_index(
+        'ix_posts_category_id_created_at_id',
+        'posts',
+        ['category_id', 'created_at', 'id']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_posts_category_id_created_at_id', table_name='posts')
@@ -0,0 +1,93 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'roles',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('name', sa.String(), nullable=False, unique=True),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('permissions', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False, server_default='active'),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_roles_id', 'roles', ['id'])
+
+    op.create_table(
+        'role_assignments',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('role_id', sa.Integer(), sa.ForeignKey('roles.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('assigned_by', sa.Integer(), sa.ForeignKey('users.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('status', sa.String(), nullable=False, server_default='active'),
+        sa.Column('reason', sa.String(), nullable=True),
+        sa.Column('assigned_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_role_assignments_id', 'role_assignments', ['id'])
+    op.create_index('ix_role_assignments_user_id_role_id', 'role_assignments', ['user_id', 'role_id'])
+
+    op.create_table(
+        'activity_logs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('action', sa.String(), nullable=False),
+        sa.Column('resource', sa.String(), nullable=True),
+        sa.Column('resource_id', sa.Integer(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('ip_address', sa.String(), nullable=True),
+        sa.Column('details', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_activity_logs_id', 'activity_logs', ['id'])
+    op.create_index('ix_activity_logs_created_at', 'activity_logs', ['created_at'])
+    op.create_index('ix_activity_logs_user_id_created_at', 'activity_logs', ['user_id', 'created_at'])
+
+    op.create_table(
+        'moderation_logs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('content_id', sa.Integer(), nullable=True),
+        sa.Column('content_type', sa.String(), nullable=False),
+        sa.Column('action', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('moderator_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('reason', sa.Text(), nullable=True),
+        sa.Column('details', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_moderation_logs_id', 'moderation_logs', ['id'])
+    op.create_index('ix_moderation_logs_created_at', 'moderation_logs', ['created_at'])
+
+    op.create_table(
+        'reports',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('reporter_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('reported_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=True),
+        sa.Column('content_id', sa.Integer(), nullable=True),
+        sa.Column('content_type', sa.String(), nullable=False),
+        sa.Column('reason', sa.Text(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False, server_default='pending'),
+        sa.Column('category_id', sa.Integer(), sa.ForeignKey('categories.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('resolved_at', sa.DateTime(), nullable=True),
+        sa.Column('resolution_notes', sa.Text(), nullable=True),
+    )
+    op.create_index('ix_reports_id', 'reports', ['id'])
+    op.create_index('ix_reports_status_created_at', 'reports', ['status', 'created_at'])
+
+
+def downgrade():
+    op.drop_table('reports')
+    op.drop_table('moderation_logs')
+    op.drop_table('activity_logs')
+    op.drop_table('role_assignments')
+    op.drop_table('roles')
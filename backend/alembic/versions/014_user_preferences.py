@@ -0,0 +1,21 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('theme_preference', sa.String(), nullable=True))
+    op.add_column('users', sa.Column('notification_settings', sa.JSON(), nullable=True))
+    op.add_column('users', sa.Column('privacy_settings', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('users', 'privacy_settings')
+    op.drop_column('users', 'notification_settings')
+    op.drop_column('users', 'theme_preference')
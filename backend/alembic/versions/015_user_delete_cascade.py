@@ -0,0 +1,61 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '015'
+down_revision = '014'
+branch_labels = None
+depends_on = None
+
+# Names for the unnamed foreign keys of 001 when SQLite batch mode
+# reflects them; PostgreSQL keeps its own <table>_<column>_fkey names
+NAMING = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+# (table, column, referred table, ON DELETE) for every row owned by a user,
+# directly or through one of their posts
+FOREIGN_KEYS = (
+    ('posts', 'author_id', 'users', 'CASCADE'),
+    ('comments', 'author_id', 'users', 'CASCADE'),
+    ('comments', 'post_id', 'posts', 'CASCADE'),
+    ('comments', 'parent_id', 'comments', 'SET NULL'),
+    ('likes', 'user_id', 'users', 'CASCADE'),
+    ('likes', 'post_id', 'posts', 'CASCADE'),
+    ('notifications', 'user_id', 'users', 'CASCADE'),
+    ('login_attempts', 'user_id', 'users', 'CASCADE'),
+    ('otps', 'user_id', 'users', 'CASCADE'),
+)
+
+
+def _replace_foreign_keys(cascade):
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    by_table = {}
+    for table, column, referred, ondelete in FOREIGN_KEYS:
+        # login_attempts and otps are created outside 001 on some deployments
+        if table in tables:
+            by_table.setdefault(table, []).append((column, referred, ondelete))
+
+    for table, keys in by_table.items():
+        names = {
+            tuple(fk['constrained_columns']): fk['name']
+            for fk in inspector.get_foreign_keys(table)
+        }
+        with op.batch_alter_table(table, naming_convention=NAMING) as batch_op:
+            for column, referred, ondelete in keys:
+                name = names.get((column,)) or NAMING['fk'] % {
+                    'table_name': table, 'column_0_name': column, 'referred_table_name': referred
+                }
+                if (column,) in names:
+                    batch_op.drop_constraint(name, type_='foreignkey')
+                batch_op.create_foreign_key(
+                    name, referred, [column], ['id'], ondelete=ondelete if cascade else None
+                )
+
+
+def upgrade():
+    _replace_foreign_keys(cascade=True)
+
+
+def downgrade():
+    _replace_foreign_keys(cascade=False)
@@ -0,0 +1,20 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '016'
+down_revision = '015'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'analytics_watermarks',
+        sa.Column('pending_ids', sa.JSON(), nullable=False, server_default='[]')
+    )
+
+
+def downgrade():
+    op.drop_column('analytics_watermarks', 'pending_ids')
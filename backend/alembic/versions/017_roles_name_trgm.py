@@ -0,0 +1,29 @@
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '017'
+down_revision = '016'
+branch_labels = None
+depends_on = None
+
+# PostgreSQL only, like the other trigram indexes of 011: roles is created
+# in 013, after them. Serves the admin role filter's ILIKE '%name%'
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_roles_name_trgm', 'roles', ['name'],
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_roles_name_trgm', table_name='roles')
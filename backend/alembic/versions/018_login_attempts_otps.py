@@ -0,0 +1,53 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '018'
+down_revision = '017'
+branch_labels = None
+depends_on = None
+
+
+def _tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade():
+    # Some deployments created these outside the migrations; 003 and 015
+    # already indexed and cascaded those, so only missing tables are made
+    tables = _tables()
+
+    if 'login_attempts' not in tables:
+        op.create_table(
+            'login_attempts',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('username', sa.String(), nullable=True),
+            sa.Column('ip_address', sa.String(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('success', sa.Boolean(), nullable=True),
+            sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=True),
+        )
+        op.create_index('ix_login_attempts_id', 'login_attempts', ['id'])
+        op.create_index('ix_login_attempts_username', 'login_attempts', ['username'])
+        op.create_index('ix_login_attempts_username_created_at', 'login_attempts', ['username', 'created_at'])
+        op.create_index('ix_login_attempts_ip_address_created_at', 'login_attempts', ['ip_address', 'created_at'])
+
+    if 'otps' not in tables:
+        op.create_table(
+            'otps',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=True),
+            sa.Column('code', sa.String(), nullable=True),
+            sa.Column('expires_at', sa.DateTime(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+        )
+        op.create_index('ix_otps_id', 'otps', ['id'])
+
+
+def downgrade():
+    tables = _tables()
+    if 'otps' in tables:
+        op.drop_table('otps')
+    if 'login_attempts' in tables:
+        op.drop_table('login_attempts')
@@ -1,21 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
+from datetime import datetime
 from ..services import admin as admin_service
+from ..services.security import get_current_admin
 from ..schemas import admin as schemas
 from ..database import get_db
-from ..auth import get_current_user
-from ..models import User
+from ..utils.serialization import FastJSONResponse
 
 router = APIRouter(
     prefix="/admin",
     tags=["admin"],
-    dependencies=[Depends(get_current_user)],
+    dependencies=[Depends(get_current_admin)],
 )
 
 # Dashboard
 @router.get("/dashboard/stats", response_model=schemas.AdminDashboardStats)
-async def get_dashboard_stats(db: Session = Depends(get_db)):
+async def get_dashboard_stats(db: AsyncSession = Depends(get_db)):
     return await admin_service.get_dashboard_stats(db)
 
 # Activity Logs
@@ -28,13 +29,13 @@ async def get_activity_logs(
     resource: Optional[str] = None,
     resource_id: Optional[int] = None,
     status: Optional[str] = None,
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     sort_by: str = "created_at",
     sort_order: str = "desc",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    return await admin_service.get_activity_logs(
+    logs = await admin_service.get_activity_logs(
         db,
         page,
         page_size,
@@ -48,6 +49,8 @@ async def get_activity_logs(
         sort_by,
         sort_order
     )
+    # Already validated when the service built it; encode it as is
+    return FastJSONResponse(logs)
 
 # Notifications
 @router.get("/notifications", response_model=schemas.AdminNotificationList)
@@ -55,40 +58,42 @@ async def get_notifications(
     page: int = 1,
     page_size: int = 20,
     user_id: Optional[int] = None,
-    type: Optional[str] = None,
-    status: Optional[str] = None,
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
+    read: Optional[bool] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     sort_by: str = "created_at",
     sort_order: str = "desc",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     return await admin_service.get_notifications(
         db,
         page,
         page_size,
         user_id,
-        type,
-        status,
+        read,
         start_date,
         end_date,
         sort_by,
         sort_order
     )
 
-@router.post("/notifications/{notification_id}/read")
+@router.post("/notifications/{notification_id}/read", response_model=schemas.AdminNotification)
 async def mark_notification_as_read(
     notification_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     return await admin_service.mark_notification_as_read(db, notification_id)
 
-@router.post("/notifications/read-all")
-async def mark_all_notifications_as_read(db: Session = Depends(get_db)):
-    return await admin_service.mark_all_notifications_as_read(db)
+@router.post("/notifications/read-all", status_code=status.HTTP_204_NO_CONTENT)
+async def mark_all_notifications_as_read(
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_admin)
+):
+    # The calling admin's own notifications, as on the member endpoint
+    await admin_service.mark_all_notifications_as_read(db, current_user.id)
 
 # Role Management
-@router.get("/roles", response_model=schemas.AdminRoleList)
+@router.get("/roles", response_model=schemas.RoleListResponse)
 async def get_roles(
     page: int = 1,
     page_size: int = 20,
@@ -96,7 +101,7 @@ async def get_roles(
     status: Optional[str] = None,
     sort_by: str = "name",
     sort_order: str = "asc",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     return await admin_service.get_roles(
         db,
@@ -111,24 +116,24 @@ async def get_roles(
 @router.post("/roles", response_model=schemas.AdminRole)
 async def create_role(
     role: schemas.AdminRoleCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    return await admin_service.create_role(db, role)
+    return await admin_service.AdminService(db).create_role(role)
 
 @router.put("/roles/{role_id}", response_model=schemas.AdminRole)
 async def update_role(
     role_id: int,
     role: schemas.AdminRoleUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    return await admin_service.update_role(db, role_id, role)
+    return await admin_service.AdminService(db).update_role(role_id, role)
 
-@router.delete("/roles/{role_id}")
+@router.delete("/roles/{role_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_role(
     role_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    return await admin_service.delete_role(db, role_id)
+    await admin_service.AdminService(db).delete_role(role_id)
 
 # Role Assignments
 @router.get("/roles/assignments", response_model=schemas.AdminRoleAssignmentList)
@@ -140,7 +145,7 @@ async def get_role_assignments(
     status: Optional[str] = None,
     sort_by: str = "assigned_at",
     sort_order: str = "desc",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     return await admin_service.get_role_assignments(
         db,
@@ -156,9 +161,12 @@ async def get_role_assignments(
 @router.post("/roles/assign", response_model=schemas.AdminRoleAssignment)
 async def assign_role(
     assignment: schemas.AdminRoleAssignmentCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_admin)
 ):
-    return await admin_service.assign_role(db, assignment)
+    return await admin_service.assign_role(
+        db, assignment.user_id, assignment.role_id, current_user.id, assignment.reason
+    )
 
 # Content Moderation
 @router.get("/moderation/logs", response_model=schemas.ModerationLogList)
@@ -169,11 +177,11 @@ async def get_moderation_logs(
     content_type: Optional[str] = None,
     action: Optional[str] = None,
     status: Optional[str] = None,
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     sort_by: str = "created_at",
     sort_order: str = "desc",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     return await admin_service.get_moderation_logs(
         db,
@@ -192,37 +200,43 @@ async def get_moderation_logs(
 @router.post("/moderation/action")
 async def moderate_content(
     action: schemas.ModerationAction,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_admin)
 ):
-    return await admin_service.moderate_content(db, action)
+    return await admin_service.moderate_content(
+        db, action.content_id, action.content_type, action.action, current_user.id, action.reason
+    )
 
 @router.post("/moderation/{content_type}/{content_id}/approve")
 async def approve_content(
     content_type: str,
     content_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_admin)
 ):
-    return await admin_service.approve_content(db, content_type, content_id)
+    return await admin_service.moderate_content(db, content_id, content_type, "approve", current_user.id)
 
 @router.post("/moderation/{content_type}/{content_id}/reject")
 async def reject_content(
     content_type: str,
     content_id: int,
     reason: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_admin)
 ):
-    return await admin_service.reject_content(db, content_type, content_id, reason)
+    return await admin_service.moderate_content(db, content_id, content_type, "reject", current_user.id, reason)
 
 @router.delete("/moderation/{content_type}/{content_id}")
 async def delete_content(
     content_type: str,
     content_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_admin)
 ):
-    return await admin_service.delete_content(db, content_type, content_id)
+    return await admin_service.moderate_content(db, content_id, content_type, "delete", current_user.id)
 
 # Categories
-@router.get("/categories", response_model=schemas.CategoryList)
+@router.get("/categories", response_model=schemas.CategoryListResponse)
 async def get_categories(
     page: int = 1,
     page_size: int = 20,
@@ -230,7 +244,7 @@ async def get_categories(
     status: Optional[str] = None,
     sort_by: str = "name",
     sort_order: str = "asc",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     return await admin_service.get_categories(
         db,
@@ -242,27 +256,27 @@ async def get_categories(
         sort_order
     )
 
-@router.post("/categories", response_model=schemas.Category)
+@router.post("/categories", response_model=schemas.CategoryResponse)
 async def create_category(
     category: schemas.CategoryCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    return await admin_service.create_category(db, category)
+    return await admin_service.AdminService(db).create_category(category)
 
-@router.put("/categories/{category_id}", response_model=schemas.Category)
+@router.put("/categories/{category_id}", response_model=schemas.CategoryResponse)
 async def update_category(
     category_id: int,
     category: schemas.CategoryUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    return await admin_service.update_category(db, category_id, category)
+    return await admin_service.AdminService(db).update_category(category_id, category)
 
-@router.delete("/categories/{category_id}")
+@router.delete("/categories/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_category(
     category_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    return await admin_service.delete_category(db, category_id)
+    await admin_service.AdminService(db).delete_category(category_id)
 
 # User Management
 @router.get("/users/{user_id}/activity", response_model=schemas.AdminActivityLogList)
@@ -272,23 +286,23 @@ async def get_user_activity(
     page_size: int = 20,
     action: Optional[str] = None,
     resource: Optional[str] = None,
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     sort_by: str = "created_at",
     sort_order: str = "desc",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    return await admin_service.get_user_activity(
+    return await admin_service.get_activity_logs(
         db,
-        user_id,
         page,
         page_size,
+        user_id,
         action,
         resource,
-        start_date,
-        end_date,
-        sort_by,
-        sort_order
+        start_date=start_date,
+        end_date=end_date,
+        sort_by=sort_by,
+        sort_order=sort_order
     )
 
 @router.get("/users/{user_id}/notifications", response_model=schemas.AdminNotificationList)
@@ -296,21 +310,19 @@ async def get_user_notifications(
     user_id: int,
     page: int = 1,
     page_size: int = 20,
-    type: Optional[str] = None,
-    status: Optional[str] = None,
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
+    read: Optional[bool] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     sort_by: str = "created_at",
     sort_order: str = "desc",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    return await admin_service.get_user_notifications(
+    return await admin_service.get_notifications(
         db,
-        user_id,
         page,
         page_size,
-        type,
-        status,
+        user_id,
+        read,
         start_date,
         end_date,
         sort_by,
@@ -321,14 +333,17 @@ async def get_user_notifications(
 async def ban_user(
     user_id: int,
     reason: str,
-    duration: Optional[str] = None,
-    db: Session = Depends(get_db)
+    duration: Optional[int] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_admin)
 ):
-    return await admin_service.ban_user(db, user_id, reason, duration)
+    # `duration` in days; without it the ban is permanent
+    return await admin_service.ban_user(db, user_id, current_user.id, reason, duration)
 
 @router.post("/users/{user_id}/unban")
 async def unban_user(
     user_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_admin)
 ):
-    return await admin_service.unban_user(db, user_id)
+    return await admin_service.unban_user(db, user_id, current_user.id)
@@ -1,123 +1,169 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+import hashlib
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
 from datetime import datetime
-from ..services import forum
-from ..schemas import forum as schemas
-from ..database import get_db
-from ..security import get_current_user
+from ...services import response_cache
+from ...services.forum import ForumService
+from ...schemas import forum as schemas
+from ...database import get_db
+from ...repositories import CategoryRepository
+from ...models import Post
+from ...services.security import get_current_principal
+from ...utils.serialization import FastJSONResponse, schema_columns
 
 router = APIRouter()
+forum_service = ForumService()
+
+POST_COLUMNS = schema_columns(Post, schemas.Post)
+
+def _viewer_key(request: Request) -> str:
+    """Stable per-viewer key for view dedup: the bearer token, else address and agent."""
+    identity = request.headers.get("authorization") or "{}|{}".format(
+        request.client.host if request.client else "unknown",
+        request.headers.get("user-agent", "")
+    )
+    return hashlib.blake2b(identity.encode(), digest_size=12).hexdigest()
 
 @router.post("/posts", response_model=schemas.Post)
 async def create_post(
     post: schemas.PostCreate,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    return forum.create_post(db, post, current_user.id)
+    return await forum_service.create_post(db, post, current_user.id)
 
-@router.get("/posts", response_model=List[schemas.Post])
+@router.get("/posts", response_model=Union[schemas.PostPage, List[schemas.Post]])
 async def get_posts(
     skip: int = 0,
     limit: int = 100,
     category: Optional[str] = None,
     sort_by: str = "created_at",
     order: str = "desc",
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    include_subcategories: bool = False,
+    db: AsyncSession = Depends(get_db)
 ):
-    return forum.get_posts(db, skip, limit, category, sort_by, order)
+    # Passing `cursor` (empty for the first page) switches to keyset paging
+    # and the PostPage envelope; skip/limit clients keep getting a list.
+    if cursor is not None:
+        posts, next_cursor = await forum_service.get_posts_page(
+            db, cursor, limit, category, sort_by, order, include_subcategories
+        )
+        return FastJSONResponse({"posts": posts, "next_cursor": next_cursor}, model=schemas.PostPage)
+    posts = await forum_service.get_post_rows(
+        db, POST_COLUMNS, skip, limit, category, sort_by, order, include_subcategories
+    )
+    return FastJSONResponse(posts, model=List[schemas.Post])
 
 @router.get("/posts/{post_id}", response_model=schemas.PostWithComments)
 async def get_post(
     post_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    async def build():
+        post = await forum_service.get_post(db, post_id)
+        comments = await forum_service.get_post_comments(db, post_id)
+        return schemas.PostWithComments(post=post, comments=comments)
+    # Buffered views show up when the entry expires, not on every hit
+    return await response_cache.cached_response(
+        request, build, schemas.PostWithComments, [f"post:{post_id}"]
+    )
+
+@router.get("/posts/{post_id}/comments", response_model=schemas.CommentThread)
+async def get_comment_thread(
+    post_id: int,
+    parent_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    db: AsyncSession = Depends(get_db)
 ):
-    post = forum.get_post(db, post_id)
-    comments = forum.get_post_comments(db, post_id)
-    return schemas.PostWithComments(post=post, comments=comments)
+    comments, next_cursor = await forum_service.get_comment_thread(db, post_id, parent_id, cursor, limit)
+    return schemas.CommentThread(comments=comments, next_cursor=next_cursor)
 
 @router.put("/posts/{post_id}", response_model=schemas.Post)
 async def update_post(
     post_id: int,
     post: schemas.PostUpdate,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    return forum.update_post(db, post_id, post, current_user.id)
+    return await forum_service.update_post(db, post_id, post, current_user.id)
 
 @router.delete("/posts/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_post(
     post_id: int,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    forum.delete_post(db, post_id, current_user.id)
+    await forum_service.delete_post(db, post_id, current_user.id)
 
 @router.post("/comments", response_model=schemas.Comment)
 async def create_comment(
     comment: schemas.CommentCreate,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    return forum.create_comment(db, comment, current_user.id)
+    return await forum_service.create_comment(db, comment, current_user.id)
 
 @router.put("/comments/{comment_id}", response_model=schemas.Comment)
 async def update_comment(
     comment_id: int,
     comment: schemas.CommentUpdate,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    return forum.update_comment(db, comment_id, comment, current_user.id)
+    return await forum_service.update_comment(db, comment_id, comment, current_user.id)
 
 @router.delete("/comments/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_comment(
     comment_id: int,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    forum.delete_comment(db, comment_id, current_user.id)
+    await forum_service.delete_comment(db, comment_id, current_user.id)
 
 @router.post("/likes", response_model=schemas.Like)
 async def create_like(
     like: schemas.LikeCreate,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    return forum.create_like(db, like.post_id, current_user.id)
+    return await forum_service.create_like(db, like.post_id, current_user.id)
 
 @router.delete("/likes/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def remove_like(
     post_id: int,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    forum.remove_like(db, post_id, current_user.id)
+    await forum_service.remove_like(db, post_id, current_user.id)
 
 @router.get("/categories", response_model=List[schemas.Category])
 async def get_categories(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    return db.query(schemas.Category).all()
+    return await CategoryRepository(db).list()
 
 @router.post("/categories", response_model=schemas.Category)
 async def create_category(
     category: schemas.CategoryCreate,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only admins can create categories"
         )
-    return forum.create_category(db, category)
+    return await forum_service.create_category(db, category)
 
 @router.get("/posts/{post_id}/views", response_model=schemas.Post)
 async def increment_post_views(
     post_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_db)
 ):
-    post = forum.increment_post_views(db, post_id)
+    post = await forum_service.increment_post_views(db, post_id, viewer=_viewer_key(request))
     return post
@@ -1,101 +1,147 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, WebSocket, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from ..services import notification
-from ..schemas import notification as schemas
-from ..database import get_db
-from ..security import get_current_user
+from ...services import websocket
+from ...services.notification import NotificationService
+from ...schemas import notification as schemas
+from ...database import get_db
+from ...services.security import get_current_principal
+from ...models import Notification
+from ...utils.conditional import make_etag, is_not_modified
+from ...utils.serialization import FastJSONResponse, schema_columns
 
 router = APIRouter()
+notification_service = NotificationService()
+
+NOTIFICATION_COLUMNS = schema_columns(Notification, schemas.Notification)
 
 @router.post("/notifications", response_model=schemas.Notification)
 async def create_notification(
     notification: schemas.NotificationCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    return notification.create_notification(db, notification)
+    return await notification_service.create_notification(db, notification)
 
 @router.get("/notifications", response_model=schemas.NotificationList)
 async def get_notifications(
     skip: int = 0,
     limit: int = 50,
     read: Optional[bool] = None,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    notifications = notification.get_notifications(
-        db, current_user.id, skip, limit, read
-    )
-    total_count = notification.get_unread_notification_count(db, current_user.id)
-    unread_count = notification.get_unread_notification_count(db, current_user.id)
-    
-    return schemas.NotificationList(
-        notifications=notifications,
-        total_count=total_count,
-        unread_count=unread_count
+    notifications = await notification_service.get_notification_rows(
+        db, NOTIFICATION_COLUMNS, current_user.id, skip, limit, read
     )
+    counts = await notification_service.get_notification_counts(db, current_user.id)
+
+    return FastJSONResponse({
+        "notifications": notifications,
+        "total_count": counts["total"],
+        "unread_count": counts["unread"]
+    }, model=schemas.NotificationList)
 
 @router.put("/notifications/{notification_id}/read", response_model=schemas.Notification)
 async def mark_notification_as_read(
     notification_id: int,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    return notification.mark_notification_as_read(db, notification_id)
+    return await notification_service.mark_notification_as_read(db, notification_id)
 
 @router.put("/notifications/read-all", response_model=schemas.NotificationList)
 async def mark_all_notifications_as_read(
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    notification.mark_all_notifications_as_read(db, current_user.id)
-    notifications = notification.get_notifications(
+    await notification_service.mark_all_notifications_as_read(db, current_user.id)
+    notifications = await notification_service.get_notifications(
         db, current_user.id, 0, 50
     )
-    total_count = notification.get_unread_notification_count(db, current_user.id)
-    unread_count = notification.get_unread_notification_count(db, current_user.id)
-    
+    counts = await notification_service.get_notification_counts(db, current_user.id)
+
     return schemas.NotificationList(
         notifications=notifications,
-        total_count=total_count,
-        unread_count=unread_count
+        total_count=counts["total"],
+        unread_count=counts["unread"]
     )
 
 @router.delete("/notifications/{notification_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_notification(
     notification_id: int,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    notification.delete_notification(db, notification_id)
+    await notification_service.delete_notification(db, notification_id)
 
 @router.get("/notifications/unread-count", response_model=int)
 async def get_unread_notification_count(
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    return notification.get_unread_notification_count(db, current_user.id)
+    unread = await notification_service.get_unread_notification_count(db, current_user.id)
+    # Polling clients revalidate with If-None-Match and get an empty 304
+    headers = {"ETag": make_etag("unread", current_user.id, unread), "Cache-Control": "private, no-cache"}
+    if is_not_modified(request, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return unread
+
+# Browsers cannot set headers on WebSocket or EventSource requests, so the
+# push endpoints take the access token as a query parameter
+@router.websocket("/notifications/ws")
+async def notifications_socket(
+    websocket_connection: WebSocket,
+    token: str,
+    db: AsyncSession = Depends(get_db)
+):
+    try:
+        current_user = await get_current_principal(token, db)
+    except HTTPException:
+        await websocket_connection.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    # Release the pooled connection; the socket may stay open for hours
+    await db.close()
+    await websocket_connection.accept()
+    await websocket.serve_websocket(websocket_connection, current_user.id)
+
+@router.get("/notifications/stream")
+async def notifications_stream(
+    request: Request,
+    token: str,
+    db: AsyncSession = Depends(get_db)
+):
+    current_user = await get_current_principal(token, db)
+    await db.close()
+    return StreamingResponse(
+        websocket.event_stream(request, current_user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @router.post("/notifications/post", response_model=schemas.Notification)
 async def create_post_notification(
     post_id: int,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    return notification.create_post_notification(db, post_id, current_user.id)
+    return await notification_service.create_post_notification(db, post_id, current_user.id)
 
 @router.post("/notifications/comment", response_model=schemas.Notification)
 async def create_comment_notification(
     comment_id: int,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    return notification.create_comment_notification(db, comment_id, current_user.id)
+    return await notification_service.create_comment_notification(db, comment_id, current_user.id)
 
 @router.post("/notifications/like", response_model=schemas.Notification)
 async def create_like_notification(
     post_id: int,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    return notification.create_like_notification(db, post_id, current_user.id)
+    return await notification_service.create_like_notification(db, post_id, current_user.id)
@@ -1,19 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from ..services import profile
-from ..schemas import profile as schemas
-from ..database import get_db
-from ..security import get_current_user
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+from ...services.profile import ProfileService
+from ...schemas import profile as schemas
+from ...database import get_db
+from ...services.security import get_current_principal
+from ...utils.conditional import make_etag, is_not_modified
 
 router = APIRouter()
+profile_service = ProfileService()
 
 @router.get("/profile", response_model=schemas.ProfileResponse)
 async def get_profile(
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    profile_data = profile.get_user_profile(db, current_user.id)
+    profile_data = await profile_service.get_user_profile(db, current_user.id)
     return schemas.ProfileResponse(
         profile=profile_data["user"],
         stats=schemas.ProfileStats(
@@ -29,72 +31,84 @@ async def get_profile(
 @router.put("/profile", response_model=schemas.Profile)
 async def update_profile(
     profile: schemas.ProfileUpdate,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    return profile.update_profile(db, current_user.id, profile)
+    return await profile_service.update_profile(db, current_user.id, profile)
 
 @router.get("/profile/stats", response_model=schemas.ProfileStats)
 async def get_profile_stats(
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    stats = profile.get_user_stats(db, current_user.id)
+    stats = await profile_service.get_user_stats(db, current_user.id)
     return schemas.ProfileStats(**stats)
 
-@router.get("/profile/activity", response_model=List[schemas.ProfileActivityItem])
+@router.get("/profile/activity", response_model=Union[schemas.ProfileActivityPage, List[schemas.ProfileActivityItem]])
 async def get_profile_activity(
     skip: int = 0,
     limit: int = 50,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    return profile.get_user_activity(db, current_user.id, skip, limit)
+    # Passing `cursor` (empty for the first page) switches to keyset paging
+    if cursor is not None:
+        activity, next_cursor = await profile_service.get_user_activity_page(db, current_user.id, cursor, limit)
+        return schemas.ProfileActivityPage(activity=activity, next_cursor=next_cursor)
+    return await profile_service.get_user_activity(db, current_user.id, skip, limit)
 
 @router.get("/profile/preferences", response_model=schemas.ProfilePreferences)
 async def get_profile_preferences(
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    return profile.get_user_preferences(db, current_user.id)
+    return await profile_service.get_user_preferences(db, current_user.id)
 
 @router.put("/profile/preferences", response_model=schemas.Profile)
 async def update_profile_preferences(
     preferences: schemas.ProfilePreferences,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    return profile.update_user_preferences(db, current_user.id, preferences)
+    return await profile_service.update_user_preferences(db, current_user.id, preferences)
 
 @router.get("/profile/notifications", response_model=List[schemas.ProfileNotification])
 async def get_profile_notifications(
     skip: int = 0,
     limit: int = 50,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    return profile.get_user_notifications(db, current_user.id, skip, limit)
+    return await profile_service.get_user_notifications(db, current_user.id, skip, limit)
 
 @router.put("/profile/notifications/{notification_id}/read", response_model=schemas.ProfileNotification)
 async def mark_notification_as_read(
     notification_id: int,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    return profile.mark_notification_as_read(db, notification_id)
+    return await profile_service.mark_notification_as_read(db, notification_id)
 
 @router.put("/profile/notifications/read-all", response_model=List[schemas.ProfileNotification])
 async def mark_all_notifications_as_read(
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    notifications = profile.get_user_notifications(db, current_user.id, 0, 50)
-    profile.mark_all_notifications_as_read(db, current_user.id)
+    notifications = await profile_service.get_user_notifications(db, current_user.id, 0, 50)
+    await profile_service.mark_all_notifications_as_read(db, current_user.id)
     return notifications
 
 @router.get("/profile/notifications/unread-count", response_model=int)
 async def get_unread_notification_count(
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_principal)
 ):
-    return profile.get_unread_notification_count(db, current_user.id)
+    unread = await profile_service.get_unread_notification_count(db, current_user.id)
+    headers = {"ETag": make_etag("unread", current_user.id, unread), "Cache-Control": "private, no-cache"}
+    if is_not_modified(request, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return unread
@@ -14,15 +14,17 @@ from ..schemas import (
     OTPVerifyRequest, ResetPasswordRequest, UserUpdate, ChangePasswordRequest
 )
 from ..services.security import (
-    verify_password, get_password_hash, create_access_token,
-    create_refresh_token, validate_password_strength, get_password_hash,
-    generate_otp, verify_otp, get_current_user, get_current_active_user
+    verify_password_async, get_password_hash_async, rehash_password_if_needed,
+    create_access_token, create_refresh_token, validate_password_strength,
+    generate_otp, verify_otp, get_current_user, get_current_active_user,
+    oauth2_scheme, forget_token, invalidate_user_cache
 )
 from ..services.email import send_verification_email, send_password_reset_email, send_otp_email
 from ..database import get_db
 from ..config import settings
 from ..utils.recaptcha import verify_recaptcha
 from ..utils.rate_limiter import rate_limiter
+from ..services.login_attempts import count_failed_attempts, note_failed_attempt
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -30,13 +32,7 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 async def get_failed_login_attempts(db: AsyncSession, username: str, ip_address: str) -> int:
     """Get the number of failed login attempts for a username/IP."""
-    query = select(LoginAttempt).where(
-        (LoginAttempt.username == username) | 
-        (LoginAttempt.ip_address == ip_address),
-        LoginAttempt.created_at > datetime.utcnow() - timedelta(hours=1)
-    )
-    result = await db.execute(query)
-    return len(result.scalars().all())
+    return await count_failed_attempts(db, username, ip_address)
 
 async def record_failed_login_attempt(
     db: AsyncSession, 
@@ -52,6 +48,7 @@ async def record_failed_login_attempt(
         user_agent="unknown"  # We'll set this from the request when needed
     )
     db.add(attempt)
+    await note_failed_attempt(username, ip_address)
     
     # Also update user's failed login count
     if username:
@@ -148,7 +145,7 @@ async def register(
         )
     
     # Hash password
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     
     # Create user with default role
     db_user = User(
@@ -247,7 +244,7 @@ async def login(
             )
     
     # Verify password
-    if not verify_password(form_data.password, db_user.hashed_password):
+    if not await verify_password_async(form_data.password, db_user.hashed_password):
         await record_failed_login_attempt(db, db_user.username, client_ip, "Invalid password")
         remaining_attempts = settings.MAX_LOGIN_ATTEMPTS - (db_user.failed_login_attempts + 1)
         
@@ -291,6 +288,9 @@ async def login(
     # Reset failed login attempts on successful login
     await reset_failed_login_attempts(db, db_user.username)
     
+    # Upgrade the stored hash if the configured bcrypt cost changed
+    await rehash_password_if_needed(db_user, form_data.password)
+    
     # Update last login time
     db_user.last_login = datetime.utcnow()
     await db.commit()
@@ -480,12 +480,13 @@ async def reset_password(
         )
     
     # Update password and clear reset token
-    user.hashed_password = get_password_hash(reset_data.new_password)
+    user.hashed_password = await get_password_hash_async(reset_data.new_password)
     user.reset_token = None
     user.reset_token_expires = None
     user.failed_login_attempts = 0  # Reset failed attempts
     db.add(user)
     await db.commit()
+    invalidate_user_cache(user.username)
     
     return {"message": "Password reset successful"}
 
@@ -544,6 +545,7 @@ async def refresh_token(
 @router.post("/logout", status_code=status.HTTP_200_OK)
 async def logout(
     response: Response,
+    token: str = Depends(oauth2_scheme),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -553,6 +555,10 @@ async def logout(
     db.add(current_user)
     await db.commit()
     
+    # Drop cached identity for this session
+    forget_token(token)
+    invalidate_user_cache(current_user.username)
+    
     # Clear cookies
     response.delete_cookie("access_token")
     response.delete_cookie("refresh_token")
@@ -573,6 +579,8 @@ async def update_current_user(
     db: AsyncSession = Depends(get_db)
 ):
     """Update current user information."""
+    previous_username = current_user.username
+    
     # Update only the provided fields
     for field, value in user_update.dict(exclude_unset=True).items():
         setattr(current_user, field, value)
@@ -580,6 +588,7 @@ async def update_current_user(
     db.add(current_user)
     await db.commit()
     await db.refresh(current_user)
+    invalidate_user_cache(previous_username)
     
     return current_user
 
@@ -591,7 +600,7 @@ async def change_password(
 ):
     """Change current user's password."""
     # Verify current password
-    if not verify_password(password_data.current_password, current_user.hashed_password):
+    if not await verify_password_async(password_data.current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
@@ -605,9 +614,10 @@ async def change_password(
         )
     
     # Update password
-    current_user.hashed_password = get_password_hash(password_data.new_password)
+    current_user.hashed_password = await get_password_hash_async(password_data.new_password)
     db.add(current_user)
     await db.commit()
+    invalidate_user_cache(current_user.username)
     
     return {"message": "Password updated successfully"}
 
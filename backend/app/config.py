@@ -11,6 +11,15 @@ class Settings(BaseSettings):
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     
+    # Database engine
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() == "true"
+    
     # Email settings
     MAIL_USERNAME: str = os.getenv("MAIL_USERNAME", "")
     MAIL_PASSWORD: str = os.getenv("MAIL_PASSWORD", "")
@@ -18,6 +27,91 @@ class Settings(BaseSettings):
     MAIL_PORT: int = int(os.getenv("MAIL_PORT", "587"))
     MAIL_SERVER: str = os.getenv("MAIL_SERVER", "smtp.gmail.com")
     
+    # Authentication caches
+    TOKEN_CACHE_SIZE: int = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+    USER_CACHE_SIZE: int = int(os.getenv("USER_CACHE_SIZE", "10000"))
+    USER_CACHE_TTL: int = int(os.getenv("USER_CACHE_TTL", "60"))
+    
+    # Password hashing
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+    
+    # Login throttling
+    MAX_LOGIN_ATTEMPTS: int = int(os.getenv("MAX_LOGIN_ATTEMPTS", "5"))
+    LOGIN_LOCKOUT_MINUTES: int = int(os.getenv("LOGIN_LOCKOUT_MINUTES", "15"))
+    LOGIN_ATTEMPT_WINDOW_MINUTES: int = int(os.getenv("LOGIN_ATTEMPT_WINDOW_MINUTES", "60"))
+    LOGIN_ATTEMPT_COUNTER: str = os.getenv("LOGIN_ATTEMPT_COUNTER", "")  # "", "memory" or "redis"
+    
+    # Redis and rate limiting
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")  # "memory" or "redis"
+    RATE_LIMIT_MAX_KEYS: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", "10000"))
+    # After a Redis error, limit in-process for this long before trying it again
+    RATE_LIMIT_RETRY_SECONDS: float = float(os.getenv("RATE_LIMIT_RETRY_SECONDS", "5"))
+    
+    # Background jobs (seconds, 0 disables)
+    COUNTER_RECONCILE_INTERVAL: int = int(os.getenv("COUNTER_RECONCILE_INTERVAL", "900"))
+    LOGIN_ATTEMPT_PRUNE_INTERVAL: int = int(os.getenv("LOGIN_ATTEMPT_PRUNE_INTERVAL", "3600"))
+    DASHBOARD_ROLLUP_INTERVAL: int = int(os.getenv("DASHBOARD_ROLLUP_INTERVAL", "60"))
+    # Every Nth rollup run rebuilds all categories, picking up deleted posts
+    DASHBOARD_ROLLUP_FULL_EVERY: int = int(os.getenv("DASHBOARD_ROLLUP_FULL_EVERY", "60"))
+    ANALYTICS_ROLLUP_INTERVAL: int = int(os.getenv("ANALYTICS_ROLLUP_INTERVAL", "300"))
+    ANALYTICS_ROLLUP_BATCH_SIZE: int = int(os.getenv("ANALYTICS_ROLLUP_BATCH_SIZE", "50000"))
+    # Trailing ids re-checked on every run for rows committed out of id order
+    ANALYTICS_ROLLUP_OVERLAP: int = int(os.getenv("ANALYTICS_ROLLUP_OVERLAP", "1000"))
+    
+    # Admin dashboard
+    DASHBOARD_CACHE_TTL: int = int(os.getenv("DASHBOARD_CACHE_TTL", "30"))
+
+    # Notification counters
+    NOTIFICATION_COUNT_CACHE_SIZE: int = int(os.getenv("NOTIFICATION_COUNT_CACHE_SIZE", "10000"))
+    NOTIFICATION_COUNT_CACHE_TTL: int = int(os.getenv("NOTIFICATION_COUNT_CACHE_TTL", "5"))
+
+    # Real-time notification push
+    REALTIME_BROKER: str = os.getenv("REALTIME_BROKER", "memory")  # "memory" or "redis"
+    REALTIME_QUEUE_SIZE: int = int(os.getenv("REALTIME_QUEUE_SIZE", "100"))
+    REALTIME_HEARTBEAT_INTERVAL: int = int(os.getenv("REALTIME_HEARTBEAT_INTERVAL", "25"))
+    REALTIME_SEND_TIMEOUT: int = int(os.getenv("REALTIME_SEND_TIMEOUT", "10"))
+
+    # Notification fan-out
+    NOTIFICATION_FANOUT: str = os.getenv("NOTIFICATION_FANOUT", "background")  # "celery", "background" or "eager"
+    CELERY_BROKER_URL: str = os.getenv("CELERY_BROKER_URL", os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    FANOUT_QUEUE_SIZE: int = int(os.getenv("FANOUT_QUEUE_SIZE", "10000"))
+    FANOUT_BATCH_SIZE: int = int(os.getenv("FANOUT_BATCH_SIZE", "500"))
+
+    # Post view counting
+    VIEW_COUNTER_BACKEND: str = os.getenv("VIEW_COUNTER_BACKEND", "memory")  # "memory" or "redis"
+    VIEW_FLUSH_INTERVAL: int = int(os.getenv("VIEW_FLUSH_INTERVAL", "10"))
+    # Repeat views of a post by one viewer within this many seconds count once (0 disables)
+    VIEW_DEDUP_WINDOW: int = int(os.getenv("VIEW_DEDUP_WINDOW", "1800"))
+    VIEW_DEDUP_CAPACITY: int = int(os.getenv("VIEW_DEDUP_CAPACITY", "100000"))
+
+    # Search; migration 011 builds the PostgreSQL tsvector columns with this
+    # text search configuration, so set it before migrating and keep it
+    SEARCH_LANGUAGE: str = os.getenv("SEARCH_LANGUAGE", "english")
+
+    # Response compression; brotli is used when the package is installed
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+    # Cached responses of public read endpoints
+    RESPONSE_CACHE_BACKEND: str = os.getenv("RESPONSE_CACHE_BACKEND", "memory")  # "memory", "redis" or "off"
+    RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", "5000"))
+    RESPONSE_CACHE_TTL: int = int(os.getenv("RESPONSE_CACHE_TTL", "30"))
+    # Browser freshness; 0 makes clients revalidate every time (cheap 304s)
+    RESPONSE_CACHE_MAX_AGE: int = int(os.getenv("RESPONSE_CACHE_MAX_AGE", "0"))
+
+    # Category tree snapshot; writes in the same process rebuild it at once
+    CATEGORY_TREE_TTL: int = int(os.getenv("CATEGORY_TREE_TTL", "300"))
+
+    # User profiles
+    PROFILE_RECENT_LIMIT: int = int(os.getenv("PROFILE_RECENT_LIMIT", "10"))
+    PROFILE_CACHE_SIZE: int = int(os.getenv("PROFILE_CACHE_SIZE", "10000"))
+    PROFILE_CACHE_TTL: int = int(os.getenv("PROFILE_CACHE_TTL", "60"))
+    
     class Config:
         case_sensitive = True
 
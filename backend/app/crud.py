@@ -1,17 +1,19 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
-from typing import Optional
-from .models import User
+from sqlalchemy import tuple_
+from typing import List, Optional, Tuple
+from .models import User, Post, Category, Notification, loader_options
 from .schemas.user import UserCreate
-from app.services.security import get_password_hash
+from app.services.security import get_password_hash_async
+from app.utils.pagination import encode_cursor, decode_cursor
 
 async def create_user(db: AsyncSession, user: UserCreate) -> User:
     """Create a new user."""
     db_user = User(
         username=user.username,
         email=user.email,
-        hashed_password=get_password_hash(user.password),
+        hashed_password=await get_password_hash_async(user.password),
         full_name=user.full_name,
         date_of_birth=user.date_of_birth,
         country=user.country
@@ -57,3 +59,61 @@ async def delete_user(db: AsyncSession, user_id: int) -> bool:
         await db.commit()
         return True
     return False
+
+async def get_posts(db: AsyncSession, skip: int = 0, limit: int = 10) -> List[Post]:
+    """Get newest posts with offset pagination."""
+    query = (
+        select(Post)
+        .options(*loader_options("crud.post_feed"))
+        .order_by(Post.created_at.desc(), Post.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    result = await db.execute(query)
+    return result.scalars().all()
+
+async def get_posts_page(
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    limit: int = 10
+) -> Tuple[List[Post], Optional[str]]:
+    """Get newest posts after a keyset cursor on (created_at, id)."""
+    query = select(Post).options(*loader_options("crud.post_feed"))
+    position = decode_cursor(cursor, "key", "id", sort="created_at", order="desc")
+    if position:
+        query = query.where(tuple_(Post.created_at, Post.id) < (position["key"], position["id"]))
+    query = query.order_by(Post.created_at.desc(), Post.id.desc()).limit(limit + 1)
+
+    result = await db.execute(query)
+    posts = result.scalars().all()
+
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = encode_cursor(
+            {"key": posts[-1].created_at, "id": posts[-1].id, "sort": "created_at", "order": "desc"}
+        )
+    return posts, next_cursor
+
+async def get_post(db: AsyncSession, post_id: int) -> Optional[Post]:
+    """Get a post by id with its author."""
+    query = select(Post).options(*loader_options("crud.post_feed")).where(Post.id == post_id)
+    result = await db.execute(query)
+    return result.scalar_one_or_none()
+
+async def get_categories(db: AsyncSession) -> List[Category]:
+    """Get every category, by name."""
+    result = await db.execute(select(Category).order_by(Category.name, Category.id))
+    return result.scalars().all()
+
+async def get_notifications(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 10) -> List[Notification]:
+    """Get a user's newest notifications with offset pagination."""
+    query = (
+        select(Notification)
+        .where(Notification.user_id == user_id)
+        .order_by(Notification.created_at.desc(), Notification.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    result = await db.execute(query)
+    return result.scalars().all()
@@ -1,6 +1,6 @@
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, event
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
 from typing import AsyncGenerator
@@ -9,7 +9,51 @@ from app.config import settings
 class Base(DeclarativeBase):
     pass
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
+def engine_options(url: str, pooled: bool = True) -> dict:
+    """Engine keyword arguments from Settings, shared with alembic/env.py."""
+    options = {
+        "echo": settings.DB_ECHO,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    # In-memory SQLite gets a StaticPool (SingletonThreadPool without
+    # aiosqlite), which rejects sizing arguments; file databases get a queue
+    # pool, left at SQLAlchemy's defaults since SQLite serializes writers
+    if pooled and not url.startswith("sqlite"):
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    if "+asyncpg" in url:
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE
+        }
+    return options
+
+def pool_status() -> dict:
+    """Live connection counts for the app engine's pool."""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return {"pool": type(pool).__name__}
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+
+engine = create_async_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+
+if settings.DATABASE_URL.startswith("sqlite"):
+    # SQLite ignores foreign keys, ON DELETE included, unless asked per connection
+    @event.listens_for(engine.sync_engine, "connect")
+    def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 SessionLocal = sessionmaker(
     engine,
     class_=AsyncSession,
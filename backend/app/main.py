@@ -1,11 +1,10 @@
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse, JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Session
 from sqlalchemy.future import select
-from typing import List, Optional
+from typing import List, Optional, Union
 from datetime import datetime
 import os
 from dotenv import load_dotenv
@@ -13,15 +12,22 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-from app.database import get_db, engine
+from app.config import settings
+from app.database import get_db, engine, pool_status
 from app.models import Base
-from app.schemas.user import UserResponse, UserCreate, UserLogin
-from app.schemas.post import PostResponse, PostCreate
+from app.schemas.user import UserInDB, UserResponse, UserCreate, UserLogin
+from app.schemas.post import PostResponse, PostCreate, PostCursorResponse, SearchPage
 from app.schemas.forum import Category, Comment, CommentCreate, Like, LikeCreate
 from app.schemas.notification import Notification
 from app.models import User as UserModel
-from app.crud import create_user
-from app.services import security, auth
+from app import crud
+from app.services import security, auth, categories, fanout, response_cache, search, websocket
+from app.services.profile import ProfileService
+from app.services import analytics, counters, dashboard, login_attempts, views  # registers periodic jobs
+from app.utils.scheduler import start_periodic_tasks, stop_periodic_tasks
+from app.utils.compression import CompressionMiddleware, compression_stats
+from app.api import admin as admin_api
+from app.api.v1 import forum as forum_api, notification as notification_api, profile as profile_api
 
 app = FastAPI(title="Rianzel Official Website API")
 
@@ -34,72 +40,150 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
+@app.on_event("startup")
+async def start_background_jobs():
+    start_periodic_tasks()
+    websocket.get_hub().start()
+    fanout.start()
+    await categories.warm_category_tree()
+
+@app.on_event("shutdown")
+async def stop_background_jobs():
+    await stop_periodic_tasks()
+    await fanout.stop()
+    # Write out buffered view counts before the process exits
+    await views.flush_views_job()
+    await websocket.get_hub().stop()
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
+# Versioned API, the frontend's default base URL
+for router in (forum_api.router, notification_api.router, profile_api.router, admin_api.router):
+    app.include_router(router, prefix="/api/v1")
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to Rianzel Official Website API"}
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "database_pool": pool_status(),
+        "password_hashing": security.password_hash_pool.stats(),
+        "realtime": websocket.get_hub().stats(),
+        "compression": compression_stats.stats()
+    }
 
 # Authentication endpoints
 @app.post("/api/auth/register", response_model=UserResponse)
 async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
-    return crud.create_user(db=db, user=user)
+    return await crud.create_user(db=db, user=user)
 
 @app.post("/api/auth/login", response_model=UserResponse)
-async def login(user: UserLogin, db: Session = Depends(get_db)):
+async def login(user: UserLogin, db: AsyncSession = Depends(get_db)):
     return security.authenticate_user(db, user.username, user.password)
 
 # User endpoints
 @app.get("/api/users/me", response_model=UserResponse)
-async def read_users_me(current_user: UserModel = Depends(security.get_current_user)):
-    return current_user
+async def read_users_me(
+    current_user: UserModel = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    # Activity counts are not columns on users; count them like the profile does
+    counts = await ProfileService().get_user_stats(db, current_user.id)
+    return UserResponse(
+        **UserInDB.model_validate(current_user).model_dump(),
+        posts_count=counts["posts"],
+        comments_count=counts["comments"],
+        likes_count=counts["likes"],
+        notifications_count=current_user.notifications_count,
+        unread_notifications_count=current_user.unread_notifications_count
+    )
 
 @app.get("/api/users/{user_id}", response_model=UserResponse)
-async def read_user(user_id: int, db: Session = Depends(get_db)):
-    return crud.get_user(db, user_id)
+async def read_user(user_id: int, db: AsyncSession = Depends(get_db)):
+    return await crud.get_user(db, user_id)
 
 # Post endpoints
 @app.post("/api/posts", response_model=PostResponse)
-async def create_post(post: PostCreate, db: Session = Depends(get_db)):
-    return crud.create_post(db=db, post=post)
+async def create_post(post: PostCreate, db: AsyncSession = Depends(get_db)):
+    return await crud.create_post(db=db, post=post)
 
-@app.get("/api/posts", response_model=List[PostResponse])
-async def read_posts(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    return crud.get_posts(db, skip=skip, limit=limit)
+@app.get("/api/posts", response_model=Union[PostCursorResponse, List[PostResponse]])
+async def read_posts(
+    request: Request,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    # `cursor` (empty for the first page) opts into keyset paging.
+    if cursor is not None:
+        async def build():
+            posts, next_cursor = await crud.get_posts_page(db, cursor=cursor, limit=limit)
+            return PostCursorResponse(posts=posts, next_cursor=next_cursor)
+        return await response_cache.cached_response(request, build, PostCursorResponse, ["posts"])
+    return await response_cache.cached_response(
+        request, lambda: crud.get_posts(db, skip=skip, limit=limit), List[PostResponse], ["posts"]
+    )
 
 @app.get("/api/posts/{post_id}", response_model=PostResponse)
-async def read_post(post_id: int, db: Session = Depends(get_db)):
-    return crud.get_post(db, post_id)
+async def read_post(post_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    async def build():
+        post = await crud.get_post(db, post_id)
+        if post is None:
+            raise HTTPException(status_code=404, detail="Post not found")
+        return post
+    return await response_cache.cached_response(request, build, PostResponse, [f"post:{post_id}"])
+
+# Search endpoint
+@app.get("/api/search", response_model=SearchPage)
+async def search_content(
+    q: str,
+    type: str = "post",
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    db: AsyncSession = Depends(get_db)
+):
+    results, next_cursor = await search.search(db, q, type, cursor, limit)
+    return SearchPage(results=results, next_cursor=next_cursor)
 
 # Category endpoints
 @app.get("/api/categories", response_model=List[Category])
-async def read_categories(db: Session = Depends(get_db)):
-    return crud.get_categories(db)
+async def read_categories(request: Request, db: AsyncSession = Depends(get_db)):
+    return await response_cache.cached_response(
+        request, lambda: crud.get_categories(db), List[Category], ["categories"]
+    )
 
 # Comment endpoints
 @app.post("/api/comments", response_model=Comment)
-async def create_comment(comment: CommentCreate, db: Session = Depends(get_db)):
-    return crud.create_comment(db=db, comment=comment)
+async def create_comment(comment: CommentCreate, db: AsyncSession = Depends(get_db)):
+    return await crud.create_comment(db=db, comment=comment)
 
 # Like endpoints
 @app.post("/api/likes", response_model=Like)
-async def create_like(like: LikeCreate, db: Session = Depends(get_db)):
-    return crud.create_like(db=db, like=like)
+async def create_like(like: LikeCreate, db: AsyncSession = Depends(get_db)):
+    return await crud.create_like(db=db, like=like)
 
 # Notification endpoints
 @app.get("/api/notifications", response_model=List[Notification])
 async def read_notifications(
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(security.get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: security.UserPrincipal = Depends(security.get_current_principal)
 ):
-    return crud.get_notifications(db, current_user.id, skip, limit)
+    return await crud.get_notifications(db, current_user.id, skip, limit)
 
 # Maintenance mode endpoint
 @app.get("/api/maintenance")
@@ -1,5 +1,8 @@
 from .core_models import Base, UserRole, User, Post, Category, Comment, Like, Notification
 from .login_attempt import LoginAttempt
 from .otp import OTP
+from .stats import CategoryStats, AnalyticsBucket, AnalyticsWatermark
+from .admin import Role, RoleAssignment, ActivityLog, ModerationLog, Report
+from .loaders import LOADER_PROFILES, loader_options
 
-__all__ = ['Base', 'UserRole', 'User', 'Post', 'Category', 'Comment', 'Like', 'Notification', 'LoginAttempt', 'OTP']
+__all__ = ['Base', 'UserRole', 'User', 'Post', 'Category', 'Comment', 'Like', 'Notification', 'LoginAttempt', 'OTP', 'CategoryStats', 'AnalyticsBucket', 'AnalyticsWatermark', 'Role', 'RoleAssignment', 'ActivityLog', 'ModerationLog', 'Report', 'LOADER_PROFILES', 'loader_options']
@@ -0,0 +1,110 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, JSON
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from .core_models import Base
+
+class Role(Base):
+    __tablename__ = "roles"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False)
+    description = Column(String, nullable=True)
+    permissions = Column(JSON, default=list, nullable=False)
+    status = Column(String, default="active", nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<Role {self.name}>"
+
+class RoleAssignment(Base):
+    __tablename__ = "role_assignments"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    role_id = Column(Integer, ForeignKey("roles.id", ondelete="CASCADE"), nullable=False)
+    assigned_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    status = Column(String, default="active", nullable=False)
+    reason = Column(String, nullable=True)
+    assigned_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_role_assignments_user_id_role_id", "user_id", "role_id"),
+    )
+
+    def __repr__(self):
+        return f"<RoleAssignment {self.user_id}:{self.role_id}>"
+
+class ActivityLog(Base):
+    """Audit trail of admin and user actions."""
+    __tablename__ = "activity_logs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    action = Column(String, nullable=False)
+    resource = Column(String, nullable=True)
+    resource_id = Column(Integer, nullable=True)
+    status = Column(String, nullable=True)
+    description = Column(Text, nullable=True)
+    ip_address = Column(String, nullable=True)
+    details = Column(JSON, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_activity_logs_created_at", "created_at"),
+        Index("ix_activity_logs_user_id_created_at", "user_id", "created_at"),
+    )
+
+    def __repr__(self):
+        return f"<ActivityLog {self.action}>"
+
+class ModerationLog(Base):
+    __tablename__ = "moderation_logs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Empty for user-level actions (bans), which set content_type "user"
+    content_id = Column(Integer, nullable=True)
+    content_type = Column(String, nullable=False)
+    action = Column(String, nullable=False)
+    status = Column(String, nullable=True)
+    moderator_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    reason = Column(Text, nullable=True)
+    details = Column(JSON, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_moderation_logs_created_at", "created_at"),
+    )
+
+    # Relationships
+    moderator = relationship("User", lazy="raise")
+
+    def __repr__(self):
+        return f"<ModerationLog {self.action} {self.content_type}:{self.content_id}>"
+
+class Report(Base):
+    __tablename__ = "reports"
+
+    id = Column(Integer, primary_key=True, index=True)
+    reporter_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    reported_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    content_id = Column(Integer, nullable=True)
+    content_type = Column(String, nullable=False)
+    reason = Column(Text, nullable=False)
+    status = Column(String, default="pending", nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    resolved_at = Column(DateTime, nullable=True)
+    resolution_notes = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_reports_status_created_at", "status", "created_at"),
+    )
+
+    # Relationships
+    reporter = relationship("User", foreign_keys=[reporter_id], lazy="raise")
+    reported = relationship("User", foreign_keys=[reported_id], lazy="raise")
+    category = relationship("Category", lazy="raise")
+
+    def __repr__(self):
+        return f"<Report {self.id}>"
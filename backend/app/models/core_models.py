@@ -1,5 +1,5 @@
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Index, JSON, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from enum import Enum
@@ -26,14 +26,24 @@ class User(Base):
     is_verified = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     last_login = Column(DateTime, nullable=True)
+    # Denormalized notification counters, maintained by NotificationService
+    # writes and periodically reconciled by services.counters
+    notifications_count = Column(Integer, default=0, nullable=False)
+    unread_notifications_count = Column(Integer, default=0, nullable=False)
+    # Profile preferences, edited through ProfileService
+    theme_preference = Column(String, nullable=True)
+    notification_settings = Column(JSON, nullable=True)
+    privacy_settings = Column(JSON, nullable=True)
     
-    # Relationships
-    posts = relationship("Post", back_populates="author", lazy="selectin")
-    comments = relationship("Comment", back_populates="author", lazy="selectin")
-    likes = relationship("Like", back_populates="user", lazy="selectin")
-    notifications = relationship("Notification", back_populates="user", lazy="selectin")
-    login_attempts = relationship("LoginAttempt", back_populates="user", lazy="selectin")
-    otps = relationship("OTP", back_populates="user", lazy="selectin")
+    # Relationships. Never loaded implicitly: a user's history is unbounded,
+    # so queries opt in through models.loaders profiles. Deleting a user
+    # leaves the children to the ON DELETE CASCADE of their foreign keys.
+    posts = relationship("Post", back_populates="author", lazy="raise", passive_deletes=True)
+    comments = relationship("Comment", back_populates="author", lazy="raise", passive_deletes=True)
+    likes = relationship("Like", back_populates="user", lazy="raise", passive_deletes=True)
+    notifications = relationship("Notification", back_populates="user", lazy="raise", passive_deletes=True)
+    login_attempts = relationship("LoginAttempt", back_populates="user", lazy="raise", passive_deletes=True)
+    otps = relationship("OTP", back_populates="user", lazy="raise", passive_deletes=True)
 
     def __repr__(self):
         return f"<User {self.username}>"
@@ -45,16 +55,33 @@ class Post(Base):
     title = Column(String)
     content = Column(Text)
     category_id = Column(Integer, ForeignKey("categories.id"))
-    author_id = Column(Integer, ForeignKey("users.id"))
+    author_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     views = Column(Integer, default=0)
+    # Denormalized counters, maintained by ForumService writes and
+    # periodically reconciled by services.counters
+    likes_count = Column(Integer, default=0, nullable=False)
+    comments_count = Column(Integer, default=0, nullable=False)
+    last_activity_at = Column(DateTime, default=datetime.utcnow)
+    # Moderation state, read by the admin dashboard and moderation queue
+    status = Column(String, default="active", nullable=False)
+    is_reported = Column(Boolean, default=False, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        Index("ix_posts_likes_count_id", "likes_count", "id"),
+        Index("ix_posts_comments_count_id", "comments_count", "id"),
+        Index("ix_posts_author_id_created_at_id", "author_id", "created_at", "id"),
+        Index("ix_posts_category_id_created_at_id", "category_id", "created_at", "id"),
+    )
     
     # Relationships
-    author = relationship("User", back_populates="posts", lazy="selectin")
-    category = relationship("Category", back_populates="posts", lazy="selectin")
-    comments = relationship("Comment", back_populates="post", lazy="selectin", cascade="all, delete-orphan")
-    likes = relationship("Like", back_populates="post", lazy="selectin", cascade="all, delete-orphan")
+    author = relationship("User", back_populates="posts", lazy="raise")
+    category = relationship("Category", back_populates="posts", lazy="raise")
+    # Plain lazy loads so the delete-orphan cascade can still fetch them
+    comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
+    likes = relationship("Like", back_populates="post", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<Post {self.title}>"
@@ -66,6 +93,7 @@ class Category(Base):
     name = Column(String, unique=True)
     description = Column(String)
     parent_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
+    status = Column(String, default="active", nullable=False)
     
     # Relationships
     posts = relationship("Post", back_populates="category")
@@ -80,10 +108,22 @@ class Comment(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text)
-    post_id = Column(Integer, ForeignKey("posts.id"))
-    author_id = Column(Integer, ForeignKey("users.id"))
-    parent_id = Column(Integer, ForeignKey("comments.id"), nullable=True)
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"))
+    author_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    # Replies outlive a deleted parent, as with ForumService.delete_comment
+    parent_id = Column(Integer, ForeignKey("comments.id", ondelete="SET NULL"), nullable=True)
+    # Materialized path: ancestor ids down to this comment's own, each
+    # zero-padded and dot-separated, so path order is thread order. Paths
+    # must compare bytewise: linguistic collations skip the dots
+    path = Column(String().with_variant(String(collation="C"), "postgresql"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    status = Column(String, default="active", nullable=False)
+    is_reported = Column(Boolean, default=False, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_comments_author_id_created_at_id", "author_id", "created_at", "id"),
+        Index("ix_comments_post_id_path", "post_id", "path"),
+    )
     
     # Relationships
     post = relationship("Post", back_populates="comments")
@@ -98,10 +138,14 @@ class Like(Base):
     __tablename__ = "likes"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
-    post_id = Column(Integer, ForeignKey("posts.id"))
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"))
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        Index("ix_likes_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="likes")
     post = relationship("Post", back_populates="likes")
@@ -113,10 +157,24 @@ class Notification(Base):
     __tablename__ = "notifications"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     message = Column(String)
     read = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Unread notifications sharing a key (e.g. likes on one post) are
+    # coalesced into one row by the fan-out pipeline
+    group_key = Column(String, nullable=True)
+    group_count = Column(Integer, default=1, nullable=False)
+
+    __table_args__ = (
+        # Only unread rows are indexed, for mark-all-read and unread counts
+        Index(
+            "ix_notifications_user_id_unread",
+            "user_id",
+            postgresql_where=text("read = false"),
+            sqlite_where=text("read = 0")
+        ),
+    )
     
     # Relationships
     user = relationship("User", back_populates="notifications")
@@ -0,0 +1,39 @@
+from typing import Dict, Tuple
+from sqlalchemy.orm import joinedload
+from .core_models import Post
+from .admin import Report
+
+# Relationships on User and Post default to lazy="raise", so every query
+# must say up front which relationships it will serialize. Profiles name
+# those choices per use site; an empty profile means "columns only".
+
+LOADER_PROFILES: Dict[str, Tuple] = {
+    # ForumService feed and detail: schemas.forum.Post is columns only
+    "forum.post_list": (),
+    "forum.post_detail": (),
+    # Public /api/posts and /api/posts/{id}: PostResponse nests the author
+    "crud.post_feed": (
+        joinedload(Post.author),
+    ),
+    # ProfileService: the profile schema is built from User columns and
+    # separate bounded queries, never from User collections
+    "profile.user": (),
+    # AdminService content views show author and category names
+    "admin.content": (
+        joinedload(Post.author),
+        joinedload(Post.category),
+    ),
+    # AdminService report list names the reporter, reported user and category
+    "admin.reports": (
+        joinedload(Report.reporter),
+        joinedload(Report.reported),
+        joinedload(Report.category),
+    ),
+}
+
+def loader_options(profile: str) -> Tuple:
+    """Return the loader options registered for a profile."""
+    try:
+        return LOADER_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown loader profile: {profile}")
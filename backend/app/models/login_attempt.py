@@ -1,5 +1,5 @@
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .core_models import Base
@@ -12,7 +12,12 @@ class LoginAttempt(Base):
     ip_address = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
     success = Column(Boolean, default=False)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    
+    __table_args__ = (
+        Index("ix_login_attempts_username_created_at", "username", "created_at"),
+        Index("ix_login_attempts_ip_address_created_at", "ip_address", "created_at"),
+    )
     
     # Relationships
     user = relationship("User", back_populates="login_attempts")
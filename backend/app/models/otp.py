@@ -8,7 +8,7 @@ class OTP(Base):
     __tablename__ = "otps"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     code = Column(String)
     expires_at = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,52 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, JSON
+from datetime import datetime
+from .core_models import Base
+
+class CategoryStats(Base):
+    """Per-category post rollup, refreshed by services.dashboard."""
+    __tablename__ = "category_stats"
+
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    posts = Column(Integer, default=0, nullable=False)
+    active_posts = Column(Integer, default=0, nullable=False)
+    pending_posts = Column(Integer, default=0, nullable=False)
+    reported_posts = Column(Integer, default=0, nullable=False)
+    comments = Column(Integer, default=0, nullable=False)
+    likes = Column(Integer, default=0, nullable=False)
+    refreshed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<CategoryStats {self.category_id}>"
+
+class AnalyticsBucket(Base):
+    """Append-only analytics counts per time bucket, metric and category.
+
+    Each rollup run appends the delta for the rows it processed, so one
+    bucket can span several rows; readers always sum `value`.
+    """
+    __tablename__ = "analytics_buckets"
+
+    id = Column(Integer, primary_key=True)
+    granularity = Column(String, nullable=False)  # "hour" or "day"
+    bucket_start = Column(DateTime, nullable=False)
+    metric = Column(String, nullable=False)  # "users", "posts", "comments", "likes"
+    category_id = Column(Integer, nullable=True)
+    value = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_analytics_buckets_lookup", "granularity", "metric", "bucket_start"),
+    )
+
+    def __repr__(self):
+        return f"<AnalyticsBucket {self.granularity} {self.metric} {self.bucket_start}>"
+
+class AnalyticsWatermark(Base):
+    """Highest source row id already folded into analytics_buckets."""
+    __tablename__ = "analytics_watermarks"
+
+    source = Column(String, primary_key=True)
+    last_id = Column(Integer, default=0, nullable=False)
+    # Ids at or below last_id, within the overlap window, that were not
+    # visible when scanned; counted if they show up on a later run
+    pending_ids = Column(JSON, default=list, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
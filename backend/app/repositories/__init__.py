@@ -0,0 +1,16 @@
+from .base import Repository
+from .forum import PostRepository, CommentRepository, LikeRepository, CategoryRepository
+from .notification import NotificationRepository
+from .user import UserRepository
+
+# Admin repositories live in .admin and are imported from there directly
+
+__all__ = [
+    'Repository',
+    'PostRepository',
+    'CommentRepository',
+    'LikeRepository',
+    'CategoryRepository',
+    'NotificationRepository',
+    'UserRepository'
+]
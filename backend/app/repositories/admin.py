@@ -0,0 +1,17 @@
+from ..models import Role, ActivityLog, ModerationLog, RoleAssignment, Report
+from .base import Repository
+
+class RoleRepository(Repository[Role]):
+    model = Role
+
+class ActivityLogRepository(Repository[ActivityLog]):
+    model = ActivityLog
+
+class ModerationLogRepository(Repository[ModerationLog]):
+    model = ModerationLog
+
+class RoleAssignmentRepository(Repository[RoleAssignment]):
+    model = RoleAssignment
+
+class ReportRepository(Repository[Report]):
+    model = Report
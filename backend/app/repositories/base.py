@@ -0,0 +1,112 @@
+from typing import Any, Dict, Generic, Iterable, List, Optional, Sequence, Type, TypeVar
+from sqlalchemy import select, insert, update, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+ModelT = TypeVar("ModelT")
+
+# Rows per multi-row INSERT, kept well under driver bind-parameter limits
+INSERT_BATCH_SIZE = 1000
+
+class Repository(Generic[ModelT]):
+    """Awaitable data access for one mapped model over an AsyncSession.
+
+    Repositories issue 2.0-style statements only; transactions stay with the
+    caller, which commits through the repository or the session itself.
+    """
+
+    model: Type[ModelT]
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def select(self, *criteria: Any, options: Iterable = ()) -> Select:
+        return select(self.model).options(*options).where(*criteria)
+
+    async def get(self, id: Any, options: Iterable = ()) -> Optional[ModelT]:
+        return await self.db.get(self.model, id, options=list(options))
+
+    async def first(
+        self,
+        *criteria: Any,
+        order_by: Sequence = (),
+        options: Iterable = ()
+    ) -> Optional[ModelT]:
+        stmt = self.select(*criteria, options=options).order_by(*order_by).limit(1)
+        result = await self.db.execute(stmt)
+        return result.scalars().first()
+
+    async def list(
+        self,
+        *criteria: Any,
+        order_by: Sequence = (),
+        offset: Optional[int] = None,
+        limit: Optional[int] = None,
+        options: Iterable = ()
+    ) -> List[ModelT]:
+        stmt = self.select(*criteria, options=options).order_by(*order_by)
+        if offset:
+            stmt = stmt.offset(offset)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return await self.scalars(stmt)
+
+    async def count(self, *criteria: Any) -> int:
+        stmt = select(func.count()).select_from(self.model).where(*criteria)
+        result = await self.db.execute(stmt)
+        return result.scalar_one()
+
+    async def exists(self, *criteria: Any) -> bool:
+        stmt = select(select(self.model).where(*criteria).exists())
+        result = await self.db.execute(stmt)
+        return bool(result.scalar())
+
+    async def scalars(self, stmt) -> List[Any]:
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def rows(self, stmt) -> List[Any]:
+        result = await self.db.execute(stmt)
+        return list(result.all())
+
+    async def scalar(self, stmt) -> Any:
+        result = await self.db.execute(stmt)
+        return result.scalar()
+
+    async def update_where(self, criteria: Sequence, values: Dict[Any, Any]) -> int:
+        stmt = (
+            update(self.model)
+            .where(*criteria)
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        return result.rowcount
+
+    async def insert_many(self, rows: Sequence[Dict[str, Any]], batch_size: int = INSERT_BATCH_SIZE) -> int:
+        """Insert plain dicts as multi-row INSERT ... VALUES statements."""
+        for start in range(0, len(rows), batch_size):
+            await self.db.execute(insert(self.model).values(list(rows[start:start + batch_size])))
+        return len(rows)
+
+    async def delete_where(self, *criteria: Any) -> int:
+        stmt = delete(self.model).where(*criteria).execution_options(synchronize_session=False)
+        result = await self.db.execute(stmt)
+        return result.rowcount
+
+    def add(self, obj: ModelT) -> ModelT:
+        self.db.add(obj)
+        return obj
+
+    async def delete(self, obj: ModelT) -> None:
+        await self.db.delete(obj)
+
+    async def flush(self) -> None:
+        await self.db.flush()
+
+    async def commit(self) -> None:
+        await self.db.commit()
+
+    async def refresh(self, obj: ModelT) -> ModelT:
+        await self.db.refresh(obj)
+        return obj
@@ -0,0 +1,57 @@
+from datetime import datetime
+from typing import List, Optional
+from ..models import Post, Comment, Like, Category
+from .base import Repository
+
+class PostRepository(Repository[Post]):
+    model = Post
+
+    async def bump_counters(self, post_id: int, **deltas: int) -> None:
+        """Apply counter deltas to a post inside the caller's transaction."""
+        values = {
+            getattr(Post, column): getattr(Post, column) + delta
+            for column, delta in deltas.items()
+        }
+        if any(delta > 0 for delta in deltas.values()):
+            values[Post.last_activity_at] = datetime.utcnow()
+        await self.update_where([Post.id == post_id], values)
+
+# Digits per materialized-path segment; wide enough for any 32-bit id
+PATH_SEGMENT_WIDTH = 10
+
+def path_segment(comment_id: int) -> str:
+    return str(comment_id).zfill(PATH_SEGMENT_WIDTH)
+
+class CommentRepository(Repository[Comment]):
+    model = Comment
+
+    async def thread(
+        self,
+        post_id: int,
+        prefix: Optional[str] = None,
+        after: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Comment]:
+        """Comments of a post (or of the subtree under `prefix`) in thread order.
+
+        One range scan on (post_id, path): descendants of a path P are
+        exactly the paths between "P." and "P/".
+        """
+        criteria = [Comment.post_id == post_id]
+        if prefix is not None:
+            criteria += [Comment.path > prefix + ".", Comment.path < prefix + "/"]
+        if after is not None:
+            criteria.append(Comment.path > after)
+        return await self.list(*criteria, order_by=[Comment.path], limit=limit)
+
+class LikeRepository(Repository[Like]):
+    model = Like
+
+    async def find(self, post_id: int, user_id: int) -> Optional[Like]:
+        return await self.first(Like.post_id == post_id, Like.user_id == user_id)
+
+class CategoryRepository(Repository[Category]):
+    model = Category
+
+    async def by_name(self, name: str) -> Optional[Category]:
+        return await self.first(Category.name == name)
@@ -0,0 +1,77 @@
+from collections import Counter
+from typing import Any, Dict, Sequence
+from sqlalchemy import delete
+from ..models import Notification
+from .base import Repository
+from .user import UserRepository
+
+class NotificationRepository(Repository[Notification]):
+    """Notification writes that keep the users' notification counters in step.
+
+    The counter updates run in the caller's transaction, so they commit or
+    roll back together with the notification rows.
+    """
+
+    model = Notification
+
+    def __init__(self, db):
+        super().__init__(db)
+        self.users = UserRepository(db)
+
+    async def create(self, notification: Notification) -> Notification:
+        self.add(notification)
+        await self.users.bump_counters(
+            notification.user_id,
+            notifications_count=1,
+            unread_notifications_count=0 if notification.read else 1
+        )
+        return notification
+
+    async def create_many(self, rows: Sequence[Dict[str, Any]]) -> int:
+        count = await self.insert_many(rows)
+        totals = Counter(row["user_id"] for row in rows)
+        unread = Counter(row["user_id"] for row in rows if not row.get("read"))
+        # One counter UPDATE per distinct (total, unread) delta, usually just one
+        by_delta: Dict[tuple, list] = {}
+        for user_id, total in totals.items():
+            by_delta.setdefault((total, unread[user_id]), []).append(user_id)
+        for (total, unread_total), user_ids in by_delta.items():
+            await self.users.bump_counters(
+                *user_ids,
+                notifications_count=total,
+                unread_notifications_count=unread_total
+            )
+        return count
+
+    async def mark_read(self, notification: Notification) -> bool:
+        """Flip one notification to read; False if it already was."""
+        flipped = await self.update_where(
+            [Notification.id == notification.id, Notification.read == False],
+            {Notification.read: True}
+        )
+        if flipped:
+            await self.users.bump_counters(notification.user_id, unread_notifications_count=-1)
+        return bool(flipped)
+
+    async def mark_all_read(self, user_id: int) -> int:
+        flipped = await self.update_where(
+            [Notification.user_id == user_id, Notification.read == False],
+            {Notification.read: True}
+        )
+        await self.users.bump_counters(user_id, unread_notifications_count=-flipped)
+        return flipped
+
+    async def remove(self, notification: Notification) -> None:
+        # A bulk mark_all_read leaves a loaded row's `read` stale, so the
+        # counters follow the flag of the row the DELETE actually removed
+        result = await self.db.execute(
+            delete(Notification).where(Notification.id == notification.id).returning(Notification.read)
+        )
+        read = result.scalar_one_or_none()
+        if read is None:
+            return
+        await self.users.bump_counters(
+            notification.user_id,
+            notifications_count=-1,
+            unread_notifications_count=0 if read else -1
+        )
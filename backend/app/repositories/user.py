@@ -0,0 +1,28 @@
+from typing import Dict, Optional
+from sqlalchemy import select
+from ..models import User
+from .base import Repository
+
+class UserRepository(Repository[User]):
+    model = User
+
+    async def by_username(self, username: str) -> Optional[User]:
+        return await self.first(User.username == username)
+
+    async def bump_counters(self, *user_ids: int, **deltas: int) -> None:
+        """Apply counter deltas to users inside the caller's transaction."""
+        values = {
+            getattr(User, column): getattr(User, column) + delta
+            for column, delta in deltas.items() if delta
+        }
+        if user_ids and values:
+            await self.update_where([User.id.in_(user_ids)], values)
+
+    async def notification_counts(self, user_id: int) -> Optional[Dict[str, int]]:
+        rows = await self.rows(
+            select(User.notifications_count, User.unread_notifications_count).where(User.id == user_id)
+        )
+        if not rows:
+            return None
+        total, unread = rows[0]
+        return {"total": total, "unread": unread}
@@ -1,10 +1,13 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Union
 from .user import UserResponse
 from .post import PostResponse
 from .comment import CommentResponse
 
+# Moderated and reported content is either a post or a comment
+Content = Union[PostResponse, CommentResponse]
+
 class RoleBase(BaseModel):
     name: str
     description: Optional[str] = None
@@ -23,18 +26,19 @@ class Role(RoleBase):
     id: int
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class ModerationLogBase(BaseModel):
-    content_id: int
+    content_id: Optional[int] = None
     content_type: str
-    status: str
-    moderator_id: int
+    action: str
+    status: Optional[str] = None
+    moderator_id: Optional[int] = None
     reason: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class ModerationLogCreate(ModerationLogBase):
     pass
@@ -43,7 +47,19 @@ class ModerationLog(ModerationLogBase):
     id: int
 
     class Config:
-        orm_mode = True
+        from_attributes = True
+
+class ModerationLogList(BaseModel):
+    logs: List[ModerationLog]
+    total: int
+    page: int
+    pages: int
+
+class ModerationAction(BaseModel):
+    content_id: int
+    content_type: str
+    action: str
+    reason: Optional[str] = None
 
 class CategoryBase(BaseModel):
     name: str
@@ -55,7 +71,7 @@ class CategoryBase(BaseModel):
     comment_count: int = 0
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class CategoryCreate(CategoryBase):
     pass
@@ -71,7 +87,7 @@ class Category(CategoryBase):
     id: int
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class NotificationBase(BaseModel):
     type: str
@@ -80,14 +96,14 @@ class NotificationBase(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class Notification(NotificationBase):
     id: int
     user_id: int
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class NotificationCreate(NotificationBase):
     pass
@@ -102,7 +118,7 @@ class ModerationStats(BaseModel):
     by_category: Dict[str, int]
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AdminDashboardStats(BaseModel):
     total_users: int
@@ -125,14 +141,14 @@ class AdminActivityLog(BaseModel):
     user: UserResponse
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AdminActivityLogList(BaseModel):
     logs: List[AdminActivityLog]
     total: int
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AdminNotification(BaseModel):
     id: int
@@ -145,24 +161,24 @@ class AdminNotification(BaseModel):
     system: bool
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AdminNotificationList(BaseModel):
     notifications: List[AdminNotification]
     total: int
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AdminRole(BaseModel):
     id: int
     name: str
-    description: str
+    description: Optional[str] = None
     permissions: List[str]
     created_at: datetime
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AdminRoleCreate(BaseModel):
     name: str
@@ -170,9 +186,9 @@ class AdminRoleCreate(BaseModel):
     permissions: List[str]
 
 class AdminRoleUpdate(BaseModel):
-    name: Optional[str]
-    description: Optional[str]
-    permissions: Optional[List[str]]
+    name: Optional[str] = None
+    description: Optional[str] = None
+    permissions: Optional[List[str]] = None
 
 class AdminModerationLog(BaseModel):
     id: int
@@ -182,18 +198,18 @@ class AdminModerationLog(BaseModel):
     action: str
     reason: str
     created_at: datetime
-    content: Content
-    moderator: UserResponse
+    content: Optional[Content] = None
+    moderator: Optional[UserResponse] = None
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AdminModerationLogList(BaseModel):
     logs: List[AdminModerationLog]
     total: int
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AdminModerationStats(BaseModel):
     total_reports: int
@@ -204,7 +220,7 @@ class AdminModerationStats(BaseModel):
     pending_moderations: int
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AdminCategory(BaseModel):
     id: int
@@ -213,7 +229,7 @@ class AdminCategory(BaseModel):
     created_at: datetime
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AdminCategoryCreate(BaseModel):
     name: str
@@ -236,11 +252,11 @@ class AdminReport(BaseModel):
     resolution_notes: Optional[str]
     reporter: UserResponse
     reported: UserResponse
-    content: Content
-    category: Category
+    content: Optional[Content] = None
+    category: Optional[Category] = None
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AdminReportCreate(BaseModel):
     reporter_id: int
@@ -259,7 +275,7 @@ class AdminReportList(BaseModel):
     total: int
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AdminAnalyticsStats(BaseModel):
     total_users: int
@@ -279,7 +295,7 @@ class AdminAnalyticsStats(BaseModel):
     user_activity: List[dict]
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AdminContent(BaseModel):
     id: int
@@ -296,7 +312,7 @@ class AdminContent(BaseModel):
     category: Category
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AdminContentCreate(BaseModel):
     title: str
@@ -320,7 +336,7 @@ class AdminContentList(BaseModel):
     total: int
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AdminSettings(BaseModel):
     site: dict
@@ -328,7 +344,7 @@ class AdminSettings(BaseModel):
     email: dict
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AdminBackupStatus(BaseModel):
     last_database_backup: Optional[datetime]
@@ -337,7 +353,7 @@ class AdminBackupStatus(BaseModel):
     file_size: Optional[int]
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AdminBackup(BaseModel):
     id: int
@@ -347,14 +363,14 @@ class AdminBackup(BaseModel):
     status: str
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AdminRoleAssignment(BaseModel):
     user_id: int
     role_id: int
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AdminRoleAssignmentList(BaseModel):
     total: int
@@ -363,7 +379,7 @@ class AdminRoleAssignmentList(BaseModel):
     assignments: List[AdminRoleAssignment]
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class ModerationQueue(BaseModel):
     id: int
@@ -377,7 +393,7 @@ class ModerationQueue(BaseModel):
     created_at: datetime
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class ModerationQueueList(BaseModel):
     total: int
@@ -386,7 +402,7 @@ class ModerationQueueList(BaseModel):
     queue: List[ModerationQueue]
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class CategoryList(BaseModel):
     total: int
@@ -395,7 +411,7 @@ class CategoryList(BaseModel):
     categories: List[Category]
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AdminNotification(BaseModel):
     id: int
@@ -406,7 +422,7 @@ class AdminNotification(BaseModel):
     user_id: int
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AdminNotificationList(BaseModel):
     total: int
@@ -415,7 +431,7 @@ class AdminNotificationList(BaseModel):
     notifications: List[AdminNotification]
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AdminStats(BaseModel):
     total_users: int
@@ -436,10 +452,10 @@ class AdminStats(BaseModel):
     moderation_stats: ModerationStats
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class RoleListResponse(BaseModel):
-    roles: List[Role]
+    roles: List[AdminRole]
     total: int
     page: int
     pages: int
@@ -467,10 +483,10 @@ class CategoryUpdate(BaseModel):
 
 class CategoryResponse(CategoryBase):
     id: int
-    posts_count: int
-    subcategories_count: int
-    created_at: datetime
-    updated_at: datetime
+    posts_count: int = 0
+    subcategories_count: int = 0
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -492,16 +508,17 @@ class AdminDashboardStats(BaseModel):
     new_comments_today: int
     pending_moderation: int
     reported_content: int
-    storage_usage: float
-    bandwidth_usage: float
+    # Not tracked yet; reported as null until there is a source for them
+    storage_usage: Optional[float] = None
+    bandwidth_usage: Optional[float] = None
 
 class AdminActivityLog(BaseModel):
     id: int
-    user_id: int
+    user_id: Optional[int] = None
     action: str
-    resource: str
-    resource_id: int
-    details: dict
+    resource: Optional[str] = None
+    resource_id: Optional[int] = None
+    details: Optional[dict] = None
     created_at: datetime
 
     class Config:
@@ -512,12 +529,13 @@ class AdminActivityLogList(BaseModel):
     total: int
     page: int
     pages: int
+    metrics: Optional[Dict[str, Any]] = None
 
 class AdminNotification(BaseModel):
     id: int
     user_id: int
     message: str
-    type: str
+    type: Optional[str] = None
     read: bool
     created_at: datetime
 
@@ -533,13 +551,18 @@ class AdminNotificationList(BaseModel):
 class AdminRoleAssignment(BaseModel):
     user_id: int
     role_id: int
-    assigned_by: int
+    assigned_by: Optional[int] = None
     assigned_at: datetime
     reason: Optional[str] = None
 
     class Config:
         from_attributes = True
 
+class AdminRoleAssignmentCreate(BaseModel):
+    user_id: int
+    role_id: int
+    reason: Optional[str] = None
+
 class AdminRoleAssignmentList(BaseModel):
     assignments: List[AdminRoleAssignment]
     total: int
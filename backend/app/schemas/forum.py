@@ -75,6 +75,19 @@ class Like(LikeBase):
     class Config:
         from_attributes = True
 
+class PostPage(BaseModel):
+    posts: List[Post]
+    next_cursor: Optional[str] = None
+
+class CommentNode(Comment):
+    replies: List["CommentNode"] = []
+    # Set on comments whose replies continue past this page
+    replies_cursor: Optional[str] = None
+
+class CommentThread(BaseModel):
+    comments: List[CommentNode]
+    next_cursor: Optional[str] = None
+
 class PostWithComments(BaseModel):
     post: Post
     comments: List[Comment]
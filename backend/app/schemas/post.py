@@ -1,7 +1,7 @@
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field
 from datetime import datetime
 from typing import Optional, List
-from .user import UserResponse
+from .user import UserSummary
 
 class PostBase(BaseModel):
     title: str
@@ -28,11 +28,14 @@ class PostInDB(PostBase):
         from_attributes = True
 
 class PostResponse(PostInDB):
-    author: UserResponse
+    author: UserSummary
     likes_count: int
     comments_count: int
-    is_liked: bool
-    last_activity: datetime
+    # Per-viewer; the public /api/posts feed is anonymous
+    is_liked: bool = False
+    last_activity: Optional[datetime] = Field(
+        None, validation_alias=AliasChoices("last_activity", "last_activity_at")
+    )
     status: str
     featured_image: Optional[str] = None
     tags: List[str] = []
@@ -43,6 +46,10 @@ class PostListResponse(BaseModel):
     page: int
     pages: int
 
+class PostCursorResponse(BaseModel):
+    posts: List[PostResponse]
+    next_cursor: Optional[str] = None
+
 class PostStats(BaseModel):
     total_posts: int
     daily_posts: int
@@ -59,3 +66,17 @@ class PostSearchResponse(BaseModel):
     filters: dict
     sort_options: List[str]
     time_ranges: List[str]
+
+class SearchHit(BaseModel):
+    type: str
+    id: int
+    post_id: int
+    title: Optional[str] = None
+    # HTML-escaped text with matches wrapped in <mark>
+    snippet: str
+    score: float
+    created_at: datetime
+
+class SearchPage(BaseModel):
+    results: List[SearchHit]
+    next_cursor: Optional[str] = None
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -44,6 +44,10 @@ class ProfileActivityItem(BaseModel):
     comment_id: Optional[int] = None
     like_id: Optional[int] = None
 
+class ProfileActivityPage(BaseModel):
+    activity: List[ProfileActivityItem]
+    next_cursor: Optional[str] = None
+
 class ProfilePreferences(BaseModel):
     theme: Optional[str] = None
     notification_settings: Optional[dict] = None
@@ -33,6 +33,15 @@ class UserInDB(UserBase):
     class Config:
         from_attributes = True
 
+class UserSummary(BaseModel):
+    """Public author card nested in post listings."""
+    id: int
+    username: str
+    role: str = "member"
+
+    class Config:
+        from_attributes = True
+
 class UserResponse(UserInDB):
     posts_count: int
     comments_count: int
@@ -2,8 +2,13 @@ from .auth import router as auth_router
 from .security import (
     verify_password,
     get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
     create_access_token,
     get_current_user,
+    get_current_principal,
+    get_current_admin,
+    invalidate_user_cache,
     generate_otp,
     verify_otp,
     validate_password_strength
@@ -17,8 +22,13 @@ __all__ = [
     'auth_router',
     'verify_password',
     'get_password_hash',
+    'verify_password_async',
+    'get_password_hash_async',
     'create_access_token',
     'get_current_user',
+    'get_current_principal',
+    'get_current_admin',
+    'invalidate_user_cache',
     'generate_otp',
     'verify_otp',
     'validate_password_strength',
@@ -1,18 +1,37 @@
-from fastapi import HTTPException, status, Depends
+from fastapi import HTTPException, status
+from sqlalchemy import select, func, or_, distinct
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
+from .. import models
 from ..models import (
     User, Post, Comment, Category, Like, Notification,
-    Role, ActivityLog, ModerationLog, RoleAssignment
+    Role, ActivityLog, ModerationLog, RoleAssignment, Report, loader_options
+)
+from ..repositories import (
+    Repository,
+    UserRepository,
+    PostRepository,
+    CommentRepository,
+    LikeRepository,
+    CategoryRepository,
+    NotificationRepository
+)
+from ..repositories.admin import (
+    RoleRepository,
+    ActivityLogRepository,
+    ModerationLogRepository,
+    RoleAssignmentRepository,
+    ReportRepository
 )
 from ..schemas import admin as schemas
-from ..security import get_password_hash
-from ..utils import calculate_storage_usage, calculate_bandwidth_usage
+from .security import invalidate_user_cache
+from .categories import invalidate_category_tree
+from . import analytics, dashboard
+from . import response_cache, search as search_service
+from ..schemas.notification import NotificationCreate
+from .notification import NotificationService
 from ..config import settings
-from ..database import get_db
-from ..auth import get_current_user
-from ..services import websocket
 
 # Constants for moderation
 MODERATION_ACTIONS = {
@@ -52,23 +71,31 @@ CONTENT_STATUS = {
 }
 
 class AdminService:
-    def __init__(self, db):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.now = datetime.utcnow()
-        
+        self.users = UserRepository(db)
+        self.posts = PostRepository(db)
+        self.comments = CommentRepository(db)
+        self.likes = LikeRepository(db)
+        self.categories = CategoryRepository(db)
+        self.notifications = NotificationRepository(db)
+        self.roles = RoleRepository(db)
+        self.activity_logs = ActivityLogRepository(db)
+        self.moderation_logs = ModerationLogRepository(db)
+        self.role_assignments = RoleAssignmentRepository(db)
+        self.reports = ReportRepository(db)
+
     # Content Management Methods
-    def get_content(self, content_id: int, content_type: str) -> Dict[str, Any]:
+    async def get_content(self, content_id: int, content_type: str) -> Dict[str, Any]:
         """Retrieve a single content item by ID and type."""
-        if content_type == "post":
-            content = self.db.query(Post).filter(Post.id == content_id).first()
-        elif content_type == "comment":
-            content = self.db.query(Comment).filter(Comment.id == content_id).first()
-        else:
+        if content_type not in ("post", "comment"):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid content type: {content_type}"
             )
-            
+
+        content = await self._content_repository(content_type).get(content_id)
         if not content:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -76,7 +103,7 @@ class AdminService:
             )
         return content
 
-    def list_contents(
+    async def list_contents(
         self,
         content_type: str,
         page: int = 1,
@@ -90,43 +117,48 @@ class AdminService:
     ) -> Dict[str, Any]:
         """List contents with filtering, sorting, and pagination."""
         if content_type == "post":
-            query = self.db.query(Post)
+            options = loader_options("admin.content")
         elif content_type == "comment":
-            query = self.db.query(Comment)
+            options = ()
         else:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid content type: {content_type}"
             )
-        
+        repo = self._content_repository(content_type)
+        model = repo.model
+
         # Apply filters
+        criteria = []
         if status:
-            query = query.filter(Post.status == status)
+            criteria.append(model.status == status)
         if category_id and content_type == "post":
-            query = query.filter(Post.category_id == category_id)
+            criteria.append(Post.category_id == category_id)
         if author_id:
-            query = query.filter(Post.author_id == author_id)
+            criteria.append(model.author_id == author_id)
         if search:
-            search_filter = or_(
-                Post.title.ilike(f"%{search}%"),
-                Post.content.ilike(f"%{search}%")
-            )
-            query = query.filter(search_filter)
-        
+            criteria.append(search_service.match_criteria(self.db, content_type, search))
+
         # Apply sorting
-        sort_column = getattr(Post, sort_by, None)
+        sort_column = getattr(model, sort_by, None)
         if sort_column is None:
-            sort_column = Post.created_at
-            
+            sort_column = model.created_at
+
         if sort_order.lower() == "asc":
-            query = query.order_by(sort_column.asc())
+            order_by = [sort_column.asc()]
         else:
-            query = query.order_by(sort_column.desc())
-        
+            order_by = [sort_column.desc()]
+
         # Apply pagination
-        total = query.count()
-        items = query.offset((page - 1) * page_size).limit(page_size).all()
-        
+        total = await repo.count(*criteria)
+        items = await repo.list(
+            *criteria,
+            order_by=order_by,
+            offset=(page - 1) * page_size,
+            limit=page_size,
+            options=options
+        )
+
         return {
             "items": items,
             "total": total,
@@ -135,7 +167,7 @@ class AdminService:
             "pages": (total + page_size - 1) // page_size
         }
 
-    def update_content(
+    async def update_content(
         self,
         content_id: int,
         content_type: str,
@@ -143,26 +175,26 @@ class AdminService:
         updated_by: int
     ) -> Dict[str, Any]:
         """Update content with moderation logging."""
-        content = self.get_content(content_id, content_type)
-        
+        content = await self.get_content(content_id, content_type)
+
         # Log the update
-        log = ModerationLog(
+        self.moderation_logs.add(ModerationLog(
             content_id=content_id,
             content_type=content_type,
             action="update",
             moderator_id=updated_by,
             details={"changes": update_data}
-        )
-        self.db.add(log)
-        
+        ))
+
         # Update fields
         for key, value in update_data.items():
             if hasattr(content, key):
                 setattr(content, key, value)
-        
+
         content.updated_at = self.now
-        self.db.commit()
-        self.db.refresh(content)
+        await self.db.commit()
+        await self.db.refresh(content)
+        search_service.index_document(content_type, content)
         return content
 
     # Settings Management Methods
@@ -181,142 +213,65 @@ class AdminService:
             "default_user_role": settings.DEFAULT_USER_ROLE
         }
 
-    def update_site_settings(self, settings_data: Dict[str, Any], updated_by: int) -> Dict[str, Any]:
+    async def update_site_settings(self, settings_data: Dict[str, Any], updated_by: int) -> Dict[str, Any]:
         """Update site settings."""
         # In a real implementation, this would update a settings table
         # For now, we'll just log the update and return the new settings
-        log = ActivityLog(
+        self.activity_logs.add(ActivityLog(
             user_id=updated_by,
             action="update_site_settings",
             details={"changes": settings_data}
-        )
-        self.db.add(log)
-        self.db.commit()
-        
+        ))
+        await self.db.commit()
+
         # Return the new settings (in a real app, these would be saved to the database)
         return {**self.get_site_settings(), **settings_data}
 
     # Helper Methods
-    def _get_content_query(self, content_type: str):
-        """Get the appropriate query object for the content type."""
+    def _content_repository(self, content_type: str) -> Repository:
+        """Get the repository for the content type."""
         if content_type == "post":
-            return self.db.query(Post)
+            return self.posts
         elif content_type == "comment":
-            return self.db.query(Comment)
+            return self.comments
         raise ValueError(f"Unsupported content type: {content_type}")
 
-    # Role Management Methods
-    def create_role(self, role_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a new role with permissions."""
-        # Validate role data
-        required_fields = ['name', 'permissions']
-        if not all(field in role_data for field in required_fields):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Missing required fields: name, permissions"
-            )
-
-        # Check if role name already exists
-        existing_role = self.db.query(Role).filter_by(name=role_data['name']).first()
-        if existing_role:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Role '{role_data['name']}' already exists"
-            )
-
-        # Create role
-        role = Role(
-            name=role_data['name'],
-            permissions=role_data['permissions'],
-            created_at=self.now
-        )
-        self.db.add(role)
-        self.db.commit()
-        self.db.refresh(role)
-        return role
-
-    def update_role(self, role_id: int, update_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Update an existing role."""
-        role = self.db.query(Role).filter_by(id=role_id).first()
-        if not role:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Role with ID {role_id} not found"
-            )
-
-        # Update fields
-        for key, value in update_data.items():
-            if hasattr(role, key):
-                setattr(role, key, value)
-
-        role.updated_at = self.now
-        self.db.commit()
-        self.db.refresh(role)
-        return role
-
-    def delete_role(self, role_id: int) -> None:
-        """Delete a role."""
-        role = self.db.query(Role).filter_by(id=role_id).first()
-        if not role:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Role with ID {role_id} not found"
-            )
-
-        # Check if role is assigned to any users
-        if self.db.query(RoleAssignment).filter_by(role_id=role_id).count() > 0:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Cannot delete role {role.name} as it is assigned to users"
-            )
-
-        self.db.delete(role)
-        self.db.commit()
+    async def _get_or_404(self, repo: Repository, id: int, detail: str):
+        obj = await repo.get(id)
+        if not obj:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+        return obj
 
     # User Management Methods
-    def assign_role(self, user_id: int, role_id: int, assigned_by: int) -> Dict[str, Any]:
+    async def assign_role(self, user_id: int, role_id: int, assigned_by: int) -> Dict[str, Any]:
         """Assign a role to a user."""
         # Validate user
-        user = self.db.query(User).filter_by(id=user_id).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"User with ID {user_id} not found"
-            )
+        user = await self._get_or_404(self.users, user_id, f"User with ID {user_id} not found")
 
         # Validate role
-        role = self.db.query(Role).filter_by(id=role_id).first()
-        if not role:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Role with ID {role_id} not found"
-            )
+        role = await self._get_or_404(self.roles, role_id, f"Role with ID {role_id} not found")
 
         # Check if role is already assigned
-        existing_assignment = self.db.query(RoleAssignment).filter_by(
-            user_id=user_id,
-            role_id=role_id
-        ).first()
-        if existing_assignment:
+        if await self.role_assignments.exists(
+            RoleAssignment.user_id == user_id,
+            RoleAssignment.role_id == role_id
+        ):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"User already has role {role.name}"
             )
 
         # Create role assignment
-        assignment = RoleAssignment(
+        assignment = self.role_assignments.add(RoleAssignment(
             user_id=user_id,
             role_id=role_id,
             assigned_by=assigned_by,
             status="active",
-            created_at=self.now
-        )
-        self.db.add(assignment)
-        self.db.commit()
-        self.db.refresh(assignment)
+            assigned_at=self.now
+        ))
 
         # Log the action
-        log = ActivityLog(
+        self.activity_logs.add(ActivityLog(
             user_id=assigned_by,
             action="assign_role",
             details={
@@ -324,44 +279,47 @@ class AdminService:
                 "role_id": role_id,
                 "role_name": role.name
             }
-        )
-        self.db.add(log)
-        self.db.commit()
+        ))
+        await self.db.commit()
+        await self.db.refresh(assignment)
+        invalidate_user_cache(user.username)
 
         return assignment
 
-    def remove_role(self, user_id: int, role_id: int, removed_by: int) -> None:
+    async def remove_role(self, user_id: int, role_id: int, removed_by: int) -> None:
         """Remove a role from a user."""
-        assignment = self.db.query(RoleAssignment).filter_by(
-            user_id=user_id,
-            role_id=role_id
-        ).first()
+        assignment = await self.role_assignments.first(
+            RoleAssignment.user_id == user_id,
+            RoleAssignment.role_id == role_id
+        )
         if not assignment:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Role assignment not found"
             )
+        role = await self.roles.get(role_id)
+        user = await self.users.get(user_id)
 
         # Log the action
-        log = ActivityLog(
+        self.activity_logs.add(ActivityLog(
             user_id=removed_by,
             action="remove_role",
             details={
                 "user_id": user_id,
                 "role_id": role_id,
-                "role_name": assignment.role.name
+                "role_name": role.name
             }
-        )
-        self.db.add(log)
+        ))
 
-        self.db.delete(assignment)
-        self.db.commit()
+        await self.role_assignments.delete(assignment)
+        await self.db.commit()
+        invalidate_user_cache(user.username)
 
     # Moderation Methods
-    def moderate_content(self, content_id: int, content_type: str, action: str, moderator_id: int, reason: str) -> Dict[str, Any]:
+    async def moderate_content(self, content_id: int, content_type: str, action: str, moderator_id: int, reason: str) -> Dict[str, Any]:
         """Moderate content (approve, reject, delete)."""
-        content = self.get_content(content_id, content_type)
-        
+        content = await self.get_content(content_id, content_type)
+
         # Validate action
         valid_actions = ['approve', 'reject', 'delete']
         if action not in valid_actions:
@@ -371,15 +329,14 @@ class AdminService:
             )
 
         # Create moderation log
-        log = ModerationLog(
+        self.moderation_logs.add(ModerationLog(
             content_id=content_id,
             content_type=content_type,
             action=action,
             moderator_id=moderator_id,
             reason=reason,
             created_at=self.now
-        )
-        self.db.add(log)
+        ))
 
         # Apply moderation action
         if action == 'approve':
@@ -390,19 +347,15 @@ class AdminService:
             content.status = 'deleted'
 
         content.updated_at = self.now
-        self.db.commit()
-        self.db.refresh(content)
+        await self.db.commit()
+        await self.db.refresh(content)
+        search_service.index_document(content_type, content)
 
         return content
 
-    def ban_user(self, user_id: int, moderator_id: int, ban_type: str, duration: int, reason: str) -> Dict[str, Any]:
+    async def ban_user(self, user_id: int, moderator_id: int, ban_type: str, duration: int, reason: str) -> Dict[str, Any]:
         """Ban or suspend a user."""
-        user = self.db.query(User).filter_by(id=user_id).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"User with ID {user_id} not found"
-            )
+        user = await self._get_or_404(self.users, user_id, f"User with ID {user_id} not found")
 
         # Validate ban type
         valid_ban_types = ['temporary', 'permanent']
@@ -413,7 +366,7 @@ class AdminService:
             )
 
         # Create ban log
-        ban_log = ModerationLog(
+        self.moderation_logs.add(ModerationLog(
             content_id=None,
             content_type='user',
             action=f"ban_{ban_type}",
@@ -424,8 +377,7 @@ class AdminService:
                 "ban_type": ban_type
             },
             created_at=self.now
-        )
-        self.db.add(ban_log)
+        ))
 
         # Apply ban
         user.is_active = False
@@ -436,30 +388,25 @@ class AdminService:
             user.ban_expires_at = None
 
         user.updated_at = self.now
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
+        await self.db.refresh(user)
+        invalidate_user_cache(user.username)
 
         return user
 
-    def unban_user(self, user_id: int, moderator_id: int) -> Dict[str, Any]:
+    async def unban_user(self, user_id: int, moderator_id: int) -> Dict[str, Any]:
         """Unban a user."""
-        user = self.db.query(User).filter_by(id=user_id).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"User with ID {user_id} not found"
-            )
+        user = await self._get_or_404(self.users, user_id, f"User with ID {user_id} not found")
 
         # Create unban log
-        unban_log = ModerationLog(
+        self.moderation_logs.add(ModerationLog(
             content_id=None,
             content_type='user',
             action="unban",
             moderator_id=moderator_id,
             reason="Manual unban by moderator",
             created_at=self.now
-        )
-        self.db.add(unban_log)
+        ))
 
         # Remove ban
         user.is_active = True
@@ -467,306 +414,46 @@ class AdminService:
         user.ban_expires_at = None
         user.updated_at = self.now
 
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
+        await self.db.refresh(user)
+        invalidate_user_cache(user.username)
 
         return user
 
-    # Category Management Methods
-    def create_category(self, category_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a new forum category."""
-        required_fields = ['name', 'description', 'parent_id', 'permissions']
-        if not all(field in category_data for field in required_fields):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Missing required fields: {required_fields}"
-            )
-
-        # Validate parent category if provided
-        if category_data['parent_id']:
-            parent = self.db.query(Category).filter_by(id=category_data['parent_id']).first()
-            if not parent:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Parent category with ID {category_data['parent_id']} not found"
-                )
-
-        # Create category
-        category = Category(
-            name=category_data['name'],
-            description=category_data['description'],
-            parent_id=category_data['parent_id'],
-            permissions=category_data['permissions'],
-            created_at=self.now
-        )
-        self.db.add(category)
-        self.db.commit()
-        self.db.refresh(category)
-
-        return category
-
-    def update_category(self, category_id: int, update_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Update an existing category."""
-        category = self.db.query(Category).filter_by(id=category_id).first()
-        if not category:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Category with ID {category_id} not found"
-            )
-
-        # Update fields
-        for key, value in update_data.items():
-            if hasattr(category, key):
-                setattr(category, key, value)
-
-        category.updated_at = self.now
-        self.db.commit()
-        self.db.refresh(category)
-
-        return category
-
-    def delete_category(self, category_id: int) -> None:
-        """Delete a category."""
-        category = self.db.query(Category).filter_by(id=category_id).first()
-        if not category:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Category with ID {category_id} not found"
-            )
-
-        # Check if category has posts
-        if self.db.query(Post).filter_by(category_id=category_id).count() > 0:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cannot delete category as it contains posts"
-            )
-
-        self.db.delete(category)
-        self.db.commit()
-
-    async def get_dashboard_stats(self) -> schemas.AdminDashboardStats:
-        # Get basic stats
-        stats = {
-            "total_users": self.db.query(User).count(),
-            "active_users": self.db.query(User).filter(User.is_active == True).count(),
-            "new_users_today": self.db.query(User).filter(
-                User.created_at >= datetime.utcnow() - timedelta(days=1)
-            ).count(),
-            "active_users_7d": self.db.query(User).filter(
-                User.last_login >= datetime.utcnow() - timedelta(days=7)
-            ).count(),
-            "total_posts": self.db.query(Post).count(),
-            "active_posts": self.db.query(Post).filter(Post.status == "active").count(),
-            "new_posts_today": self.db.query(Post).filter(
-                Post.created_at >= datetime.utcnow() - timedelta(days=1)
-            ).count(),
-            "total_comments": self.db.query(Comment).count(),
-            "new_comments_today": self.db.query(Comment).filter(
-                Comment.created_at >= datetime.utcnow() - timedelta(days=1)
-            ).count(),
-            "avg_comments_per_post": self.db.query(Comment).count() / self.db.query(Post).count() if self.db.query(Post).count() > 0 else 0,
-            "avg_likes_per_post": self.db.query(Like).count() / self.db.query(Post).count() if self.db.query(Post).count() > 0 else 0,
-            "pending_moderation": self.db.query(Post).filter(Post.status == "pending").count(),
-            "reported_content": self.db.query(Post).filter(Post.is_reported == True).count() + self.db.query(Comment).filter(Comment.is_reported == True).count(),
-            "storage_usage": await calculate_storage_usage(self.db),
-            "bandwidth_usage": await calculate_bandwidth_usage(self.db),
-            "active_categories": self.db.query(Category).filter(Category.status == "active").count()
-        }
-
-        # Get moderation stats
-        moderation_stats = {
-            "pending": self.db.query(Post).filter(Post.status == "pending").count(),
-            "approved_today": self.db.query(Post).filter(
-                Post.status == "active",
-                Post.updated_at >= datetime.utcnow() - timedelta(days=1)
-            ).count(),
-            "rejected_today": self.db.query(Post).filter(
-                Post.status == "rejected",
-                Post.updated_at >= datetime.utcnow() - timedelta(days=1)
-            ).count(),
-            "by_category": {
-                cat.name: self.db.query(Post).filter(
-                    Post.category_id == cat.id,
-                    Post.status == "active"
-                ).count()
-                for cat in self.db.query(Category).all()
-            }
-        }
-
-        stats["moderation_stats"] = schemas.ModerationStats(**moderation_stats)
-        return schemas.AdminDashboardStats(**stats)
-
-    async def get_roles(self, filters: dict = None) -> schemas.RoleListResponse:
-        query = self.db.query(Role)
-        
-        if filters:
-            if filters.get("name"):
-                query = query.filter(Role.name.ilike(f"%{filters['name']}%"))
-            if filters.get("status"):
-                query = query.filter(Role.status == filters["status"])
-
-        total = query.count()
-        roles = query.all()
-        
-        return schemas.RoleListResponse(
-            roles=roles,
-            total=total,
-            page=1,
-            pages=1
-        )
-
-    async def create_role(self, role_data: schemas.RoleCreate) -> schemas.Role:
-        role = Role(**role_data.dict())
-        self.db.add(role)
-        self.db.commit()
-        self.db.refresh(role)
-        return schemas.Role.from_orm(role)
-
-    async def update_role(self, role_id: int, role_data: schemas.RoleUpdate) -> schemas.Role:
-        role = self.db.query(Role).filter(Role.id == role_id).first()
-        if not role:
-            raise HTTPException(status_code=404, detail="Role not found")
-
-        for key, value in role_data.dict(exclude_unset=True).items():
-            setattr(role, key, value)
-        
-        self.db.commit()
-        self.db.refresh(role)
-        return schemas.Role.from_orm(role)
-
-    async def delete_role(self, role_id: int) -> None:
-        role = self.db.query(Role).filter(Role.id == role_id).first()
-        if not role:
-            raise HTTPException(status_code=404, detail="Role not found")
-        
-        self.db.delete(role)
-        self.db.commit()
-
-    async def get_moderation_queue(self, filters: dict = None) -> schemas.ModerationQueueList:
-        query = self.db.query(Post).filter(Post.status == "pending")
-        
-        if filters:
-            if filters.get("content_type"):
-                query = query.filter(Post.type == filters["content_type"])
-            if filters.get("category"):
-                query = query.filter(Post.category_id == filters["category"])
-
-        total = query.count()
-        queue = query.all()
-        
-        return schemas.ModerationQueueList(
-            queue=[{
-                "id": post.id,
-                "content_id": post.id,
-                "content_type": post.type,
-                "title": post.title,
-                "content": post.content,
-                "author": post.author.username,
-                "category": post.category.name if post.category else "",
-                "status": post.status,
-                "created_at": post.created_at
-            } for post in queue],
-            total=total,
-            page=1,
-            pages=1
-        )
-
     async def approve_content(self, content_id: int, content_type: str) -> None:
-        if content_type == "post":
-            content = self.db.query(Post).filter(Post.id == content_id).first()
-        else:
-            content = self.db.query(Comment).filter(Comment.id == content_id).first()
+        repo = self.posts if content_type == "post" else self.comments
+        content = await repo.get(content_id)
 
         if not content:
             raise HTTPException(status_code=404, detail="Content not found")
 
         content.status = "active"
-        self.db.commit()
+        await repo.commit()
+        search_service.index_document(content_type, content)
 
     async def reject_content(self, content_id: int, content_type: str, reason: str) -> None:
-        if content_type == "post":
-            content = self.db.query(Post).filter(Post.id == content_id).first()
-        else:
-            content = self.db.query(Comment).filter(Comment.id == content_id).first()
+        repo = self.posts if content_type == "post" else self.comments
+        content = await repo.get(content_id)
 
         if not content:
             raise HTTPException(status_code=404, detail="Content not found")
 
         content.status = "rejected"
         content.rejection_reason = reason
-        self.db.commit()
-
-    async def get_categories(self, filters: dict = None) -> schemas.CategoryList:
-        query = self.db.query(Category)
-        
-        if filters:
-            if filters.get("name"):
-                query = query.filter(Category.name.ilike(f"%{filters['name']}%"))
-            if filters.get("status"):
-                query = query.filter(Category.status == filters["status"])
-            if filters.get("content_type"):
-                query = query.filter(Category.content_type == filters["content_type"])
-
-        total = query.count()
-        categories = query.all()
-        
-        return schemas.CategoryList(
-            categories=categories,
-            total=total,
-            page=1,
-            pages=1
-        )
-
-    async def create_category(self, category_data: schemas.CategoryCreate) -> schemas.Category:
-        category = Category(**category_data.dict())
-        self.db.add(category)
-        self.db.commit()
-        self.db.refresh(category)
-        return schemas.Category.from_orm(category)
-
-    async def update_category(self, category_id: int, category_data: schemas.CategoryUpdate) -> schemas.Category:
-        category = self.db.query(Category).filter(Category.id == category_id).first()
-        if not category:
-            raise HTTPException(status_code=404, detail="Category not found")
-
-        for key, value in category_data.dict(exclude_unset=True).items():
-            setattr(category, key, value)
-        
-        self.db.commit()
-        self.db.refresh(category)
-        return schemas.Category.from_orm(category)
-
-    async def delete_category(self, category_id: int) -> None:
-        category = self.db.query(Category).filter(Category.id == category_id).first()
-        if not category:
-            raise HTTPException(status_code=404, detail="Category not found")
-        
-        self.db.delete(category)
-        self.db.commit()
+        await repo.commit()
+        search_service.index_document(content_type, content)
 
-    def get_dashboard_stats(self) -> schemas.AdminDashboardStats:
-        stats = {
-            "total_users": self.db.query(models.User).count(),
-            "active_users": self.db.query(models.User).filter(models.User.is_active == True).count(),
-            "new_users": self.db.query(models.User).filter(
-                models.User.created_at >= datetime.now() - timedelta(days=7)
-            ).count(),
-            "total_posts": self.db.query(models.Post).count(),
-            "total_comments": self.db.query(models.Comment).count(),
-            "total_categories": self.db.query(models.Category).count(),
-            "moderation_queue": self.db.query(models.Content).filter(
-                models.Content.status == "pending"
-            ).count(),
-            "pending_approvals": self.db.query(models.Content).filter(
-                models.Content.status == "pending"
-            ).count(),
-            "pending_reports": self.db.query(models.Report).filter(
-                models.Report.status == "pending"
-            ).count()
-        }
+    async def get_dashboard_stats(self) -> schemas.AdminDashboardStats:
+        stats = await dashboard.get_dashboard_stats(self.db)
+        stats.update(
+            new_users=stats["new_users_7d"],
+            moderation_queue=stats["pending_moderation"],
+            pending_approvals=stats["pending_moderation"],
+            pending_reports=await self.reports.count(Report.status == "pending")
+        )
         return schemas.AdminDashboardStats(**stats)
 
-    def get_activity_logs(
+    async def get_activity_logs(
         self,
         skip: int = 0,
         limit: int = 100,
@@ -775,20 +462,22 @@ class AdminService:
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
     ) -> schemas.AdminActivityLogList:
-        query = self.db.query(models.ActivityLog)
-        
+        criteria = []
+
         if username:
-            query = query.join(models.User).filter(models.User.username.ilike(f"%{username}%"))
+            criteria.append(models.ActivityLog.user_id.in_(
+                select(models.User.id).where(models.User.username.ilike(f"%{username}%"))
+            ))
         if action:
-            query = query.filter(models.ActivityLog.action == action)
+            criteria.append(models.ActivityLog.action == action)
         if start_date:
-            query = query.filter(models.ActivityLog.created_at >= start_date)
+            criteria.append(models.ActivityLog.created_at >= start_date)
         if end_date:
-            query = query.filter(models.ActivityLog.created_at <= end_date)
+            criteria.append(models.ActivityLog.created_at <= end_date)
+
+        total = await self.activity_logs.count(*criteria)
+        logs = await self.activity_logs.list(*criteria, offset=skip, limit=limit)
 
-        total = query.count()
-        logs = query.offset(skip).limit(limit).all()
-        
         return schemas.AdminActivityLogList(
             logs=[schemas.AdminActivityLog(
                 id=log.id,
@@ -802,23 +491,12 @@ class AdminService:
             total=total
         )
 
-    def create_notification(
-        self,
-        notification: schemas.AdminNotificationCreate
-    ) -> schemas.AdminNotification:
-        db_notification = models.Notification(
-            title=notification.title,
-            message=notification.message,
-            type=notification.type,
-            recipient_id=notification.recipient_id,
-            system=notification.system
-        )
-        self.db.add(db_notification)
-        self.db.commit()
-        self.db.refresh(db_notification)
-        return schemas.AdminNotification.from_orm(db_notification)
+    async def create_notification(self, notification: NotificationCreate) -> schemas.AdminNotification:
+        # Through NotificationService so counters and push delivery follow
+        db_notification = await NotificationService().create_notification(self.db, notification)
+        return schemas.AdminNotification.model_validate(db_notification)
 
-    def get_notifications(
+    async def get_notifications(
         self,
         skip: int = 0,
         limit: int = 100,
@@ -827,114 +505,111 @@ class AdminService:
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
     ) -> schemas.AdminNotificationList:
-        query = self.db.query(models.Notification)
-        
+        criteria = []
+
         if type:
-            query = query.filter(models.Notification.type == type)
+            criteria.append(models.Notification.type == type)
         if status is not None:
-            query = query.filter(models.Notification.read == status)
+            criteria.append(models.Notification.read == status)
         if start_date:
-            query = query.filter(models.Notification.created_at >= start_date)
+            criteria.append(models.Notification.created_at >= start_date)
         if end_date:
-            query = query.filter(models.Notification.created_at <= end_date)
+            criteria.append(models.Notification.created_at <= end_date)
+
+        total = await self.notifications.count(*criteria)
+        notifications = await self.notifications.list(*criteria, offset=skip, limit=limit)
 
-        total = query.count()
-        notifications = query.offset(skip).limit(limit).all()
-        
         return schemas.AdminNotificationList(
             notifications=[schemas.AdminNotification.from_orm(n) for n in notifications],
             total=total
         )
 
-    def mark_notification_as_read(self, notification_id: int) -> schemas.AdminNotification:
-        notification = self.db.query(models.Notification).filter(
-            models.Notification.id == notification_id
-        ).first()
+    async def _set_notification_read(self, notification_id: int, read: bool) -> schemas.AdminNotification:
+        notification = await self.notifications.get(notification_id)
         if not notification:
             raise HTTPException(status_code=404, detail="Notification not found")
-        
-        notification.read = True
-        self.db.commit()
-        self.db.refresh(notification)
-        return schemas.AdminNotification.from_orm(notification)
 
-    def mark_notification_as_unread(self, notification_id: int) -> schemas.AdminNotification:
-        notification = self.db.query(models.Notification).filter(
-            models.Notification.id == notification_id
-        ).first()
-        if not notification:
-            raise HTTPException(status_code=404, detail="Notification not found")
-        
-        notification.read = False
-        self.db.commit()
-        self.db.refresh(notification)
+        notification.read = read
+        await self.notifications.commit()
+        await self.notifications.refresh(notification)
         return schemas.AdminNotification.from_orm(notification)
 
-    def create_role(self, role: schemas.AdminRoleCreate) -> schemas.AdminRole:
-        db_role = models.Role(
+    async def mark_notification_as_read(self, notification_id: int) -> schemas.AdminNotification:
+        return await self._set_notification_read(notification_id, True)
+
+    async def mark_notification_as_unread(self, notification_id: int) -> schemas.AdminNotification:
+        return await self._set_notification_read(notification_id, False)
+
+    async def create_role(self, role: schemas.AdminRoleCreate) -> schemas.AdminRole:
+        db_role = self.roles.add(models.Role(
             name=role.name,
             description=role.description,
             permissions=role.permissions
-        )
-        self.db.add(db_role)
-        self.db.commit()
-        self.db.refresh(db_role)
+        ))
+        await self.roles.commit()
+        await self.roles.refresh(db_role)
         return schemas.AdminRole.from_orm(db_role)
 
-    def get_roles(self, skip: int = 0, limit: int = 100) -> List[schemas.AdminRole]:
-        return self.db.query(models.Role).offset(skip).limit(limit).all()
+    async def get_roles(self, skip: int = 0, limit: int = 100) -> List[schemas.AdminRole]:
+        return await self.roles.list(offset=skip, limit=limit)
 
-    def get_role(self, role_id: int) -> schemas.AdminRole:
-        role = self.db.query(models.Role).filter(models.Role.id == role_id).first()
+    async def get_role(self, role_id: int) -> schemas.AdminRole:
+        role = await self.roles.get(role_id)
         if not role:
             raise HTTPException(status_code=404, detail="Role not found")
         return schemas.AdminRole.from_orm(role)
 
-    def update_role(
+    async def update_role(
         self,
         role_id: int,
         role: schemas.AdminRoleUpdate
     ) -> schemas.AdminRole:
-        db_role = self.db.query(models.Role).filter(models.Role.id == role_id).first()
+        db_role = await self.roles.get(role_id)
         if not db_role:
             raise HTTPException(status_code=404, detail="Role not found")
-        
+
         if role.name:
             db_role.name = role.name
         if role.description:
             db_role.description = role.description
         if role.permissions is not None:
             db_role.permissions = role.permissions
-        
-        self.db.commit()
-        self.db.refresh(db_role)
+
+        await self.roles.commit()
+        await self.roles.refresh(db_role)
         return schemas.AdminRole.from_orm(db_role)
 
-    def delete_role(self, role_id: int) -> None:
-        role = self.db.query(models.Role).filter(models.Role.id == role_id).first()
+    async def delete_role(self, role_id: int) -> None:
+        role = await self.roles.get(role_id)
         if not role:
             raise HTTPException(status_code=404, detail="Role not found")
-        
-        self.db.delete(role)
-        self.db.commit()
 
-    def get_moderation_queue(
+        if await self.role_assignments.exists(RoleAssignment.role_id == role_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot delete role {role.name} as it is assigned to users"
+            )
+
+        await self.roles.delete(role)
+        await self.roles.commit()
+
+    async def get_moderation_queue(
         self,
         skip: int = 0,
         limit: int = 100,
         content_type: Optional[str] = None,
         status: Optional[str] = None
     ) -> schemas.AdminModerationLogList:
-        query = self.db.query(models.ModerationLog)
-        
+        criteria = []
+
         if content_type:
-            query = query.filter(models.ModerationLog.content_type == content_type)
+            criteria.append(models.ModerationLog.content_type == content_type)
         if status:
-            query = query.filter(models.ModerationLog.status == status)
+            criteria.append(models.ModerationLog.status == status)
+
+        total = await self.moderation_logs.count(*criteria)
+        logs = await self.moderation_logs.list(*criteria, offset=skip, limit=limit)
 
-        total = query.count()
-        logs = query.offset(skip).limit(limit).all()
-        
         return schemas.AdminModerationLogList(
             logs=[schemas.AdminModerationLog(
                 id=log.id,
@@ -943,84 +618,75 @@ class AdminService:
                 moderator_id=log.moderator_id,
                 action=log.action,
                 reason=log.reason,
-                created_at=log.created_at,
-                content=log.content,
-                moderator=log.moderator
+                created_at=log.created_at
             ) for log in logs],
             total=total
         )
 
-    def get_moderation_stats(self) -> schemas.AdminModerationStats:
+    async def get_moderation_stats(self) -> schemas.AdminModerationStats:
         stats = {
-            "total_reports": self.db.query(models.Report).count(),
-            "pending_reports": self.db.query(models.Report).filter(
-                models.Report.status == "pending"
-            ).count(),
-            "resolved_reports": self.db.query(models.Report).filter(
-                models.Report.status == "resolved"
-            ).count(),
-            "ignored_reports": self.db.query(models.Report).filter(
-                models.Report.status == "ignored"
-            ).count(),
-            "total_moderations": self.db.query(models.ModerationLog).count(),
-            "pending_moderations": self.db.query(models.ModerationLog).filter(
+            "total_reports": await self.reports.count(),
+            "pending_reports": await self.reports.count(models.Report.status == "pending"),
+            "resolved_reports": await self.reports.count(models.Report.status == "resolved"),
+            "ignored_reports": await self.reports.count(models.Report.status == "ignored"),
+            "total_moderations": await self.moderation_logs.count(),
+            "pending_moderations": await self.moderation_logs.count(
                 models.ModerationLog.status == "pending"
-            ).count()
+            )
         }
         return schemas.AdminModerationStats(**stats)
 
-    def create_category(self, category: schemas.AdminCategoryCreate) -> schemas.AdminCategory:
-        db_category = models.Category(
+    async def create_category(self, category: schemas.CategoryCreate) -> Category:
+        if category.parent_id and not await self.categories.get(category.parent_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Parent category with ID {category.parent_id} not found"
+            )
+        db_category = self.categories.add(Category(
             name=category.name,
-            description=category.description
-        )
-        self.db.add(db_category)
-        self.db.commit()
-        self.db.refresh(db_category)
-        return schemas.AdminCategory.from_orm(db_category)
-
-    def get_categories(self, skip: int = 0, limit: int = 100) -> List[schemas.AdminCategory]:
-        return self.db.query(models.Category).offset(skip).limit(limit).all()
-
-    def get_category(self, category_id: int) -> schemas.AdminCategory:
-        category = self.db.query(models.Category).filter(
-            models.Category.id == category_id
-        ).first()
+            description=category.description,
+            parent_id=category.parent_id,
+            status=category.status
+        ))
+        await self.categories.commit()
+        invalidate_category_tree()
+        await response_cache.invalidate("categories")
+        return await self.categories.refresh(db_category)
+
+    async def get_category(self, category_id: int) -> Category:
+        category = await self.categories.get(category_id)
         if not category:
             raise HTTPException(status_code=404, detail="Category not found")
-        return schemas.AdminCategory.from_orm(category)
+        return category
 
-    def update_category(
-        self,
-        category_id: int,
-        category: schemas.AdminCategoryUpdate
-    ) -> schemas.AdminCategory:
-        db_category = self.db.query(models.Category).filter(
-            models.Category.id == category_id
-        ).first()
-        if not db_category:
-            raise HTTPException(status_code=404, detail="Category not found")
-        
-        if category.name:
-            db_category.name = category.name
-        if category.description:
-            db_category.description = category.description
-        
-        self.db.commit()
-        self.db.refresh(db_category)
-        return schemas.AdminCategory.from_orm(db_category)
-
-    def delete_category(self, category_id: int) -> None:
-        category = self.db.query(models.Category).filter(
-            models.Category.id == category_id
-        ).first()
-        if not category:
-            raise HTTPException(status_code=404, detail="Category not found")
-        
-        self.db.delete(category)
-        self.db.commit()
+    async def update_category(self, category_id: int, category: schemas.CategoryUpdate) -> Category:
+        db_category = await self.get_category(category_id)
+
+        # Only columns the model has; display fields are not stored yet
+        for key, value in category.model_dump(exclude_unset=True).items():
+            if key in Category.__table__.columns:
+                setattr(db_category, key, value)
+
+        await self.categories.commit()
+        invalidate_category_tree()
+        await response_cache.invalidate("categories")
+        return await self.categories.refresh(db_category)
+
+    async def delete_category(self, category_id: int) -> None:
+        category = await self.get_category(category_id)
+
+        if await self.posts.exists(Post.category_id == category_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot delete category as it contains posts"
+            )
 
-    def get_reports(
+        await self.categories.delete(category)
+        await self.categories.commit()
+        invalidate_category_tree()
+        await response_cache.invalidate("categories")
+
+    async def get_reports(
         self,
         skip: int = 0,
         limit: int = 100,
@@ -1030,22 +696,24 @@ class AdminService:
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
     ) -> schemas.AdminReportList:
-        query = self.db.query(models.Report)
-        
+        criteria = []
+
         if status:
-            query = query.filter(models.Report.status == status)
+            criteria.append(models.Report.status == status)
         if type:
-            query = query.filter(models.Report.content_type == type)
+            criteria.append(models.Report.content_type == type)
         if category_id:
-            query = query.filter(models.Report.category_id == category_id)
+            criteria.append(models.Report.category_id == category_id)
         if start_date:
-            query = query.filter(models.Report.created_at >= start_date)
+            criteria.append(models.Report.created_at >= start_date)
         if end_date:
-            query = query.filter(models.Report.created_at <= end_date)
+            criteria.append(models.Report.created_at <= end_date)
+
+        total = await self.reports.count(*criteria)
+        reports = await self.reports.list(
+            *criteria, offset=skip, limit=limit, options=loader_options("admin.reports")
+        )
 
-        total = query.count()
-        reports = query.offset(skip).limit(limit).all()
-        
         return schemas.AdminReportList(
             reports=[schemas.AdminReport(
                 id=report.id,
@@ -1060,212 +728,58 @@ class AdminService:
                 resolution_notes=report.resolution_notes,
                 reporter=report.reporter,
                 reported=report.reported,
-                content=report.content,
                 category=report.category
             ) for report in reports],
             total=total
         )
 
-    def resolve_report(self, report_id: int, resolution_notes: Optional[str] = None) -> schemas.AdminReport:
-        report = self.db.query(models.Report).filter(
-            models.Report.id == report_id
-        ).first()
+    async def _close_report(self, report_id: int, status: str, resolution_notes: Optional[str] = None) -> schemas.AdminReport:
+        report = await self.reports.get(report_id)
         if not report:
             raise HTTPException(status_code=404, detail="Report not found")
-        
-        if report.status != "pending":
-            raise HTTPException(status_code=400, detail="Report is already resolved")
-        
-        report.status = "resolved"
-        report.resolved_at = datetime.now()
-        report.resolution_notes = resolution_notes
-        
-        self.db.commit()
-        self.db.refresh(report)
-        return schemas.AdminReport.from_orm(report)
 
-    def ignore_report(self, report_id: int) -> schemas.AdminReport:
-        report = self.db.query(models.Report).filter(
-            models.Report.id == report_id
-        ).first()
-        if not report:
-            raise HTTPException(status_code=404, detail="Report not found")
-        
         if report.status != "pending":
             raise HTTPException(status_code=400, detail="Report is already resolved")
-        
-        report.status = "ignored"
+
+        report.status = status
         report.resolved_at = datetime.now()
-        
-        self.db.commit()
-        self.db.refresh(report)
+        if resolution_notes is not None:
+            report.resolution_notes = resolution_notes
+
+        await self.reports.commit()
+        await self.reports.refresh(report)
         return schemas.AdminReport.from_orm(report)
 
-    def get_analytics(
+    async def resolve_report(self, report_id: int, resolution_notes: Optional[str] = None) -> schemas.AdminReport:
+        return await self._close_report(report_id, "resolved", resolution_notes)
+
+    async def ignore_report(self, report_id: int) -> schemas.AdminReport:
+        return await self._close_report(report_id, "ignored")
+
+    async def get_analytics(
         self,
         range: str = "week",
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
     ) -> schemas.AdminAnalyticsStats:
-        if range == "week":
-            start_date = datetime.now() - timedelta(days=7)
-        elif range == "month":
-            start_date = datetime.now() - timedelta(days=30)
-        elif range == "year":
-            start_date = datetime.now() - timedelta(days=365)
-        
-        if not end_date:
-            end_date = datetime.now()
-
-        # User Growth
-        user_growth = self.db.query(
-            models.User.created_at,
-            func.count(models.User.id).label("count")
-        ).filter(
-            models.User.created_at >= start_date,
-            models.User.created_at <= end_date
-        ).group_by(
-            func.date_trunc('day', models.User.created_at)
-        ).all()
-
-        # Content Performance
-        content_performance = self.db.query(
-            models.Post.category_id,
-            func.count(models.Post.id).label("post_count"),
-            func.avg(models.Post.likes).label("avg_likes"),
-            func.avg(models.Post.comments).label("avg_comments")
-        ).filter(
-            models.Post.created_at >= start_date,
-            models.Post.created_at <= end_date
-        ).group_by(models.Post.category_id).all()
-
-        # Engagement Metrics
-        engagement_metrics = self.db.query(
-            models.Post.id,
-            models.Post.likes,
-            models.Post.comments,
-            models.Post.shares
-        ).filter(
-            models.Post.created_at >= start_date,
-            models.Post.created_at <= end_date
-        ).all()
-
-        # Category Distribution
-        category_distribution = self.db.query(
-            models.Category.id,
-            models.Category.name,
-            func.count(models.Post.id).label("post_count")
-        ).join(models.Post).filter(
-            models.Post.created_at >= start_date,
-            models.Post.created_at <= end_date
-        ).group_by(models.Category.id, models.Category.name).all()
-
-        # User Activity
-        user_activity = self.db.query(
-            func.date_trunc('hour', models.ActivityLog.created_at).label("hour"),
-            func.count(models.ActivityLog.id).label("activity_count")
-        ).filter(
-            models.ActivityLog.created_at >= start_date,
-            models.ActivityLog.created_at <= end_date
-        ).group_by("hour").all()
-
-        # Calculate statistics
-        stats = {
-            "total_users": self.db.query(models.User).count(),
-            "new_users": self.db.query(models.User).filter(
-                models.User.created_at >= start_date
-            ).count(),
-            "active_users": self.db.query(models.User).filter(
-                models.User.last_active >= start_date
-            ).count(),
-            "total_posts": self.db.query(models.Post).count(),
-            "total_comments": self.db.query(models.Comment).count(),
-            "avg_engagement": sum(p.likes + p.comments + p.shares for p in engagement_metrics) / len(engagement_metrics) if engagement_metrics else 0,
-            "top_category": content_performance[0][0] if content_performance else None,
-            "total_interactions": sum(p.likes + p.comments + p.shares for p in engagement_metrics) if engagement_metrics else 0,
-            "avg_comments": sum(p.comments for p in engagement_metrics) / len(engagement_metrics) if engagement_metrics else 0,
-            "avg_likes": sum(p.likes for p in engagement_metrics) / len(engagement_metrics) if engagement_metrics else 0,
-            "user_growth": [{"date": str(d[0]), "count": d[1]} for d in user_growth],
-            "content_performance": [{"category": c[0], "post_count": c[1], "avg_likes": c[2], "avg_comments": c[3]} for c in content_performance],
-            "engagement_metrics": [{"likes": e.likes, "comments": e.comments, "shares": e.shares} for e in engagement_metrics],
-            "category_distribution": [{"category": c[1], "post_count": c[2]} for c in category_distribution],
-            "user_activity": [{"hour": str(u[0]), "activity_count": u[1]} for u in user_activity]
-        }
-        
+        stats = await analytics.get_analytics(self.db, range, start_date, end_date)
         return schemas.AdminAnalyticsStats(**stats)
 
-async def get_dashboard_stats(db: Session):
-    # User metrics
-    total_users = db.query(User).count()
-    active_users = db.query(User).filter(User.is_active == True).count()
-    new_users_today = db.query(User).filter(
-        User.created_at >= datetime.utcnow() - timedelta(days=1)
-    ).count()
-    
-    # Content metrics
-    total_posts = db.query(Post).count()
-    active_posts = db.query(Post).filter(Post.status == "active").count()
-    new_posts_today = db.query(Post).filter(
-        Post.created_at >= datetime.utcnow() - timedelta(days=1)
-    ).count()
-    
-    total_comments = db.query(Comment).count()
-    new_comments_today = db.query(Comment).filter(
-        Comment.created_at >= datetime.utcnow() - timedelta(days=1)
-    ).count()
-    
-    # Moderation metrics
-    pending_moderation = db.query(Post).filter(
-        Post.status == "pending"
-    ).count()
-    
-    reported_content = db.query(Post).filter(
-        Post.is_reported == True
-    ).count() + db.query(Comment).filter(
-        Comment.is_reported == True
-    ).count()
-    
-    # Usage metrics
-    storage_usage = await calculate_storage_usage(db)
-    bandwidth_usage = await calculate_bandwidth_usage(db)
-    
-    # Engagement metrics
-    avg_comments_per_post = total_comments / total_posts if total_posts > 0 else 0
-    avg_likes_per_post = db.query(Like).count() / total_posts if total_posts > 0 else 0
-    
-    # User activity metrics
-    active_users_7d = db.query(User).filter(
-        User.last_login >= datetime.utcnow() - timedelta(days=7)
-    ).count()
-    
-    # Category metrics
-    active_categories = db.query(Category).filter(
-        Category.status == "active"
-    ).count()
-    
-    stats = {
-        "total_users": total_users,
-        "active_users": active_users,
-        "new_users_today": new_users_today,
-        "active_users_7d": active_users_7d,
-        "total_posts": total_posts,
-        "active_posts": active_posts,
-        "new_posts_today": new_posts_today,
-        "total_comments": total_comments,
-        "new_comments_today": new_comments_today,
-        "avg_comments_per_post": avg_comments_per_post,
-        "avg_likes_per_post": avg_likes_per_post,
-        "pending_moderation": pending_moderation,
-        "reported_content": reported_content,
-        "storage_usage": storage_usage,
-        "bandwidth_usage": bandwidth_usage,
-        "active_categories": active_categories
-    }
-    
+def _order_by(model, sort_by: str, sort_order: str, default: str = "created_at"):
+    """ORDER BY for a client-chosen column, falling back to `default` for unknown names."""
+    columns = model.__table__.columns
+    column = columns.get(sort_by, columns[default])
+    return column.asc() if sort_order == "asc" else column.desc()
+
+def _pages(total: int, page_size: int) -> int:
+    return (total + page_size - 1) // page_size
+
+async def get_dashboard_stats(db: AsyncSession):
+    stats = await dashboard.get_dashboard_stats(db)
     return schemas.AdminDashboardStats(**stats)
 
 async def get_activity_logs(
-    db: Session,
+    db: AsyncSession,
     page: int = 1,
     page_size: int = 20,
     user_id: Optional[int] = None,
@@ -1278,156 +792,212 @@ async def get_activity_logs(
     sort_by: str = "created_at",
     sort_order: str = "desc"
 ):
-    query = db.query(ActivityLog)
-    
+    logs_repo = ActivityLogRepository(db)
+    criteria = []
+
     # Apply filters
     if user_id:
-        query = query.filter(ActivityLog.user_id == user_id)
+        criteria.append(ActivityLog.user_id == user_id)
     if action:
-        query = query.filter(ActivityLog.action == action)
+        criteria.append(ActivityLog.action == action)
     if resource:
-        query = query.filter(ActivityLog.resource == resource)
+        criteria.append(ActivityLog.resource == resource)
     if resource_id:
-        query = query.filter(ActivityLog.resource_id == resource_id)
+        criteria.append(ActivityLog.resource_id == resource_id)
     if status:
-        query = query.filter(ActivityLog.status == status)
+        criteria.append(ActivityLog.status == status)
     if start_date:
-        query = query.filter(ActivityLog.created_at >= start_date)
+        criteria.append(ActivityLog.created_at >= start_date)
     if end_date:
-        query = query.filter(ActivityLog.created_at <= end_date)
-    
+        criteria.append(ActivityLog.created_at <= end_date)
+
     # Get total count before applying pagination
-    total = query.count()
-    
-    # Apply sorting
-    sort_direction = getattr(ActivityLog, sort_by)
-    if sort_order == "desc":
-        sort_direction = sort_direction.desc()
-    else:
-        sort_direction = sort_direction.asc()
-    
+    total = await logs_repo.count(*criteria)
+
     # Apply pagination and fetch results
-    logs = query.order_by(sort_direction)\
-        .offset((page - 1) * page_size)\
-        .limit(page_size)\
-        .all()
-    
+    logs = await logs_repo.list(
+        *criteria,
+        order_by=[_order_by(ActivityLog, sort_by, sort_order)],
+        offset=(page - 1) * page_size,
+        limit=page_size
+    )
+
     # Calculate metrics
+    most_active = next(iter(await logs_repo.rows(
+        select(ActivityLog.user_id, func.count(ActivityLog.user_id))
+        .group_by(ActivityLog.user_id)
+        .order_by(func.count(ActivityLog.user_id).desc())
+        .limit(1)
+    )), None)
     metrics = {
         "total_logs": total,
-        "unique_users": db.query(ActivityLog.user_id).distinct().count(),
-        "unique_resources": db.query(ActivityLog.resource).distinct().count(),
-        "most_active_user": db.query(ActivityLog.user_id, func.count(ActivityLog.user_id))
-            .group_by(ActivityLog.user_id)
-            .order_by(func.count(ActivityLog.user_id).desc())
-            .first()
+        "unique_users": await logs_repo.scalar(select(func.count(distinct(ActivityLog.user_id)))),
+        "unique_resources": await logs_repo.scalar(select(func.count(distinct(ActivityLog.resource)))),
+        "most_active_user": most_active.user_id if most_active else None
     }
-    
+
     return schemas.AdminActivityLogList(
         logs=logs,
         total=total,
         page=page,
-        pages=(total + page_size - 1) // page_size,
+        pages=_pages(total, page_size),
         metrics=metrics
     )
 
 async def get_notifications(
-    db: Session,
+    db: AsyncSession,
     page: int = 1,
     page_size: int = 20,
     user_id: Optional[int] = None,
     read: Optional[bool] = None,
-    type: Optional[str] = None
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    sort_by: str = "created_at",
+    sort_order: str = "desc"
 ):
-    query = db.query(Notification)
-    
+    notifications_repo = NotificationRepository(db)
+    criteria = []
+
     if user_id:
-        query = query.filter(Notification.user_id == user_id)
+        criteria.append(Notification.user_id == user_id)
     if read is not None:
-        query = query.filter(Notification.read == read)
-    if type:
-        query = query.filter(Notification.type == type)
-    
-    total = query.count()
-    notifications = query.order_by(Notification.created_at.desc())\
-        .offset((page - 1) * page_size)\
-        .limit(page_size)\
-        .all()
-    
+        criteria.append(Notification.read == read)
+    if start_date:
+        criteria.append(Notification.created_at >= start_date)
+    if end_date:
+        criteria.append(Notification.created_at <= end_date)
+
+    total = await notifications_repo.count(*criteria)
+    notifications = await notifications_repo.list(
+        *criteria,
+        order_by=[_order_by(Notification, sort_by, sort_order)],
+        offset=(page - 1) * page_size,
+        limit=page_size
+    )
+
     return schemas.AdminNotificationList(
         notifications=notifications,
         total=total,
         page=page,
-        pages=(total + page_size - 1) // page_size
+        pages=_pages(total, page_size)
+    )
+
+async def mark_notification_as_read(db: AsyncSession, notification_id: int):
+    # Through NotificationService so the owner's counters and open sockets follow
+    return await NotificationService().mark_notification_as_read(db, notification_id)
+
+async def mark_all_notifications_as_read(db: AsyncSession, user_id: int) -> None:
+    await NotificationService().mark_all_notifications_as_read(db, user_id)
+
+async def get_roles(
+    db: AsyncSession,
+    page: int = 1,
+    page_size: int = 20,
+    name: Optional[str] = None,
+    status: Optional[str] = None,
+    sort_by: str = "name",
+    sort_order: str = "asc"
+):
+    roles_repo = RoleRepository(db)
+    criteria = []
+
+    if name:
+        # Served by the trigram index of migration 017 on Postgres
+        criteria.append(Role.name.ilike(f"%{name}%"))
+    if status:
+        criteria.append(Role.status == status)
+
+    total = await roles_repo.count(*criteria)
+    roles = await roles_repo.list(
+        *criteria,
+        order_by=[_order_by(Role, sort_by, sort_order, default="name")],
+        offset=(page - 1) * page_size,
+        limit=page_size
+    )
+
+    return schemas.RoleListResponse(
+        roles=roles,
+        total=total,
+        page=page,
+        pages=_pages(total, page_size)
     )
 
 async def assign_role(
-    db: Session,
+    db: AsyncSession,
     user_id: int,
     role_id: int,
     assigned_by: int,
     reason: Optional[str] = None
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    users = UserRepository(db)
+    user = await users.get(user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    
-    user.role_id = role_id
-    user.updated_at = datetime.utcnow()
-    
+    role = await RoleRepository(db).get(role_id)
+    if not role:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Role not found"
+        )
+
+    # The role name is what authorization checks read from the principal
+    user.role = role.name
+
     # Create role assignment log
-    assignment = RoleAssignment(
+    assignment = RoleAssignmentRepository(db).add(RoleAssignment(
         user_id=user_id,
         role_id=role_id,
         assigned_by=assigned_by,
         assigned_at=datetime.utcnow(),
         reason=reason
-    )
-    db.add(assignment)
-    
-    db.commit()
-    db.refresh(user)
-    
-    return schemas.AdminRoleAssignment(
-        user_id=user_id,
-        role_id=role_id,
-        assigned_by=assigned_by,
-        assigned_at=datetime.utcnow(),
-        reason=reason
-    )
+    ))
+
+    await users.commit()
+    await users.refresh(assignment)
+    invalidate_user_cache(user.username)
+
+    return assignment
 
 async def get_role_assignments(
-    db: Session,
+    db: AsyncSession,
     page: int = 1,
     page_size: int = 20,
     user_id: Optional[int] = None,
-    role_id: Optional[int] = None
+    role_id: Optional[int] = None,
+    status: Optional[str] = None,
+    sort_by: str = "assigned_at",
+    sort_order: str = "desc"
 ):
-    query = db.query(RoleAssignment)
-    
+    assignments_repo = RoleAssignmentRepository(db)
+    criteria = []
+
     if user_id:
-        query = query.filter(RoleAssignment.user_id == user_id)
+        criteria.append(RoleAssignment.user_id == user_id)
     if role_id:
-        query = query.filter(RoleAssignment.role_id == role_id)
-    
-    total = query.count()
-    assignments = query.order_by(RoleAssignment.assigned_at.desc())\
-        .offset((page - 1) * page_size)\
-        .limit(page_size)\
-        .all()
-    
+        criteria.append(RoleAssignment.role_id == role_id)
+    if status:
+        criteria.append(RoleAssignment.status == status)
+
+    total = await assignments_repo.count(*criteria)
+    assignments = await assignments_repo.list(
+        *criteria,
+        order_by=[_order_by(RoleAssignment, sort_by, sort_order, default="assigned_at")],
+        offset=(page - 1) * page_size,
+        limit=page_size
+    )
+
     return schemas.AdminRoleAssignmentList(
         assignments=assignments,
         total=total,
         page=page,
-        pages=(total + page_size - 1) // page_size
+        pages=_pages(total, page_size)
     )
 
 async def moderate_content(
-    db: Session,
+    db: AsyncSession,
     content_id: int,
     content_type: str,
     action: str,
@@ -1435,77 +1005,155 @@ async def moderate_content(
     reason: Optional[str] = None
 ):
     if content_type == "post":
-        content = db.query(Post).filter(Post.id == content_id).first()
+        content = await PostRepository(db).get(content_id)
     elif content_type == "comment":
-        content = db.query(Comment).filter(Comment.id == content_id).first()
+        content = await CommentRepository(db).get(content_id)
     else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid content type"
         )
-    
+
     if not content:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Content not found"
         )
-    
-    if action == "approve":
-        content.status = "active"
-    elif action == "reject":
-        content.status = "rejected"
-    elif action == "delete":
-        content.status = "deleted"
-    else:
+
+    if action not in MODERATION_ACTIONS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid moderation action"
         )
-    
-    content.updated_at = datetime.utcnow()
-    
+    content.status = CONTENT_STATUS["ACTIVE"] if action == "approve" else MODERATION_ACTIONS[action]
+
     # Create moderation log
-    log = ModerationLog(
+    logs = ModerationLogRepository(db)
+    logs.add(ModerationLog(
         content_id=content_id,
         content_type=content_type,
         moderator_id=moderator_id,
         action=action,
+        status=content.status,
         reason=reason,
         created_at=datetime.utcnow()
-    )
-    db.add(log)
-    
-    db.commit()
-    db.refresh(content)
-    
-    return content
+    ))
+
+    await logs.commit()
+    search_service.index_document(content_type, content)
+    post_id = content.id if content_type == "post" else content.post_id
+    await response_cache.invalidate(*response_cache.post_tags(post_id))
+
+    return {"id": content_id, "content_type": content_type, "status": content.status}
 
 async def get_moderation_logs(
-    db: Session,
+    db: AsyncSession,
     page: int = 1,
     page_size: int = 20,
     moderator_id: Optional[int] = None,
     content_type: Optional[str] = None,
-    action: Optional[str] = None
+    action: Optional[str] = None,
+    status: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    sort_by: str = "created_at",
+    sort_order: str = "desc"
 ):
-    query = db.query(ModerationLog)
-    
+    logs_repo = ModerationLogRepository(db)
+    criteria = []
+
     if moderator_id:
-        query = query.filter(ModerationLog.moderator_id == moderator_id)
+        criteria.append(ModerationLog.moderator_id == moderator_id)
     if content_type:
-        query = query.filter(ModerationLog.content_type == content_type)
+        criteria.append(ModerationLog.content_type == content_type)
     if action:
-        query = query.filter(ModerationLog.action == action)
-    
-    total = query.count()
-    logs = query.order_by(ModerationLog.created_at.desc())\
-        .offset((page - 1) * page_size)\
-        .limit(page_size)\
-        .all()
-    
+        criteria.append(ModerationLog.action == action)
+    if status:
+        criteria.append(ModerationLog.status == status)
+    if start_date:
+        criteria.append(ModerationLog.created_at >= start_date)
+    if end_date:
+        criteria.append(ModerationLog.created_at <= end_date)
+
+    total = await logs_repo.count(*criteria)
+    logs = await logs_repo.list(
+        *criteria,
+        order_by=[_order_by(ModerationLog, sort_by, sort_order)],
+        offset=(page - 1) * page_size,
+        limit=page_size
+    )
+
     return {
         "logs": logs,
         "total": total,
         "page": page,
-        "pages": (total + page_size - 1) // page_size
+        "pages": _pages(total, page_size)
     }
+
+async def get_categories(
+    db: AsyncSession,
+    page: int = 1,
+    page_size: int = 20,
+    name: Optional[str] = None,
+    status: Optional[str] = None,
+    sort_by: str = "name",
+    sort_order: str = "asc"
+):
+    categories_repo = CategoryRepository(db)
+    criteria = []
+
+    if name:
+        criteria.append(Category.name.ilike(f"%{name}%"))
+    if status:
+        criteria.append(Category.status == status)
+
+    total = await categories_repo.count(*criteria)
+    categories = await categories_repo.list(
+        *criteria,
+        order_by=[_order_by(Category, sort_by, sort_order, default="name")],
+        offset=(page - 1) * page_size,
+        limit=page_size
+    )
+
+    # Counts for this page only, one grouped query each
+    ids = [category.id for category in categories]
+    posts_count = dict(await categories_repo.rows(
+        select(Post.category_id, func.count()).where(Post.category_id.in_(ids)).group_by(Post.category_id)
+    )) if ids else {}
+    subcategories_count = dict(await categories_repo.rows(
+        select(Category.parent_id, func.count()).where(Category.parent_id.in_(ids)).group_by(Category.parent_id)
+    )) if ids else {}
+
+    return schemas.CategoryListResponse(
+        categories=[
+            schemas.CategoryResponse(
+                id=category.id,
+                name=category.name,
+                description=category.description,
+                parent_id=category.parent_id,
+                status=category.status,
+                posts_count=posts_count.get(category.id, 0),
+                subcategories_count=subcategories_count.get(category.id, 0)
+            )
+            for category in categories
+        ],
+        total=total,
+        page=page,
+        pages=_pages(total, page_size)
+    )
+
+async def ban_user(
+    db: AsyncSession,
+    user_id: int,
+    moderator_id: int,
+    reason: str,
+    duration: Optional[int] = None
+):
+    """Ban for `duration` days, or permanently when no duration is given."""
+    ban_type = "temporary" if duration else "permanent"
+    user = await AdminService(db).ban_user(user_id, moderator_id, ban_type, duration, reason)
+    return {"id": user.id, "is_active": user.is_active}
+
+async def unban_user(db: AsyncSession, user_id: int, moderator_id: int):
+    user = await AdminService(db).unban_user(user_id, moderator_id)
+    return {"id": user.id, "is_active": user.is_active}
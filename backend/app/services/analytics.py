@@ -0,0 +1,273 @@
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Set
+from sqlalchemy import and_, select, insert, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import SessionLocal
+from ..models import User, Post, Comment, Like, Category, AnalyticsBucket, AnalyticsWatermark
+from ..config import settings
+from ..utils.scheduler import periodic
+
+logger = logging.getLogger(__name__)
+
+# metric -> (source model, category column or None, joined through posts)
+SOURCES = {
+    "users": (User, None, False),
+    "posts": (Post, Post.category_id, False),
+    "comments": (Comment, Post.category_id, True),
+    "likes": (Like, Post.category_id, True),
+}
+ENGAGEMENT_METRICS = ("posts", "comments", "likes")
+
+RANGES = {
+    "week": timedelta(days=7),
+    "month": timedelta(days=30),
+    "year": timedelta(days=365),
+}
+
+def _truncate_hour(column, dialect: str):
+    if dialect == "sqlite":
+        return func.strftime("%Y-%m-%d %H:00:00", column)
+    return func.date_trunc("hour", column)
+
+def _as_datetime(value) -> datetime:
+    # SQLite returns the truncated timestamp as text
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+def _floor(moment: datetime, granularity: str) -> datetime:
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0) if granularity == "day" else moment
+
+async def _rollup_rows(db: AsyncSession, metric: str, criterion) -> int:
+    """Append hour and day buckets for the source rows matching `criterion`."""
+    model, category, via_post = SOURCES[metric]
+    hour = _truncate_hour(model.created_at, db.bind.dialect.name)
+    columns = [hour.label("bucket_start")]
+    if category is not None:
+        columns.append(category.label("category_id"))
+
+    query = select(*columns, func.count().label("value")).select_from(model)
+    if via_post:
+        query = query.join(Post, Post.id == model.post_id)
+    query = (
+        query.where(criterion, model.created_at.isnot(None))
+        .group_by(*(column for column in [hour, category] if column is not None))
+    )
+
+    buckets: Dict[tuple, int] = defaultdict(int)
+    for row in (await db.execute(query)).mappings():
+        start = _as_datetime(row["bucket_start"])
+        category_id = row.get("category_id")
+        buckets[("hour", start, category_id)] += row["value"]
+        buckets[("day", _floor(start, "day"), category_id)] += row["value"]
+
+    if buckets:
+        await db.execute(insert(AnalyticsBucket), [{
+            "granularity": granularity,
+            "bucket_start": start,
+            "metric": metric,
+            "category_id": category_id,
+            "value": value,
+        } for (granularity, start, category_id), value in buckets.items()])
+    return len(buckets)
+
+async def _present_ids(db: AsyncSession, model, lower: int, upper: int) -> Set[int]:
+    """Ids in (lower, upper] currently visible in the source table."""
+    criterion = (model.id > lower, model.id <= upper)
+    count = (await db.execute(select(func.count()).select_from(model).where(*criterion))).scalar()
+    if count == upper - lower:
+        # No gaps, the usual case: skip fetching the ids
+        return set(range(lower + 1, upper + 1))
+    return set((await db.execute(select(model.id).where(*criterion))).scalars())
+
+async def _lock_watermark(db: AsyncSession, metric: str) -> AnalyticsWatermark:
+    """The metric's watermark row, locked until the next commit.
+
+    Concurrent rollups (several workers run the periodic job) queue on
+    this lock, and each re-reads the watermark once it holds it, so no
+    id range is appended twice.
+    """
+    query = (
+        select(AnalyticsWatermark)
+        .where(AnalyticsWatermark.source == metric)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    watermark = (await db.execute(query)).scalar_one_or_none()
+    if watermark is None:
+        db.add(AnalyticsWatermark(source=metric, last_id=0, pending_ids=[]))
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Another worker created it first
+            await db.rollback()
+        watermark = (await db.execute(query)).scalar_one()
+    return watermark
+
+async def rollup_analytics(db: AsyncSession, batch_size: int = None) -> Dict[str, int]:
+    """Fold source rows added since each metric's high-water mark into buckets.
+
+    The watermark is the last id scanned. Ids are assigned at insert but
+    become visible at commit, so a row can appear below the watermark
+    after its range was scanned. Missing ids within the trailing
+    ANALYTICS_ROLLUP_OVERLAP are kept on the watermark and re-checked on
+    later runs; each is counted once, when it first shows up. Ids still
+    missing once they fall out of that window are taken as rolled back.
+
+    Each batch locks the watermark, appends its buckets and advances the
+    watermark in one transaction, so neither a crash nor a concurrent
+    run double counts. Buckets count rows as created: deleting a source
+    row does not take it back out, and rows deleted before they were
+    rolled up are never counted. Returns the rows counted per metric.
+    """
+    batch_size = batch_size or settings.ANALYTICS_ROLLUP_BATCH_SIZE
+    overlap = settings.ANALYTICS_ROLLUP_OVERLAP
+    processed = {}
+    for metric, (model, _, _) in SOURCES.items():
+        max_id = (await db.execute(select(func.max(model.id)))).scalar() or 0
+        counted = 0
+        while True:
+            watermark = await _lock_watermark(db, metric)
+            pending = set(watermark.pending_ids or ())
+            # Late commits below the watermark
+            arrived = set()
+            if pending:
+                arrived = set((await db.execute(select(model.id).where(model.id.in_(pending)))).scalars())
+            if arrived:
+                await _rollup_rows(db, metric, model.id.in_(arrived))
+                pending -= arrived
+                counted += len(arrived)
+
+            lower = watermark.last_id
+            upper = min(lower + batch_size, max_id)
+            if upper > lower:
+                present = await _present_ids(db, model, lower, upper)
+                # Only the ids seen are aggregated: one committing in between
+                # stays pending and is counted when it is re-checked
+                if len(present) == upper - lower:
+                    await _rollup_rows(db, metric, and_(model.id > lower, model.id <= upper))
+                elif present:
+                    await _rollup_rows(db, metric, model.id.in_(present))
+                pending |= set(range(max(lower, upper - overlap) + 1, upper + 1)) - present
+                counted += len(present)
+                watermark.last_id = upper
+
+            floor = watermark.last_id - overlap
+            watermark.pending_ids = sorted(row_id for row_id in pending if row_id > floor)
+            watermark.updated_at = datetime.utcnow()
+            await db.commit()
+            if upper <= lower:
+                break
+        processed[metric] = counted
+    return processed
+
+@periodic(settings.ANALYTICS_ROLLUP_INTERVAL)
+async def rollup_analytics_job() -> None:
+    async with SessionLocal() as db:
+        processed = await rollup_analytics(db)
+    if any(processed.values()):
+        logger.debug("Rolled up analytics: %s", processed)
+
+async def _sums(
+    db: AsyncSession,
+    granularity: str,
+    metrics: Iterable[str],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    group_by: Iterable = ()
+):
+    group_by = list(group_by)
+    query = (
+        select(AnalyticsBucket.metric, *group_by, func.sum(AnalyticsBucket.value).label("value"))
+        .where(AnalyticsBucket.granularity == granularity, AnalyticsBucket.metric.in_(list(metrics)))
+        .group_by(AnalyticsBucket.metric, *group_by)
+    )
+    if start is not None:
+        query = query.where(AnalyticsBucket.bucket_start >= start)
+    if end is not None:
+        query = query.where(AnalyticsBucket.bucket_start <= end)
+    return (await db.execute(query)).all()
+
+async def get_analytics(
+    db: AsyncSession,
+    range: str = "week",
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """Analytics for a period, read only from the pre-aggregated buckets.
+
+    Ranges up to a week use hourly buckets, longer ones daily buckets, so
+    the cost depends on the number of buckets rather than table sizes.
+    Figures lag the source tables by at most ANALYTICS_ROLLUP_INTERVAL.
+    """
+    end_date = end_date or datetime.utcnow()
+    if range in RANGES:
+        start_date = end_date - RANGES[range]
+    start_date = start_date or end_date - RANGES["week"]
+
+    granularity = "hour" if end_date - start_date <= RANGES["week"] else "day"
+    start = _floor(start_date, granularity)
+
+    totals = {row.metric: row.value for row in await _sums(db, "day", ("users", "posts", "comments"))}
+    in_range = {
+        row.metric: row.value
+        for row in await _sums(db, granularity, ("users",) + ENGAGEMENT_METRICS, start, end_date)
+    }
+
+    per_category: Dict[Any, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(ENGAGEMENT_METRICS, 0))
+    for row in await _sums(db, granularity, ENGAGEMENT_METRICS, start, end_date, [AnalyticsBucket.category_id]):
+        per_category[row.category_id][row.metric] = row.value
+
+    timeline: Dict[datetime, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(("users",) + ENGAGEMENT_METRICS, 0))
+    for row in await _sums(db, granularity, ("users",) + ENGAGEMENT_METRICS, start, end_date, [AnalyticsBucket.bucket_start]):
+        timeline[row.bucket_start][row.metric] = row.value
+    timeline = dict(sorted(timeline.items()))
+
+    names = dict((await db.execute(select(Category.id, Category.name))).all())
+    performance = sorted((
+        {
+            "category": names.get(category_id, str(category_id)),
+            "post_count": counts["posts"],
+            "avg_likes": counts["likes"] / counts["posts"] if counts["posts"] else 0,
+            "avg_comments": counts["comments"] / counts["posts"] if counts["posts"] else 0,
+        }
+        for category_id, counts in per_category.items()
+    ), key=lambda item: item["post_count"], reverse=True)
+
+    posts = in_range.get("posts", 0)
+    comments = in_range.get("comments", 0)
+    likes = in_range.get("likes", 0)
+    active_users = (await db.execute(
+        select(func.count(User.id)).where(User.last_login >= start_date)
+    )).scalar()
+
+    return {
+        "total_users": totals.get("users", 0),
+        "new_users": in_range.get("users", 0),
+        "active_users": active_users,
+        "total_posts": totals.get("posts", 0),
+        "total_comments": totals.get("comments", 0),
+        "avg_engagement": (likes + comments) / posts if posts else 0,
+        "top_category": performance[0]["category"] if performance else None,
+        "total_interactions": likes + comments,
+        "avg_comments": comments / posts if posts else 0,
+        "avg_likes": likes / posts if posts else 0,
+        "user_growth": [
+            {"date": str(bucket), "count": counts["users"]}
+            for bucket, counts in timeline.items() if counts["users"]
+        ],
+        "content_performance": performance,
+        "engagement_metrics": [
+            {"date": str(bucket), "likes": counts["likes"], "comments": counts["comments"]}
+            for bucket, counts in timeline.items()
+        ],
+        "category_distribution": [
+            {"category": item["category"], "post_count": item["post_count"]} for item in performance
+        ],
+        "user_activity": [
+            {"hour": str(bucket), "activity_count": sum(counts[metric] for metric in ENGAGEMENT_METRICS)}
+            for bucket, counts in timeline.items()
+        ],
+    }
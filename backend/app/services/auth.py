@@ -15,19 +15,22 @@ from app.schemas.user import PasswordReset
 from app.schemas.user import Token
 from app.schemas.user import TokenData
 from app.services.security import (
-    verify_password,
-    get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
+    rehash_password_if_needed,
     create_access_token,
     get_current_user,
     generate_otp,
     verify_otp,
-    validate_password_strength
+    validate_password_strength,
+    invalidate_user_cache
 )
 from app.services.email import send_verification_email, send_password_reset_email
 from app.database import get_db
 from app.config import settings
 from app.utils.recaptcha import verify_recaptcha
 from app.utils.rate_limiter import rate_limiter
+from app.services.login_attempts import count_failed_attempts, note_failed_attempt
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -36,13 +39,7 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 async def get_failed_login_attempts(db: AsyncSession, username: str, ip_address: str) -> int:
     """Get the number of failed login attempts for a username/IP."""
     # Check both username and IP based attempts
-    query = select(LoginAttempt).where(
-        (LoginAttempt.username == username) | 
-        (LoginAttempt.ip_address == ip_address),
-        LoginAttempt.created_at > datetime.utcnow() - timedelta(hours=1)  # Last hour
-    )
-    result = await db.execute(query)
-    return len(result.scalars().all())
+    return await count_failed_attempts(db, username, ip_address)
 
 @router.post("/forgot-password", response_model=Dict[str, Any])
 async def forgot_password(
@@ -59,7 +56,7 @@ async def forgot_password(
         reset_token = secrets.token_urlsafe(32)
         
         # Store reset token in database
-        reset_token_hash = get_password_hash(reset_token)
+        reset_token_hash = await get_password_hash_async(reset_token)
         user.reset_token = reset_token_hash
         user.reset_token_expires = datetime.utcnow() + timedelta(hours=24)  # Token valid for 24 hours
         db.add(user)
@@ -99,7 +96,7 @@ async def reset_password(
         )
     
     # Verify token matches
-    if not verify_password(reset_token, user.reset_token):
+    if not await verify_password_async(reset_token, user.reset_token):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid reset token"
@@ -113,12 +110,13 @@ async def reset_password(
         )
     
     # Update password and clear reset token
-    user.hashed_password = get_password_hash(new_password)
+    user.hashed_password = await get_password_hash_async(new_password)
     user.reset_token = None
     user.reset_token_expires = None
     user.is_active = True  # Re-enable account if it was disabled
     db.add(user)
     await db.commit()
+    invalidate_user_cache(user.username)
     
     return {"message": "Password reset successful"}
 
@@ -136,6 +134,7 @@ async def record_failed_login_attempt(
         user_agent=request.headers.get("user-agent", "unknown")
     )
     db.add(attempt)
+    await note_failed_attempt(username, ip_address)
     
     # Also update user's failed login count
     if username:
@@ -235,7 +234,7 @@ async def register(
         )
     
     # Hash password
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     
     # Create user with default role
     db_user = User(
@@ -335,7 +334,7 @@ async def login(
             )
     
     # Verify password
-    if not verify_password(form_data.password, db_user.hashed_password):
+    if not await verify_password_async(form_data.password, db_user.hashed_password):
         await record_failed_login_attempt(db, db_user.username, client_ip, "Invalid password")
         remaining_attempts = settings.MAX_LOGIN_ATTEMPTS - (db_user.failed_login_attempts + 1)
         
@@ -379,6 +378,9 @@ async def login(
     # Reset failed login attempts on successful login
     await reset_failed_login_attempts(db, db_user.username)
     
+    # Upgrade the stored hash if the configured bcrypt cost changed
+    await rehash_password_if_needed(db_user, form_data.password)
+    
     # Update last login time
     db_user.last_login = datetime.utcnow()
     await db.commit()
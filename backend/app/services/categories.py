@@ -0,0 +1,108 @@
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..config import settings
+from ..database import SessionLocal
+from ..models import Category
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class CategoryTree:
+    """Immutable snapshot of the category hierarchy.
+
+    Every lookup is a dict access: ancestor chains (root first) and
+    descendant sets (including the category itself) are computed once
+    when the snapshot is built.
+    """
+
+    ids_by_name: Dict[str, int]
+    names_by_id: Dict[int, str]
+    parents: Dict[int, Optional[int]]
+    ancestors: Dict[int, Tuple[int, ...]]
+    descendants: Dict[int, FrozenSet[int]]
+    built_at: float
+
+    def resolve(self, name: str) -> Optional[int]:
+        return self.ids_by_name.get(name)
+
+    def subtree(self, category_id: int) -> FrozenSet[int]:
+        return self.descendants.get(category_id, frozenset())
+
+def build_tree(rows: Iterable[Tuple[int, str, Optional[int]]]) -> CategoryTree:
+    """Build a snapshot from (id, name, parent_id) rows in O(n)."""
+    names_by_id: Dict[int, str] = {}
+    parents: Dict[int, Optional[int]] = {}
+    children: Dict[Optional[int], List[int]] = {}
+    for category_id, name, parent_id in rows:
+        names_by_id[category_id] = name
+        parents[category_id] = parent_id
+        children.setdefault(parent_id, []).append(category_id)
+
+    # Orphans (missing parent) are treated as roots
+    roots = [cid for cid, parent_id in parents.items() if parent_id is None or parent_id not in parents]
+    ancestors: Dict[int, Tuple[int, ...]] = {}
+    order: List[int] = []
+    stack = [(root, ()) for root in roots]
+    while stack:
+        category_id, chain = stack.pop()
+        if category_id in ancestors:
+            continue
+        ancestors[category_id] = chain
+        order.append(category_id)
+        stack.extend((child, chain + (category_id,)) for child in children.get(category_id, ()))
+
+    for category_id in parents:
+        if category_id not in ancestors:
+            # Only reachable through a parent_id cycle; keep it standalone
+            logger.warning("Category %s is part of a parent cycle", category_id)
+            ancestors[category_id] = ()
+            order.append(category_id)
+
+    # Children are visited after their parents, so folding in reverse
+    # order has every child's set ready before its parent needs it
+    descendants: Dict[int, FrozenSet[int]] = {}
+    for category_id in reversed(order):
+        subtree = {category_id}
+        for child in children.get(category_id, ()):
+            subtree |= descendants.get(child, frozenset())
+        descendants[category_id] = frozenset(subtree)
+
+    return CategoryTree(
+        ids_by_name={name: cid for cid, name in names_by_id.items()},
+        names_by_id=names_by_id,
+        parents=parents,
+        ancestors=ancestors,
+        descendants=descendants,
+        built_at=time.monotonic()
+    )
+
+_tree: Optional[CategoryTree] = None
+
+async def load_category_tree(db: AsyncSession) -> CategoryTree:
+    global _tree
+    rows = (await db.execute(select(Category.id, Category.name, Category.parent_id))).all()
+    _tree = build_tree(rows)
+    return _tree
+
+async def get_category_tree(db: AsyncSession) -> CategoryTree:
+    """The current snapshot, rebuilt after invalidation or CATEGORY_TREE_TTL.
+
+    Writes in this process invalidate it immediately; the TTL bounds how
+    long other workers keep serving an older tree.
+    """
+    tree = _tree
+    if tree is None or time.monotonic() - tree.built_at > settings.CATEGORY_TREE_TTL:
+        tree = await load_category_tree(db)
+    return tree
+
+def invalidate_category_tree() -> None:
+    global _tree
+    _tree = None
+
+async def warm_category_tree() -> None:
+    async with SessionLocal() as db:
+        await load_category_tree(db)
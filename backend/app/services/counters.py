@@ -0,0 +1,92 @@
+import logging
+from sqlalchemy import select, update, func, or_, case, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import SessionLocal
+from ..models import User, Post, Comment, Like, Notification
+from ..config import settings
+from ..utils.scheduler import periodic
+
+logger = logging.getLogger(__name__)
+
+RECONCILE_BATCH_SIZE = 1000
+
+async def reconcile_post_counters(db: AsyncSession, batch_size: int = RECONCILE_BATCH_SIZE) -> int:
+    """Recompute Post.likes_count/comments_count from the source tables.
+
+    Post.last_activity_at is moved up to the newest comment or like when it
+    lags behind; like bump_counters, it is never moved back on deletes.
+    Works through the posts table in id ranges so each UPDATE touches a
+    bounded number of rows, and only rewrites rows that have drifted.
+    Returns the number of posts corrected.
+    """
+    max_id = (await db.execute(select(func.max(Post.id)))).scalar() or 0
+    likes = select(func.count(Like.id)).where(Like.post_id == Post.id).scalar_subquery()
+    comments = select(func.count(Comment.id)).where(Comment.post_id == Post.id).scalar_subquery()
+    activity = union_all(
+        select(Comment.created_at.label("created_at")).where(Comment.post_id == Post.id).correlate(Post),
+        select(Like.created_at).where(Like.post_id == Post.id).correlate(Post)
+    ).subquery()
+    latest = func.coalesce(select(func.max(activity.c.created_at)).scalar_subquery(), Post.created_at)
+    stale = or_(Post.last_activity_at.is_(None), Post.last_activity_at < latest)
+
+    fixed = 0
+    for start in range(0, max_id, batch_size):
+        result = await db.execute(
+            update(Post)
+            .where(
+                Post.id > start,
+                Post.id <= start + batch_size,
+                or_(Post.likes_count != likes, Post.comments_count != comments, stale)
+            )
+            .values(
+                likes_count=likes,
+                comments_count=comments,
+                last_activity_at=case((stale, latest), else_=Post.last_activity_at)
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        fixed += result.rowcount or 0
+
+    if fixed:
+        logger.warning("Reconciled counters on %d posts", fixed)
+    return fixed
+
+async def reconcile_notification_counters(db: AsyncSession, batch_size: int = RECONCILE_BATCH_SIZE) -> int:
+    """Recompute User.notifications_count/unread_notifications_count.
+
+    Same id-range batching as reconcile_post_counters. Returns the number
+    of users corrected.
+    """
+    max_id = (await db.execute(select(func.max(User.id)))).scalar() or 0
+    total = select(func.count(Notification.id)).where(Notification.user_id == User.id).scalar_subquery()
+    unread = (
+        select(func.count(Notification.id))
+        .where(Notification.user_id == User.id, Notification.read == False)
+        .scalar_subquery()
+    )
+
+    fixed = 0
+    for start in range(0, max_id, batch_size):
+        result = await db.execute(
+            update(User)
+            .where(
+                User.id > start,
+                User.id <= start + batch_size,
+                or_(User.notifications_count != total, User.unread_notifications_count != unread)
+            )
+            .values(notifications_count=total, unread_notifications_count=unread)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        fixed += result.rowcount or 0
+
+    if fixed:
+        logger.warning("Reconciled notification counters on %d users", fixed)
+    return fixed
+
+@periodic(settings.COUNTER_RECONCILE_INTERVAL)
+async def reconcile_post_counters_job() -> None:
+    async with SessionLocal() as db:
+        await reconcile_post_counters(db)
+        await reconcile_notification_counters(db)
@@ -0,0 +1,156 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict
+from sqlalchemy import select, insert, delete, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import SessionLocal
+from ..models import User, Post, Comment, Category, CategoryStats
+from ..config import settings
+from ..utils.cache import TTLCache
+from ..utils.scheduler import periodic
+
+logger = logging.getLogger(__name__)
+
+_cache = TTLCache(maxsize=1, ttl=settings.DASHBOARD_CACHE_TTL)
+
+async def refresh_category_stats(db: AsyncSession, full: bool = False) -> int:
+    """Recompute the category_stats rollup and return how many rows changed.
+
+    Incremental runs only rebuild categories with posts created, edited or
+    commented on/liked since the previous refresh, plus categories that have
+    no rollup row yet. Deleted posts leave no trace to detect, so they are
+    only reflected by a full run.
+    """
+    started = datetime.utcnow()
+    watermark = None
+    if not full:
+        watermark = (await db.execute(select(func.max(CategoryStats.refreshed_at)))).scalar()
+
+    if watermark is None:
+        changed = select(Category.id)
+    else:
+        changed = select(Post.category_id).where(
+            or_(Post.updated_at > watermark, Post.last_activity_at > watermark)
+        ).union(
+            select(Category.id).where(
+                ~select(CategoryStats.category_id)
+                .where(CategoryStats.category_id == Category.id)
+                .exists()
+            )
+        )
+    category_ids = [
+        category_id for category_id in (await db.execute(changed)).scalars()
+        if category_id is not None
+    ]
+    if not category_ids:
+        return 0
+
+    # One grouped pass over the changed categories; comment and like totals
+    # come from the denormalized post counters rather than their own tables
+    rows = (await db.execute(
+        select(
+            Category.id.label("category_id"),
+            func.count(Post.id).label("posts"),
+            func.count(Post.id).filter(Post.status == "active").label("active_posts"),
+            func.count(Post.id).filter(Post.status == "pending").label("pending_posts"),
+            func.count(Post.id).filter(Post.is_reported == True).label("reported_posts"),
+            func.coalesce(func.sum(Post.comments_count), 0).label("comments"),
+            func.coalesce(func.sum(Post.likes_count), 0).label("likes"),
+        )
+        .select_from(Category)
+        .outerjoin(Post, Post.category_id == Category.id)
+        .where(Category.id.in_(category_ids))
+        .group_by(Category.id)
+    )).mappings().all()
+
+    await db.execute(delete(CategoryStats).where(CategoryStats.category_id.in_(category_ids)))
+    if rows:
+        await db.execute(insert(CategoryStats), [{**row, "refreshed_at": started} for row in rows])
+    await db.commit()
+    return len(rows)
+
+async def _by_category(db: AsyncSession):
+    query = (
+        select(Category.name, Category.status, CategoryStats.active_posts)
+        .outerjoin(CategoryStats, CategoryStats.category_id == Category.id)
+    )
+    rows = (await db.execute(query)).all()
+    if any(row.active_posts is None for row in rows):
+        # New categories (or a rollup that has never run) are filled in now
+        await refresh_category_stats(db)
+        rows = (await db.execute(query)).all()
+    return rows
+
+async def _collect(db: AsyncSession) -> Dict[str, Any]:
+    now = datetime.utcnow()
+    day_ago = now - timedelta(days=1)
+    week_ago = now - timedelta(days=7)
+
+    users = (await db.execute(select(
+        func.count(User.id).label("total"),
+        func.count(User.id).filter(User.is_active == True).label("active"),
+        func.count(User.id).filter(User.created_at >= day_ago).label("new_today"),
+        func.count(User.id).filter(User.created_at >= week_ago).label("new_7d"),
+        func.count(User.id).filter(User.last_login >= week_ago).label("active_7d"),
+    ))).one()
+
+    posts = (await db.execute(select(
+        func.count(Post.id).label("total"),
+        func.count(Post.id).filter(Post.status == "active").label("active"),
+        func.count(Post.id).filter(Post.created_at >= day_ago).label("new_today"),
+        func.count(Post.id).filter(Post.status == "pending").label("pending"),
+        func.count(Post.id).filter(Post.is_reported == True).label("reported"),
+        func.count(Post.id).filter(Post.status == "active", Post.updated_at >= day_ago).label("approved_today"),
+        func.count(Post.id).filter(Post.status == "rejected", Post.updated_at >= day_ago).label("rejected_today"),
+        func.coalesce(func.sum(Post.likes_count), 0).label("likes"),
+    ))).one()
+
+    comments = (await db.execute(select(
+        func.count(Comment.id).label("total"),
+        func.count(Comment.id).filter(Comment.created_at >= day_ago).label("new_today"),
+        func.count(Comment.id).filter(Comment.is_reported == True).label("reported"),
+    ))).one()
+
+    categories = await _by_category(db)
+
+    return {
+        "total_users": users.total,
+        "active_users": users.active,
+        "new_users_today": users.new_today,
+        "new_users_7d": users.new_7d,
+        "active_users_7d": users.active_7d,
+        "total_posts": posts.total,
+        "active_posts": posts.active,
+        "new_posts_today": posts.new_today,
+        "pending_moderation": posts.pending,
+        "approved_today": posts.approved_today,
+        "rejected_today": posts.rejected_today,
+        "total_comments": comments.total,
+        "new_comments_today": comments.new_today,
+        "reported_content": posts.reported + comments.reported,
+        "avg_comments_per_post": comments.total / posts.total if posts.total else 0,
+        "avg_likes_per_post": posts.likes / posts.total if posts.total else 0,
+        "total_categories": len(categories),
+        "active_categories": sum(1 for row in categories if row.status == "active"),
+        "by_category": {row.name: row.active_posts or 0 for row in categories},
+    }
+
+async def get_dashboard_stats(db: AsyncSession) -> Dict[str, Any]:
+    """Admin dashboard figures, recomputed at most every DASHBOARD_CACHE_TTL seconds."""
+    stats = _cache.get("dashboard")
+    if stats is None:
+        stats = await _collect(db)
+        _cache.set("dashboard", stats)
+    return dict(stats)
+
+_rollup_runs = 0
+
+@periodic(settings.DASHBOARD_ROLLUP_INTERVAL)
+async def refresh_category_stats_job() -> None:
+    global _rollup_runs
+    full = settings.DASHBOARD_ROLLUP_FULL_EVERY > 0 and _rollup_runs % settings.DASHBOARD_ROLLUP_FULL_EVERY == 0
+    _rollup_runs += 1
+    async with SessionLocal() as db:
+        refreshed = await refresh_category_stats(db, full=full)
+    if refreshed:
+        logger.debug("Refreshed %d category rollups (full=%s)", refreshed, full)
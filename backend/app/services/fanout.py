@@ -0,0 +1,229 @@
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..config import settings
+from ..database import SessionLocal
+from ..models import User, Post, Comment, Notification
+from ..repositories import NotificationRepository
+from ..worker import celery_app, run_async
+from .notification_counts import invalidate_notification_counts
+from .profile_cache import invalidate_profile_cache
+from . import websocket
+
+logger = logging.getLogger(__name__)
+
+# Kinds whose unread notifications collapse into one row per post
+COALESCED_KINDS = ("like", "comment")
+
+def _message(kind: str, post_id: int, count: int) -> str:
+    if kind == "like":
+        if count == 1:
+            return f"Your post {post_id} received a new like"
+        return f"Your post {post_id} received {count} new likes"
+    if kind == "comment":
+        if count == 1:
+            return f"New comment on post {post_id}"
+        return f"{count} new comments on post {post_id}"
+    return f"New post created: {post_id}"
+
+async def _expand(db: AsyncSession, event: Dict[str, Any]) -> List[Tuple[int, str, int]]:
+    """(recipient, kind, post_id) for everyone an event should notify."""
+    kind, actor_id = event["kind"], event["actor_id"]
+    if kind == "post":
+        # There is no follower model; the author gets the confirmation
+        return [(actor_id, kind, event["post_id"])]
+
+    if kind == "comment":
+        post_id = (await db.execute(
+            select(Comment.post_id).where(Comment.id == event["comment_id"])
+        )).scalar()
+        # The post's author and everyone else taking part in the thread
+        audience = select(Post.author_id).where(Post.id == post_id).union(
+            select(Comment.author_id).where(Comment.post_id == post_id)
+        )
+    else:
+        post_id = event["post_id"]
+        audience = select(Post.author_id).where(Post.id == post_id)
+
+    if post_id is None:
+        return []
+    recipients = set((await db.execute(audience)).scalars()) - {actor_id, None}
+    return [(recipient, kind, post_id) for recipient in recipients]
+
+class FanoutCommitError(Exception):
+    """A batch's commit failed; it may still have landed, so it is not retried."""
+
+async def process_events(db: AsyncSession, events: Sequence[Dict[str, Any]]) -> int:
+    """Expand, coalesce and store a batch of events in one transaction.
+
+    Events for the same recipient and post are merged, and merged again
+    into that recipient's matching unread notification if there is one.
+    Returns the number of notifications created or updated.
+    """
+    groups: Counter = Counter()
+    for event in events:
+        for target in await _expand(db, event):
+            groups[target] += 1
+    if not groups:
+        return 0
+
+    recipients = {recipient for recipient, _, _ in groups}
+    keys = {f"{kind}:{post_id}" for _, kind, post_id in groups if kind in COALESCED_KINDS}
+    existing = {}
+    if keys:
+        rows = await db.execute(
+            select(Notification.id, Notification.user_id, Notification.group_key, Notification.group_count)
+            .where(
+                Notification.user_id.in_(recipients),
+                Notification.read == False,
+                Notification.group_key.in_(keys)
+            )
+        )
+        existing = {(row.user_id, row.group_key): row for row in rows}
+
+    notifications = NotificationRepository(db)
+    now = datetime.utcnow()
+    new_rows, pushed = [], []
+    for (recipient, kind, post_id), count in groups.items():
+        key = f"{kind}:{post_id}" if kind in COALESCED_KINDS else None
+        current = existing.get((recipient, key))
+        if current is not None:
+            total = current.group_count + count
+            message = _message(kind, post_id, total)
+            merged = await notifications.update_where(
+                # Skipped if the user read it meanwhile; a new row is added instead
+                [Notification.id == current.id, Notification.read == False],
+                {Notification.group_count: total, Notification.message: message, Notification.created_at: now}
+            )
+            if merged:
+                pushed.append((recipient, {"message": message, "group_key": key, "group_count": total}))
+                continue
+        message = _message(kind, post_id, count)
+        new_rows.append({
+            "user_id": recipient,
+            "message": message,
+            "read": False,
+            "created_at": now,
+            "group_key": key,
+            "group_count": count
+        })
+        pushed.append((recipient, {"message": message, "group_key": key, "group_count": count}))
+
+    await notifications.create_many(new_rows)
+    try:
+        await notifications.commit()
+    except Exception as exc:
+        raise FanoutCommitError(f"Commit of {len(pushed)} notifications failed") from exc
+
+    # Stored: everything after this is best effort, and failing here would
+    # make a retry merge the same events into group_count again
+    try:
+        await _after_commit(db, recipients, pushed, now)
+    except Exception:
+        logger.exception("Notification fan-out stored %d notifications but could not push them", len(pushed))
+    return len(pushed)
+
+async def _after_commit(
+    db: AsyncSession,
+    recipients: Set[int],
+    pushed: List[Tuple[int, Dict[str, Any]]],
+    now: datetime
+) -> None:
+    """Drop cached counts and push the stored notifications to clients."""
+    invalidate_notification_counts(*recipients)
+    for recipient in recipients:
+        invalidate_profile_cache(recipient)
+
+    unread = dict((await db.execute(
+        select(User.id, User.unread_notifications_count).where(User.id.in_(recipients))
+    )).all())
+    for recipient, data in pushed:
+        await websocket.publish([recipient], "notification.created", {
+            **data,
+            "created_at": now,
+            "unread": unread.get(recipient)
+        })
+
+async def run_batch(events: Sequence[Dict[str, Any]]) -> int:
+    async with SessionLocal() as db:
+        return await process_events(db, events)
+
+# Only failures before the commit are retried: process_events is not
+# idempotent, and re-running a stored batch would double its group_count
+@celery_app.task(
+    name="notifications.fanout",
+    autoretry_for=(Exception,),
+    dont_autoretry_for=(FanoutCommitError,),
+    retry_backoff=True,
+    max_retries=5
+)
+def fanout_task(events: List[Dict[str, Any]]) -> int:
+    return run_async(run_batch(events))
+
+# In-process queue for NOTIFICATION_FANOUT="background"
+_queue: Optional[asyncio.Queue] = None
+_task: Optional[asyncio.Task] = None
+
+def _get_queue() -> asyncio.Queue:
+    global _queue
+    if _queue is None:
+        _queue = asyncio.Queue(maxsize=settings.FANOUT_QUEUE_SIZE)
+    return _queue
+
+async def enqueue(kind: str, actor_id: int, **fields: Any) -> None:
+    """Hand an event to the fan-out pipeline; the only cost a request pays."""
+    event = {"kind": kind, "actor_id": actor_id, **fields}
+    mode = settings.NOTIFICATION_FANOUT
+    if mode == "celery":
+        # The broker round trip is blocking I/O
+        await asyncio.to_thread(fanout_task.delay, [event])
+    elif mode == "eager":
+        await run_batch([event])
+    else:
+        try:
+            _get_queue().put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning("Notification fan-out queue full, dropping a %s event", kind)
+
+async def _take_batch(queue: asyncio.Queue) -> List[Dict[str, Any]]:
+    batch = [await queue.get()]
+    while len(batch) < settings.FANOUT_BATCH_SIZE and not queue.empty():
+        batch.append(queue.get_nowait())
+    return batch
+
+async def _consume() -> None:
+    queue = _get_queue()
+    while True:
+        batch = await _take_batch(queue)
+        try:
+            await run_batch(batch)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Notification fan-out batch of %d events failed", len(batch))
+
+async def drain() -> None:
+    """Process every queued event now, e.g. at shutdown or in tests."""
+    queue = _get_queue()
+    while not queue.empty():
+        await run_batch(await _take_batch(queue))
+
+def start() -> None:
+    global _task
+    if settings.NOTIFICATION_FANOUT == "background" and _task is None:
+        _task = asyncio.create_task(_consume())
+
+async def stop() -> None:
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+        await drain()
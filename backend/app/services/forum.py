@@ -1,54 +1,190 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Row, select, tuple_
+from sqlalchemy.orm.attributes import set_committed_value
 from fastapi import HTTPException
-from ..models import Post, Comment, Category, User, Like
-from ..schemas import PostCreate, PostUpdate, CommentCreate, CommentUpdate
+from ..models import Post, Comment, User, Like, Category, loader_options
+from ..schemas.forum import PostCreate, PostUpdate, CommentCreate, CommentUpdate, CategoryCreate
+from ..repositories import PostRepository, CommentRepository, LikeRepository, CategoryRepository
+from ..repositories.forum import path_segment
+from ..utils.pagination import encode_cursor, decode_cursor
+from .profile_cache import invalidate_profile_cache
+from . import categories, response_cache, search, views
+
+POST_SORT_KEYS = ("created_at", "likes", "comments")
+
+def _comment_tree(rows: List[Comment], next_cursor: Optional[str]) -> List[dict]:
+    """Nest path-ordered comments in a single pass.
+
+    Path order puts every parent before its replies, so a reply's parent
+    node already exists if it is on this page; otherwise the reply is
+    returned at the top level with its parent_id for the client to attach.
+    """
+    nodes: Dict[int, dict] = {}
+    roots: List[dict] = []
+    for comment in rows:
+        node = {
+            "id": comment.id,
+            "content": comment.content,
+            "post_id": comment.post_id,
+            "parent_id": comment.parent_id,
+            "author_id": comment.author_id,
+            "created_at": comment.created_at,
+            "replies": [],
+            "replies_cursor": None
+        }
+        nodes[comment.id] = node
+        parent = nodes.get(comment.parent_id)
+        (parent["replies"] if parent else roots).append(node)
+
+    if next_cursor and rows:
+        # The page stopped somewhere inside the last row's ancestors' subtrees
+        for ancestor_id in rows[-1].path.split("."):
+            node = nodes.get(int(ancestor_id))
+            if node is not None:
+                node["replies_cursor"] = next_cursor
+    return roots
 
 class ForumService:
-    def get_posts(
+    async def _posts_query(
         self,
-        db: Session,
+        posts: PostRepository,
+        category: Optional[str],
+        sort_by: str,
+        columns: Sequence = (),
+        include_subcategories: bool = False
+    ):
+        """Build the base feed statement and return it with its sort key column.
+
+        A category filter matches that category only; with
+        `include_subcategories` it covers the whole subtree, resolved to ids
+        from the cached category tree so the feed needs no join. Given
+        `columns`, only those are selected instead of Post entities.
+        """
+        if columns:
+            query = select(*columns).select_from(Post)
+        else:
+            query = posts.select(options=loader_options("forum.post_list"))
+
+        if category:
+            tree = await categories.get_category_tree(posts.db)
+            category_id = tree.resolve(category)
+            if category_id is None:
+                category_ids = ()
+            elif include_subcategories:
+                category_ids = tree.subtree(category_id)
+            else:
+                category_ids = (category_id,)
+            query = query.where(Post.category_id.in_(category_ids))
+
+        if sort_by == "likes":
+            sort_key = Post.likes_count
+        elif sort_by == "comments":
+            sort_key = Post.comments_count
+        else:
+            sort_key = Post.created_at
+
+        return query, sort_key
+
+    async def get_posts(
+        self,
+        db: AsyncSession,
         skip: int = 0,
         limit: int = 100,
         category: Optional[str] = None,
         sort_by: str = "created_at",
-        order: str = "desc"
+        order: str = "desc",
+        include_subcategories: bool = False
     ) -> List[Post]:
-        query = db.query(Post)
-        
-        if category:
-            query = query.join(Post.category).filter(Category.name == category)
-            
-        if sort_by == "created_at":
-            if order == "desc":
-                query = query.order_by(Post.created_at.desc())
-            else:
-                query = query.order_by(Post.created_at.asc())
-        elif sort_by == "likes":
-            query = query.outerjoin(Like).group_by(Post.id)
-            if order == "desc":
-                query = query.order_by(func.count(Like.id).desc())
-            else:
-                query = query.order_by(func.count(Like.id).asc())
-        elif sort_by == "comments":
-            query = query.outerjoin(Comment).group_by(Post.id)
-            if order == "desc":
-                query = query.order_by(func.count(Comment.id).desc())
-            else:
-                query = query.order_by(func.count(Comment.id).asc())
-        
-        return query.offset(skip).limit(limit).all()
+        posts = PostRepository(db)
+        query, sort_key = await self._posts_query(
+            posts, category, sort_by, include_subcategories=include_subcategories
+        )
+        return await posts.scalars(self._ordered(query, sort_key, order).offset(skip).limit(limit))
+
+    async def get_post_rows(
+        self,
+        db: AsyncSession,
+        columns: Sequence,
+        skip: int = 0,
+        limit: int = 100,
+        category: Optional[str] = None,
+        sort_by: str = "created_at",
+        order: str = "desc",
+        include_subcategories: bool = False
+    ) -> List[Row]:
+        """get_posts as plain rows of `columns`, for serializing without ORM objects."""
+        posts = PostRepository(db)
+        query, sort_key = await self._posts_query(posts, category, sort_by, columns, include_subcategories)
+        return await posts.rows(self._ordered(query, sort_key, order).offset(skip).limit(limit))
+
+    @staticmethod
+    def _ordered(query, sort_key, order: str):
+        if order == "desc":
+            return query.order_by(sort_key.desc(), Post.id.desc())
+        return query.order_by(sort_key.asc(), Post.id.asc())
+
+    async def get_posts_page(
+        self,
+        db: AsyncSession,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        category: Optional[str] = None,
+        sort_by: str = "created_at",
+        order: str = "desc",
+        include_subcategories: bool = False
+    ) -> Tuple[List[Post], Optional[str]]:
+        """Keyset-paginated feed ordered by (sort key, id).
+
+        Each page seeks past the last row of the previous one instead of
+        skipping rows, so deep pages cost the same as the first.
+        """
+        if sort_by not in POST_SORT_KEYS:
+            sort_by = "created_at"
+        if order != "desc":
+            order = "asc"
+
+        posts = PostRepository(db)
+        query, sort_key = await self._posts_query(
+            posts, category, sort_by, include_subcategories=include_subcategories
+        )
+        # A position is only meaningful under the ordering that produced it
+        position = decode_cursor(cursor, "key", "id", sort=sort_by, order=order)
+
+        if order == "desc":
+            if position:
+                query = query.where(tuple_(sort_key, Post.id) < (position["key"], position["id"]))
+            query = query.order_by(sort_key.desc(), Post.id.desc())
+        else:
+            if position:
+                query = query.where(tuple_(sort_key, Post.id) > (position["key"], position["id"]))
+            query = query.order_by(sort_key.asc(), Post.id.asc())
+
+        rows = await posts.rows(query.add_columns(sort_key).limit(limit + 1))
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_post, last_key = rows[-1]
+            next_cursor = encode_cursor({"key": last_key, "id": last_post.id, "sort": sort_by, "order": order})
 
-    def get_post(self, db: Session, post_id: int) -> Post:
-        post = db.query(Post).filter(Post.id == post_id).first()
+        return [post for post, _ in rows], next_cursor
+
+    async def _with_pending_views(self, post: Post) -> Post:
+        # Shown, not written: the buffered delta reaches the row on flush
+        set_committed_value(post, "views", (post.views or 0) + await views.pending_views(post.id))
+        return post
+
+    async def get_post(self, db: AsyncSession, post_id: int) -> Post:
+        post = await PostRepository(db).get(post_id, options=loader_options("forum.post_detail"))
         if not post:
             raise HTTPException(status_code=404, detail="Post not found")
-        return post
+        return await self._with_pending_views(post)
 
-    def create_post(self, db: Session, post: PostCreate, author_id: int) -> Post:
-        db_post = Post(
+    async def create_post(self, db: AsyncSession, post: PostCreate, author_id: int) -> Post:
+        posts = PostRepository(db)
+        db_post = posts.add(Post(
             title=post.title,
             content=post.content,
             category_id=post.category_id,
@@ -56,105 +192,202 @@ class ForumService:
             created_at=datetime.utcnow(),
             updated_at=datetime.utcnow(),
             views=0
-        )
-        db.add(db_post)
-        db.commit()
-        db.refresh(db_post)
+        ))
+        await posts.commit()
+        invalidate_profile_cache(author_id)
+        db_post = await posts.refresh(db_post)
+        await response_cache.invalidate(*response_cache.post_tags(db_post.id))
+        search.index_document("post", db_post)
         return db_post
 
-    def update_post(self, db: Session, post_id: int, post: PostUpdate, author_id: int) -> Post:
-        db_post = self.get_post(db, post_id)
+    async def update_post(self, db: AsyncSession, post_id: int, post: PostUpdate, author_id: int) -> Post:
+        db_post = await self.get_post(db, post_id)
         if db_post.author_id != author_id:
             raise HTTPException(status_code=403, detail="Not authorized to update this post")
-        
+
         for key, value in post.dict(exclude_unset=True).items():
             setattr(db_post, key, value)
-        
+
         db_post.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(db_post)
+        posts = PostRepository(db)
+        await posts.commit()
+        invalidate_profile_cache(author_id)
+        db_post = await posts.refresh(db_post)
+        await response_cache.invalidate(*response_cache.post_tags(db_post.id))
+        search.index_document("post", db_post)
         return db_post
 
-    def delete_post(self, db: Session, post_id: int, author_id: int) -> None:
-        db_post = self.get_post(db, post_id)
+    async def delete_post(self, db: AsyncSession, post_id: int, author_id: int) -> None:
+        db_post = await self.get_post(db, post_id)
         if db_post.author_id != author_id:
             raise HTTPException(status_code=403, detail="Not authorized to delete this post")
-        
-        db.delete(db_post)
-        db.commit()
 
-    def create_comment(self, db: Session, comment: CommentCreate, author_id: int) -> Comment:
-        db_comment = Comment(
+        posts = PostRepository(db)
+        await posts.delete(db_post)
+        await posts.commit()
+        invalidate_profile_cache(author_id)
+        search.remove_document("post", post_id)
+        await response_cache.invalidate(*response_cache.post_tags(post_id))
+
+    async def create_comment(self, db: AsyncSession, comment: CommentCreate, author_id: int) -> Comment:
+        comments = CommentRepository(db)
+        parent_path = None
+        if comment.parent_id is not None:
+            parent = await comments.get(comment.parent_id)
+            if not parent or parent.post_id != comment.post_id:
+                raise HTTPException(status_code=404, detail="Parent comment not found")
+            parent_path = parent.path
+
+        db_comment = comments.add(Comment(
             content=comment.content,
             post_id=comment.post_id,
             author_id=author_id,
             parent_id=comment.parent_id,
             created_at=datetime.utcnow()
-        )
-        db.add(db_comment)
-        db.commit()
-        db.refresh(db_comment)
+        ))
+        # The path ends in the comment's own id, known once it is flushed
+        await comments.flush()
+        segment = path_segment(db_comment.id)
+        db_comment.path = f"{parent_path}.{segment}" if parent_path else segment
+        await PostRepository(db).bump_counters(comment.post_id, comments_count=1)
+        await comments.commit()
+        invalidate_profile_cache(author_id)
+        db_comment = await comments.refresh(db_comment)
+        await response_cache.invalidate(*response_cache.post_tags(db_comment.post_id))
+        search.index_document("comment", db_comment)
         return db_comment
 
-    def update_comment(self, db: Session, comment_id: int, comment: CommentUpdate, author_id: int) -> Comment:
-        db_comment = db.query(Comment).filter(Comment.id == comment_id).first()
+    async def _get_own_comment(self, db: AsyncSession, comment_id: int, author_id: int, action: str) -> Comment:
+        db_comment = await CommentRepository(db).get(comment_id)
         if not db_comment:
             raise HTTPException(status_code=404, detail="Comment not found")
         if db_comment.author_id != author_id:
-            raise HTTPException(status_code=403, detail="Not authorized to update this comment")
-        
+            raise HTTPException(status_code=403, detail=f"Not authorized to {action} this comment")
+        return db_comment
+
+    async def update_comment(self, db: AsyncSession, comment_id: int, comment: CommentUpdate, author_id: int) -> Comment:
+        db_comment = await self._get_own_comment(db, comment_id, author_id, "update")
+
         db_comment.content = comment.content
-        db.commit()
-        db.refresh(db_comment)
+        comments = CommentRepository(db)
+        await comments.commit()
+        invalidate_profile_cache(author_id)
+        db_comment = await comments.refresh(db_comment)
+        await response_cache.invalidate(*response_cache.post_tags(db_comment.post_id))
+        search.index_document("comment", db_comment)
         return db_comment
 
-    def delete_comment(self, db: Session, comment_id: int, author_id: int) -> None:
-        db_comment = db.query(Comment).filter(Comment.id == comment_id).first()
-        if not db_comment:
-            raise HTTPException(status_code=404, detail="Comment not found")
-        if db_comment.author_id != author_id:
-            raise HTTPException(status_code=403, detail="Not authorized to delete this comment")
-        
-        db.delete(db_comment)
-        db.commit()
-
-    def create_like(self, db: Session, post_id: int, user_id: int) -> None:
-        existing_like = db.query(Like).filter(
-            Like.post_id == post_id,
-            Like.user_id == user_id
-        ).first()
-        
-        if existing_like:
+    async def delete_comment(self, db: AsyncSession, comment_id: int, author_id: int) -> None:
+        db_comment = await self._get_own_comment(db, comment_id, author_id, "delete")
+
+        comments = CommentRepository(db)
+        await comments.delete(db_comment)
+        await PostRepository(db).bump_counters(db_comment.post_id, comments_count=-1)
+        await comments.commit()
+        invalidate_profile_cache(author_id)
+        search.remove_document("comment", comment_id)
+        await response_cache.invalidate(*response_cache.post_tags(db_comment.post_id))
+
+    async def create_like(self, db: AsyncSession, post_id: int, user_id: int) -> Like:
+        likes = LikeRepository(db)
+        if await likes.find(post_id, user_id):
             raise HTTPException(status_code=400, detail="Post already liked")
-        
-        db_like = Like(
+
+        db_like = likes.add(Like(
             post_id=post_id,
             user_id=user_id,
             created_at=datetime.utcnow()
-        )
-        db.add(db_like)
-        db.commit()
-
-    def remove_like(self, db: Session, post_id: int, user_id: int) -> None:
-        db_like = db.query(Like).filter(
-            Like.post_id == post_id,
-            Like.user_id == user_id
-        ).first()
-        
+        ))
+        await PostRepository(db).bump_counters(post_id, likes_count=1)
+        await likes.commit()
+        invalidate_profile_cache(user_id)
+        await response_cache.invalidate(*response_cache.post_tags(post_id))
+        return db_like
+
+    async def remove_like(self, db: AsyncSession, post_id: int, user_id: int) -> None:
+        likes = LikeRepository(db)
+        db_like = await likes.find(post_id, user_id)
         if not db_like:
             raise HTTPException(status_code=404, detail="Like not found")
-        
-        db.delete(db_like)
-        db.commit()
 
-    def get_post_comments(self, db: Session, post_id: int, skip: int = 0, limit: int = 100) -> List[Comment]:
-        return db.query(Comment).filter(Comment.post_id == post_id).offset(skip).limit(limit).all()
+        await likes.delete(db_like)
+        await PostRepository(db).bump_counters(post_id, likes_count=-1)
+        await likes.commit()
+        invalidate_profile_cache(user_id)
+        await response_cache.invalidate(*response_cache.post_tags(post_id))
+
+    async def get_post_comments(self, db: AsyncSession, post_id: int, skip: int = 0, limit: int = 100) -> List[Comment]:
+        return await CommentRepository(db).list(
+            Comment.post_id == post_id,
+            order_by=[Comment.path, Comment.id],
+            offset=skip,
+            limit=limit
+        )
+
+    async def get_comment_thread(
+        self,
+        db: AsyncSession,
+        post_id: int,
+        parent_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Tuple[List[dict], Optional[str]]:
+        """One page of a post's nested comment tree, or of one comment's replies.
+
+        The page is a single ordered range scan. When it ends mid-thread,
+        the open branches carry a `replies_cursor`; passing that comment's
+        id as `parent_id` with the cursor loads more of just that branch.
+        """
+        comments = CommentRepository(db)
+        prefix = None
+        if parent_id is not None:
+            parent = await comments.get(parent_id)
+            if not parent or parent.post_id != post_id:
+                raise HTTPException(status_code=404, detail="Comment not found")
+            prefix = parent.path
+
+        position = decode_cursor(cursor, "path")
+        rows = await comments.thread(post_id, prefix, position["path"] if position else None, limit + 1)
 
-    def get_category_posts(self, db: Session, category_id: int, skip: int = 0, limit: int = 100) -> List[Post]:
-        return db.query(Post).filter(Post.category_id == category_id).offset(skip).limit(limit).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor({"path": rows[-1].path})
 
-    def increment_post_views(self, db: Session, post_id: int) -> None:
-        db_post = self.get_post(db, post_id)
-        db_post.views += 1
-        db.commit()
-        db.refresh(db_post)
+        return _comment_tree(rows, next_cursor), next_cursor
+
+    async def create_category(self, db: AsyncSession, category: CategoryCreate) -> Category:
+        category_repo = CategoryRepository(db)
+        db_category = category_repo.add(Category(name=category.name, description=category.description))
+        await category_repo.commit()
+        categories.invalidate_category_tree()
+        await response_cache.invalidate("categories")
+        return await category_repo.refresh(db_category)
+
+    async def get_category_posts(
+        self,
+        db: AsyncSession,
+        category_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        include_subcategories: bool = False
+    ) -> List[Post]:
+        if include_subcategories:
+            tree = await categories.get_category_tree(db)
+            criteria = Post.category_id.in_(tree.subtree(category_id) or {category_id})
+        else:
+            criteria = Post.category_id == category_id
+        return await PostRepository(db).list(
+            criteria,
+            offset=skip,
+            limit=limit,
+            options=loader_options("forum.post_list")
+        )
+
+    async def increment_post_views(self, db: AsyncSession, post_id: int, viewer: Optional[str] = None) -> Post:
+        """Count a view through the write-behind buffer in services.views."""
+        db_post = await PostRepository(db).get(post_id)
+        if not db_post:
+            raise HTTPException(status_code=404, detail="Post not found")
+        await views.record_view(post_id, viewer)
+        return await self._with_pending_views(db_post)
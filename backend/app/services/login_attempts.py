@@ -0,0 +1,133 @@
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import select, delete, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import SessionLocal
+from ..models import LoginAttempt
+from ..config import settings
+from ..utils.cache import TTLCache
+from ..utils.scheduler import periodic
+
+logger = logging.getLogger(__name__)
+
+PRUNE_BATCH_SIZE = 5000
+
+class FailureCounter(ABC):
+    """Fast-path counter of recent failed logins per username and per IP.
+
+    Counts are fixed windows of LOGIN_ATTEMPT_WINDOW_MINUTES starting at the
+    first failure, so they approximate the database's rolling window.
+    """
+
+    @abstractmethod
+    async def incr(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    async def get(self, key: str) -> int:
+        ...
+
+class InMemoryFailureCounter(FailureCounter):
+    def __init__(self, window: int, maxsize: int = 50000):
+        self.window = window
+        self.counts = TTLCache(maxsize=maxsize, ttl=window)
+
+    async def incr(self, key: str) -> None:
+        entry = self.counts.get(key)
+        if entry is None:
+            # The list is mutated in place so the first failure's expiry sticks
+            self.counts.set(key, [1])
+        else:
+            entry[0] += 1
+
+    async def get(self, key: str) -> int:
+        entry = self.counts.get(key)
+        return entry[0] if entry else 0
+
+class RedisFailureCounter(FailureCounter):
+    def __init__(self, client, window: int, prefix: str = "loginfail:"):
+        self.client = client
+        self.window = window
+        self.prefix = prefix
+
+    async def incr(self, key: str) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.incr(self.prefix + key)
+            pipe.expire(self.prefix + key, self.window, nx=True)
+            await pipe.execute()
+
+    async def get(self, key: str) -> int:
+        value = await self.client.get(self.prefix + key)
+        return int(value) if value else 0
+
+_counter: Optional[FailureCounter] = None
+
+def get_failure_counter() -> Optional[FailureCounter]:
+    """The configured fast-path counter, or None to always count in SQL."""
+    global _counter
+    if _counter is None and settings.LOGIN_ATTEMPT_COUNTER:
+        window = settings.LOGIN_ATTEMPT_WINDOW_MINUTES * 60
+        if settings.LOGIN_ATTEMPT_COUNTER == "redis":
+            from redis import asyncio as aioredis
+            _counter = RedisFailureCounter(aioredis.from_url(settings.REDIS_URL), window)
+        else:
+            _counter = InMemoryFailureCounter(window)
+    return _counter
+
+async def count_failed_attempts(db: AsyncSession, username: str, ip_address: str) -> int:
+    """Number of recent failed logins for a username or IP address."""
+    counter = get_failure_counter()
+    if counter is not None:
+        try:
+            # The larger of the two approximates the union the SQL path counts
+            return max(
+                await counter.get(f"user:{username}"),
+                await counter.get(f"ip:{ip_address}")
+            )
+        except Exception:
+            logger.exception("Failed-login counter unavailable, counting in the database")
+
+    # Served by the (username, created_at) and (ip_address, created_at) indexes
+    since = datetime.utcnow() - timedelta(minutes=settings.LOGIN_ATTEMPT_WINDOW_MINUTES)
+    query = select(func.count(LoginAttempt.id)).where(
+        or_(LoginAttempt.username == username, LoginAttempt.ip_address == ip_address),
+        LoginAttempt.created_at > since
+    )
+    result = await db.execute(query)
+    return result.scalar_one()
+
+async def note_failed_attempt(username: str, ip_address: str) -> None:
+    counter = get_failure_counter()
+    if counter is None:
+        return
+    try:
+        if username:
+            await counter.incr(f"user:{username}")
+        await counter.incr(f"ip:{ip_address}")
+    except Exception:
+        logger.exception("Failed-login counter unavailable")
+
+async def prune_login_attempts(db: AsyncSession, batch_size: int = PRUNE_BATCH_SIZE) -> int:
+    """Delete attempts older than the lockout horizon in bounded batches."""
+    horizon = max(settings.LOGIN_ATTEMPT_WINDOW_MINUTES, settings.LOGIN_LOCKOUT_MINUTES)
+    cutoff = datetime.utcnow() - timedelta(minutes=horizon)
+
+    deleted = 0
+    while True:
+        batch = select(LoginAttempt.id).where(LoginAttempt.created_at < cutoff).limit(batch_size)
+        result = await db.execute(
+            delete(LoginAttempt)
+            .where(LoginAttempt.id.in_(batch))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        deleted += result.rowcount or 0
+        if (result.rowcount or 0) < batch_size:
+            return deleted
+
+@periodic(settings.LOGIN_ATTEMPT_PRUNE_INTERVAL)
+async def prune_login_attempts_job() -> None:
+    async with SessionLocal() as db:
+        await prune_login_attempts(db)
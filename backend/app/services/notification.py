@@ -1,98 +1,148 @@
-from typing import List, Optional
+from typing import Iterable, List, Optional, Sequence
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
 from ..models import Notification, User
-from ..schemas import NotificationCreate
+from ..schemas.notification import NotificationCreate
+from ..repositories import NotificationRepository
+from .notification_counts import get_notification_counts, invalidate_notification_counts
+from .profile_cache import invalidate_profile_cache
+from . import fanout, websocket
+
+def _changed(*user_ids: int) -> None:
+    invalidate_notification_counts(*user_ids)
+    for user_id in user_ids:
+        invalidate_profile_cache(user_id)
 
 class NotificationService:
-    def create_notification(self, db: Session, notification: NotificationCreate) -> Notification:
-        db_notification = Notification(
+    async def create_notification(self, db: AsyncSession, notification: NotificationCreate) -> Notification:
+        notifications = NotificationRepository(db)
+        db_notification = await notifications.create(Notification(
             user_id=notification.user_id,
             message=notification.message,
             read=False,
             created_at=datetime.utcnow()
-        )
-        db.add(db_notification)
-        db.commit()
-        db.refresh(db_notification)
+        ))
+        await notifications.commit()
+        _changed(notification.user_id)
+        db_notification = await notifications.refresh(db_notification)
+        await websocket.publish([db_notification.user_id], "notification.created", {
+            "id": db_notification.id,
+            "message": db_notification.message,
+            "read": db_notification.read,
+            "created_at": db_notification.created_at
+        })
         return db_notification
 
-    def get_notifications(
+    async def get_notifications(
         self,
-        db: Session,
+        db: AsyncSession,
         user_id: int,
         skip: int = 0,
         limit: int = 50,
         read: Optional[bool] = None
     ) -> List[Notification]:
-        query = db.query(Notification).filter(Notification.user_id == user_id)
-        
+        return await NotificationRepository(db).list(
+            *self._list_criteria(user_id, read),
+            order_by=[Notification.created_at.desc()],
+            offset=skip,
+            limit=limit
+        )
+
+    async def get_notification_rows(
+        self,
+        db: AsyncSession,
+        columns: Sequence,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 50,
+        read: Optional[bool] = None
+    ) -> List[Row]:
+        """get_notifications as plain rows of `columns`, for serializing without ORM objects."""
+        stmt = (
+            select(*columns)
+            .where(*self._list_criteria(user_id, read))
+            .order_by(Notification.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return await NotificationRepository(db).rows(stmt)
+
+    @staticmethod
+    def _list_criteria(user_id: int, read: Optional[bool]) -> list:
+        criteria = [Notification.user_id == user_id]
         if read is not None:
-            query = query.filter(Notification.read == read)
-            
-        return query.order_by(Notification.created_at.desc()).offset(skip).limit(limit).all()
+            criteria.append(Notification.read == read)
+        return criteria
 
-    def mark_notification_as_read(self, db: Session, notification_id: int) -> Notification:
-        notification = db.query(Notification).filter(Notification.id == notification_id).first()
+    async def _get_notification(self, notifications: NotificationRepository, notification_id: int) -> Notification:
+        notification = await notifications.get(notification_id)
         if not notification:
             raise HTTPException(status_code=404, detail="Notification not found")
-            
-        notification.read = True
-        db.commit()
-        db.refresh(notification)
         return notification
 
-    def mark_all_notifications_as_read(self, db: Session, user_id: int) -> None:
-        notifications = db.query(Notification).filter(
-            Notification.user_id == user_id,
-            Notification.read == False
-        ).all()
-        
-        for notification in notifications:
-            notification.read = True
-        
-        db.commit()
-
-    def delete_notification(self, db: Session, notification_id: int) -> None:
-        notification = db.query(Notification).filter(Notification.id == notification_id).first()
-        if not notification:
-            raise HTTPException(status_code=404, detail="Notification not found")
-            
-        db.delete(notification)
-        db.commit()
-
-    def get_unread_notification_count(self, db: Session, user_id: int) -> int:
-        return db.query(Notification).filter(
-            Notification.user_id == user_id,
-            Notification.read == False
-        ).count()
-
-    def create_post_notification(self, db: Session, post_id: int, user_id: int) -> None:
-        notification = Notification(
-            user_id=user_id,
-            message=f"New post created: {post_id}",
-            read=False,
-            created_at=datetime.utcnow()
-        )
-        db.add(notification)
-        db.commit()
+    async def mark_notification_as_read(self, db: AsyncSession, notification_id: int) -> Notification:
+        notifications = NotificationRepository(db)
+        notification = await self._get_notification(notifications, notification_id)
 
-    def create_comment_notification(self, db: Session, comment_id: int, user_id: int) -> None:
-        notification = Notification(
-            user_id=user_id,
-            message=f"New comment: {comment_id}",
-            read=False,
-            created_at=datetime.utcnow()
-        )
-        db.add(notification)
-        db.commit()
+        flipped = await notifications.mark_read(notification)
+        await notifications.commit()
+        _changed(notification.user_id)
+        if flipped:
+            await websocket.publish([notification.user_id], "notification.read", {"id": notification.id})
+        return await notifications.refresh(notification)
 
-    def create_like_notification(self, db: Session, post_id: int, user_id: int) -> None:
-        notification = Notification(
-            user_id=user_id,
-            message=f"Your post {post_id} received a new like",
-            read=False,
-            created_at=datetime.utcnow()
-        )
-        db.add(notification)
-        db.commit()
+    async def mark_all_notifications_as_read(self, db: AsyncSession, user_id: int) -> None:
+        notifications = NotificationRepository(db)
+        if await notifications.mark_all_read(user_id):
+            await notifications.commit()
+            _changed(user_id)
+            await websocket.publish([user_id], "notification.read_all")
+
+    async def delete_notification(self, db: AsyncSession, notification_id: int) -> None:
+        notifications = NotificationRepository(db)
+        notification = await self._get_notification(notifications, notification_id)
+
+        await notifications.remove(notification)
+        await notifications.commit()
+        _changed(notification.user_id)
+        await websocket.publish([notification.user_id], "notification.deleted", {"id": notification.id})
+
+    async def get_notification_counts(self, db: AsyncSession, user_id: int) -> dict:
+        return await get_notification_counts(db, user_id)
+
+    async def get_unread_notification_count(self, db: AsyncSession, user_id: int) -> int:
+        return (await get_notification_counts(db, user_id))["unread"]
+
+    async def notify_users(self, db: AsyncSession, user_ids: Iterable[int], message: str) -> int:
+        """Send one message to many recipients with a single multi-row INSERT."""
+        user_ids = list(dict.fromkeys(user_ids))
+        created_at = datetime.utcnow()
+        notifications = NotificationRepository(db)
+        count = await notifications.create_many([
+            {"user_id": user_id, "message": message, "read": False, "created_at": created_at}
+            for user_id in user_ids
+        ])
+        await notifications.commit()
+        _changed(*user_ids)
+        await websocket.publish(user_ids, "notification.created", {
+            "message": message,
+            "read": False,
+            "created_at": created_at
+        })
+        return count
+
+    async def _notify(self, db: AsyncSession, user_id: int, message: str) -> None:
+        await self.notify_users(db, [user_id], message)
+
+    # The event helpers only enqueue; services.fanout works out the
+    # recipients, coalesces and stores the notifications off the request
+    async def create_post_notification(self, db: AsyncSession, post_id: int, user_id: int) -> None:
+        await fanout.enqueue("post", user_id, post_id=post_id)
+
+    async def create_comment_notification(self, db: AsyncSession, comment_id: int, user_id: int) -> None:
+        await fanout.enqueue("comment", user_id, comment_id=comment_id)
+
+    async def create_like_notification(self, db: AsyncSession, post_id: int, user_id: int) -> None:
+        await fanout.enqueue("like", user_id, post_id=post_id)
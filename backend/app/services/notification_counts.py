@@ -0,0 +1,24 @@
+from typing import Dict
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+from ..config import settings
+from ..repositories import UserRepository
+from ..utils.cache import TTLCache
+
+# Short-lived so other workers' writes show up quickly; this process's own
+# writes drop the entry straight away
+_cache = TTLCache(maxsize=settings.NOTIFICATION_COUNT_CACHE_SIZE, ttl=settings.NOTIFICATION_COUNT_CACHE_TTL)
+
+async def get_notification_counts(db: AsyncSession, user_id: int) -> Dict[str, int]:
+    """Total and unread notification counts from the user row's counters."""
+    counts = _cache.get(user_id)
+    if counts is None:
+        counts = await UserRepository(db).notification_counts(user_id)
+        if counts is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        _cache.set(user_id, counts)
+    return dict(counts)
+
+def invalidate_notification_counts(*user_ids: int) -> None:
+    for user_id in user_ids:
+        _cache.pop(user_id)
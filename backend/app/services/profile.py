@@ -1,146 +1,259 @@
-from typing import Optional
+import asyncio
+from typing import Optional, Tuple
 from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from ..models import User, Post, Comment, Like, Notification
-from ..schemas import ProfileUpdate
+from sqlalchemy import Integer, select, union_all, literal, null, cast, case, func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from fastapi import HTTPException
+from ..config import settings
+from ..models import User, Post, Comment, Like, Notification, loader_options
+from ..schemas.profile import ProfileUpdate, Profile, ProfileNotification
+from ..repositories import UserRepository, NotificationRepository
+from ..utils.pagination import encode_cursor, decode_cursor
+from .profile_cache import get_cached_profile, cache_profile, invalidate_profile_cache
+from .notification_counts import get_notification_counts, invalidate_notification_counts
+from .security import get_password_hash_async, invalidate_user_cache
+from . import websocket
 
-class ProfileService:
-    def get_user_profile(self, db: Session, user_id: int) -> dict:
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-            
-        # Get user statistics
-        posts_count = db.query(Post).filter(Post.author_id == user_id).count()
-        comments_count = db.query(Comment).filter(Comment.author_id == user_id).count()
-        likes_count = db.query(Like).filter(Like.user_id == user_id).count()
-        
-        # Get user's posts
-        posts = db.query(Post).filter(Post.author_id == user_id).order_by(Post.created_at.desc()).all()
-        
-        # Get user's comments
-        comments = db.query(Comment).filter(Comment.author_id == user_id).order_by(Comment.created_at.desc()).all()
-        
-        # Get user's likes
-        likes = db.query(Like).filter(Like.user_id == user_id).order_by(Like.created_at.desc()).all()
-        
-        # Get user's notifications
-        notifications = db.query(Notification).filter(Notification.user_id == user_id).order_by(Notification.created_at.desc()).all()
-        
-        return {
-            "user": user,
-            "posts_count": posts_count,
-            "comments_count": comments_count,
-            "likes_count": likes_count,
-            "posts": posts,
-            "comments": comments,
-            "likes": likes,
-            "notifications": notifications
-        }
+async def _in_session(db: AsyncSession, query, *args):
+    # AsyncSession is not safe for concurrent use, so each parallel query
+    # checks out its own pooled connection from the caller's engine
+    async with async_sessionmaker(db.bind, class_=AsyncSession, expire_on_commit=False)() as session:
+        return await query(session, *args)
+
+def _counts_query(user_id: int):
+    def count(model, owner):
+        return select(func.count()).select_from(model).where(owner == user_id).scalar_subquery()
+
+    return select(
+        count(Post, Post.author_id).label("posts"),
+        count(Comment, Comment.author_id).label("comments"),
+        count(Like, Like.user_id).label("likes")
+    )
+
+async def _counts(db: AsyncSession, user_id: int) -> dict:
+    return dict((await db.execute(_counts_query(user_id))).mappings().one())
+
+async def _recent_activity(db: AsyncSession, user_id: int, limit: int) -> list:
+    rows = (await db.execute(_activity_query(user_id, limit))).mappings().all()
+    return [_activity_item(row) for row in rows]
+
+async def _recent_notifications(db: AsyncSession, user_id: int, limit: int) -> list:
+    return await NotificationRepository(db).list(
+        Notification.user_id == user_id,
+        order_by=[Notification.created_at.desc()],
+        limit=limit
+    )
+
+ACTIVITY_PREVIEW_LENGTH = 100
 
-    def update_profile(self, db: Session, user_id: int, profile: ProfileUpdate) -> User:
-        user = db.query(User).filter(User.id == user_id).first()
+def _preview(column):
+    """The column truncated to ACTIVITY_PREVIEW_LENGTH characters in SQL."""
+    return case(
+        (func.length(column) > ACTIVITY_PREVIEW_LENGTH,
+         func.substr(column, 1, ACTIVITY_PREVIEW_LENGTH).concat("...")),
+        else_=column
+    )
+
+def _after(model, activity_type: str, position: dict):
+    """Rows of one branch that sort after `position` in descending timeline order."""
+    if activity_type < position["type"]:
+        return model.created_at <= position["created_at"]
+    if activity_type > position["type"]:
+        return model.created_at < position["created_at"]
+    return tuple_(model.created_at, model.id) < (position["created_at"], position["id"])
+
+def _activity_query(user_id: int, limit: int, position: Optional[dict] = None):
+    """UNION ALL of the user's posts, comments and likes, newest first.
+
+    Every branch is ordered and limited on its own (user, created_at, id)
+    index, so a page reads at most `limit` rows per branch however long
+    the user's history is.
+    """
+    no_id = cast(null(), Integer)
+    sources = (
+        ("post", Post, Post.author_id, _preview(Post.content), Post.id, no_id, no_id),
+        ("comment", Comment, Comment.author_id, _preview(Comment.content), Comment.post_id, Comment.id, no_id),
+        ("like", Like, Like.user_id, literal(""), Like.post_id, no_id, Like.id),
+    )
+
+    branches = []
+    for activity_type, model, owner, content, post_id, comment_id, like_id in sources:
+        branch = select(
+            literal(activity_type).label("type"),
+            model.id.label("id"),
+            model.created_at.label("created_at"),
+            content.label("content"),
+            post_id.label("post_id"),
+            comment_id.label("comment_id"),
+            like_id.label("like_id")
+        ).where(owner == user_id)
+        if position:
+            branch = branch.where(_after(model, activity_type, position))
+        branch = branch.order_by(model.created_at.desc(), model.id.desc()).limit(limit)
+        # Wrapped so the per-branch ORDER BY/LIMIT is valid inside UNION ALL
+        branches.append(select(branch.subquery()))
+
+    timeline = union_all(*branches).subquery()
+    return (
+        select(timeline)
+        .order_by(timeline.c.created_at.desc(), timeline.c.type.desc(), timeline.c.id.desc())
+        .limit(limit)
+    )
+
+def _activity_item(row) -> dict:
+    return {
+        "type": row["type"],
+        "content": row["content"],
+        "created_at": row["created_at"],
+        "post_id": row["post_id"],
+        "comment_id": row["comment_id"],
+        "like_id": row["like_id"]
+    }
+
+class ProfileService:
+    async def _get_user(self, db: AsyncSession, user_id: int) -> User:
+        user = await UserRepository(db).get(user_id, options=loader_options("profile.user"))
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
-            
-        for key, value in profile.dict(exclude_unset=True).items():
-            setattr(user, key, value)
-        
-        db.commit()
-        db.refresh(user)
         return user
 
-    def get_user_stats(self, db: Session, user_id: int) -> dict:
-        posts = db.query(Post).filter(Post.author_id == user_id).count()
-        comments = db.query(Comment).filter(Comment.author_id == user_id).count()
-        likes = db.query(Like).filter(Like.user_id == user_id).count()
-        
-        return {
-            "posts": posts,
-            "comments": comments,
-            "likes": likes
+    async def get_user_profile(self, db: AsyncSession, user_id: int) -> dict:
+        """Profile page data: counts plus the latest PROFILE_RECENT_LIMIT items.
+
+        The count, activity and notification queries run concurrently on
+        their own sessions, and the result is cached per user until one of
+        the user's writes invalidates it. The cached entry holds plain dicts,
+        never ORM rows bound to the session that loaded them.
+        """
+        cached = get_cached_profile(user_id)
+        if cached is not None:
+            return dict(cached)
+
+        user = await self._get_user(db, user_id)
+        limit = settings.PROFILE_RECENT_LIMIT
+        stats, activity, notifications = await asyncio.gather(
+            _in_session(db, _counts, user_id),
+            _in_session(db, _recent_activity, user_id, limit),
+            _in_session(db, _recent_notifications, user_id, limit)
+        )
+
+        profile = {
+            "user": Profile.model_validate(user).model_dump(),
+            "posts_count": stats["posts"],
+            "comments_count": stats["comments"],
+            "likes_count": stats["likes"],
+            "activity": activity,
+            "preferences": {
+                "theme": user.theme_preference,
+                "notification_settings": user.notification_settings,
+                "privacy_settings": user.privacy_settings
+            },
+            "notifications": [
+                ProfileNotification.model_validate(notification, from_attributes=True).model_dump()
+                for notification in notifications
+            ]
         }
+        cache_profile(user_id, profile)
+        return dict(profile)
+
+    async def update_profile(self, db: AsyncSession, user_id: int, profile: ProfileUpdate) -> User:
+        user = await self._get_user(db, user_id)
+
+        # The principal cache is keyed by the username the token carries
+        username = user.username
+        changes = profile.model_dump(exclude_unset=True)
+        if changes.get("password"):
+            user.hashed_password = await get_password_hash_async(changes.pop("password"))
+        for key, value in changes.items():
+            if key in User.__table__.columns:
+                setattr(user, key, value)
+
+        users = UserRepository(db)
+        await users.commit()
+        invalidate_profile_cache(user_id)
+        invalidate_user_cache(username)
+        return await users.refresh(user)
+
+    async def get_user_stats(self, db: AsyncSession, user_id: int) -> dict:
+        return await _counts(db, user_id)
+
+    async def get_user_activity(self, db: AsyncSession, user_id: int, skip: int = 0, limit: int = 50) -> list:
+        # Each branch only needs the rows that could land on this page
+        query = _activity_query(user_id, skip + limit).offset(skip).limit(limit)
+        rows = (await db.execute(query)).mappings().all()
+        return [_activity_item(row) for row in rows]
+
+    async def get_user_activity_page(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Tuple[list, Optional[str]]:
+        """Keyset-paginated activity timeline ordered by (created_at, type, id)."""
+        position = decode_cursor(cursor, "created_at", "type", "id")
+        rows = (await db.execute(_activity_query(user_id, limit + 1, position))).mappings().all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor({"created_at": last["created_at"], "type": last["type"], "id": last["id"]})
+
+        return [_activity_item(row) for row in rows], next_cursor
+
+    async def get_user_preferences(self, db: AsyncSession, user_id: int) -> dict:
+        user = await self._get_user(db, user_id)
 
-    def get_user_activity(self, db: Session, user_id: int, skip: int = 0, limit: int = 50) -> list:
-        activity = []
-        
-        # Get posts
-        posts = db.query(Post).filter(Post.author_id == user_id).order_by(Post.created_at.desc()).all()
-        activity.extend([{
-            "type": "post",
-            "content": post.content[:100] + "...",
-            "created_at": post.created_at
-        } for post in posts])
-        
-        # Get comments
-        comments = db.query(Comment).filter(Comment.author_id == user_id).order_by(Comment.created_at.desc()).all()
-        activity.extend([{
-            "type": "comment",
-            "content": comment.content[:100] + "...",
-            "created_at": comment.created_at
-        } for comment in comments])
-        
-        # Get likes
-        likes = db.query(Like).filter(Like.user_id == user_id).order_by(Like.created_at.desc()).all()
-        activity.extend([{
-            "type": "like",
-            "post_id": like.post_id,
-            "created_at": like.created_at
-        } for like in likes])
-        
-        # Sort activity by date
-        activity.sort(key=lambda x: x["created_at"], reverse=True)
-        
-        return activity[skip:skip+limit]
-
-    def get_user_preferences(self, db: Session, user_id: int) -> dict:
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-            
         return {
             "theme": user.theme_preference,
             "notification_settings": user.notification_settings,
             "privacy_settings": user.privacy_settings
         }
 
-    def update_user_preferences(self, db: Session, user_id: int, preferences: dict) -> User:
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-            
+    async def update_user_preferences(self, db: AsyncSession, user_id: int, preferences: dict) -> User:
+        user = await self._get_user(db, user_id)
+
         if "theme" in preferences:
             user.theme_preference = preferences["theme"]
         if "notification_settings" in preferences:
             user.notification_settings = preferences["notification_settings"]
         if "privacy_settings" in preferences:
             user.privacy_settings = preferences["privacy_settings"]
-        
-        db.commit()
-        db.refresh(user)
-        return user
 
-    def get_user_notifications(self, db: Session, user_id: int, skip: int = 0, limit: int = 50) -> list:
-        return db.query(Notification).filter(
-            Notification.user_id == user_id
-        ).order_by(Notification.created_at.desc()).offset(skip).limit(limit).all()
+        users = UserRepository(db)
+        await users.commit()
+        invalidate_profile_cache(user_id)
+        return await users.refresh(user)
 
-    def mark_notification_as_read(self, db: Session, notification_id: int) -> None:
-        notification = db.query(Notification).filter(Notification.id == notification_id).first()
+    async def get_user_notifications(self, db: AsyncSession, user_id: int, skip: int = 0, limit: int = 50) -> list:
+        return await NotificationRepository(db).list(
+            Notification.user_id == user_id,
+            order_by=[Notification.created_at.desc()],
+            offset=skip,
+            limit=limit
+        )
+
+    async def mark_notification_as_read(self, db: AsyncSession, notification_id: int) -> None:
+        notifications = NotificationRepository(db)
+        notification = await notifications.get(notification_id)
         if not notification:
             raise HTTPException(status_code=404, detail="Notification not found")
-            
-        notification.read = True
-        db.commit()
 
-    def mark_all_notifications_as_read(self, db: Session, user_id: int) -> None:
-        notifications = db.query(Notification).filter(
-            Notification.user_id == user_id,
-            Notification.read == False
-        ).all()
-        
-        for notification in notifications:
-            notification.read = True
-        
-        db.commit()
+        flipped = await notifications.mark_read(notification)
+        await notifications.commit()
+        invalidate_notification_counts(notification.user_id)
+        invalidate_profile_cache(notification.user_id)
+        if flipped:
+            await websocket.publish([notification.user_id], "notification.read", {"id": notification.id})
+
+    async def mark_all_notifications_as_read(self, db: AsyncSession, user_id: int) -> None:
+        notifications = NotificationRepository(db)
+        if await notifications.mark_all_read(user_id):
+            await notifications.commit()
+            invalidate_notification_counts(user_id)
+            invalidate_profile_cache(user_id)
+            await websocket.publish([user_id], "notification.read_all")
+
+    async def get_unread_notification_count(self, db: AsyncSession, user_id: int) -> int:
+        return (await get_notification_counts(db, user_id))["unread"]
@@ -0,0 +1,16 @@
+from ..config import settings
+from ..utils.cache import TTLCache
+
+# Kept apart from services.profile so writers (forum, notifications,
+# fan-out) can drop entries without importing the profile service
+_profile_cache = TTLCache(maxsize=settings.PROFILE_CACHE_SIZE, ttl=settings.PROFILE_CACHE_TTL)
+
+def get_cached_profile(user_id: int):
+    return _profile_cache.get(user_id)
+
+def cache_profile(user_id: int, profile: dict) -> None:
+    _profile_cache.set(user_id, profile)
+
+def invalidate_profile_cache(user_id: int) -> None:
+    """Drop a cached profile after the user posts, comments, likes or edits it."""
+    _profile_cache.pop(user_id)
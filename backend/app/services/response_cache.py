@@ -0,0 +1,278 @@
+import asyncio
+import hashlib
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode
+from fastapi import Request, Response, status
+from ..config import settings
+from ..utils.cache import TTLCache
+from ..utils.conditional import is_not_modified
+from ..utils.serialization import dump_json
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    last_modified: str
+    # Versions of the entry's tags when it was built; a bump invalidates it
+    versions: Tuple[int, ...]
+
+class ResponseCacheBackend(ABC):
+    """Stores rendered responses and the version counter of each tag."""
+
+    @abstractmethod
+    async def lookup(self, key: str, tags: Sequence[str]) -> Tuple[Optional[CachedResponse], Tuple[int, ...]]:
+        """The stored entry, if any, and the current versions of `tags`."""
+
+    @abstractmethod
+    async def store(self, key: str, entry: CachedResponse, ttl: int) -> None:
+        ...
+
+    @abstractmethod
+    async def bump(self, tags: Sequence[str]) -> None:
+        ...
+
+class InMemoryResponseCache(ResponseCacheBackend):
+    """Per-process LRU; other workers see a write only after RESPONSE_CACHE_TTL.
+
+    Tag versions are an LRU of the same size. Every bump takes the next value
+    of one counter and an evicted tag reads as the highest version evicted so
+    far, so a forgotten tag can never match an entry built before its last bump.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.entries = TTLCache(maxsize=maxsize)
+        self.versions: "OrderedDict[str, int]" = OrderedDict()
+        self.clock = 0
+        self.floor = 0
+
+    def _version(self, tag: str) -> int:
+        version = self.versions.get(tag)
+        if version is None:
+            return self.floor
+        self.versions.move_to_end(tag)
+        return version
+
+    async def lookup(self, key, tags):
+        return self.entries.get(key), tuple(self._version(tag) for tag in tags)
+
+    async def store(self, key, entry, ttl):
+        self.entries.set(key, entry, ttl)
+
+    async def bump(self, tags):
+        for tag in tags:
+            self.clock += 1
+            self.versions[tag] = self.clock
+            self.versions.move_to_end(tag)
+        while len(self.versions) > self.maxsize:
+            _, evicted = self.versions.popitem(last=False)
+            self.floor = max(self.floor, evicted)
+
+class RedisResponseCache(ResponseCacheBackend):
+    """Entries and tag versions shared by every worker; one round trip per lookup."""
+
+    def __init__(self, client, prefix: str = "httpcache"):
+        self.client = client
+        self.prefix = prefix
+
+    def _entry_key(self, key: str) -> str:
+        return f"{self.prefix}:entry:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}:tag:{tag}"
+
+    async def lookup(self, key, tags):
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hgetall(self._entry_key(key))
+            pipe.mget([self._tag_key(tag) for tag in tags])
+            stored, versions = await pipe.execute()
+        current = tuple(int(version or 0) for version in versions)
+        if not stored:
+            return None, current
+        entry = CachedResponse(
+            body=stored[b"body"],
+            etag=stored[b"etag"].decode(),
+            last_modified=stored[b"last_modified"].decode(),
+            versions=tuple(json.loads(stored[b"versions"]))
+        )
+        return entry, current
+
+    async def store(self, key, entry, ttl):
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hset(self._entry_key(key), mapping={
+                "body": entry.body,
+                "etag": entry.etag,
+                "last_modified": entry.last_modified,
+                "versions": json.dumps(entry.versions)
+            })
+            pipe.expire(self._entry_key(key), ttl)
+            await pipe.execute()
+
+    async def bump(self, tags):
+        async with self.client.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.incr(self._tag_key(tag))
+            await pipe.execute()
+
+_backend: Optional[ResponseCacheBackend] = None
+
+def get_response_cache() -> Optional[ResponseCacheBackend]:
+    """The configured backend, or None when RESPONSE_CACHE_BACKEND is "off"."""
+    global _backend
+    if _backend is None:
+        if settings.RESPONSE_CACHE_BACKEND == "redis":
+            from redis import asyncio as aioredis
+            _backend = RedisResponseCache(aioredis.from_url(settings.REDIS_URL))
+        elif settings.RESPONSE_CACHE_BACKEND == "memory":
+            _backend = InMemoryResponseCache(settings.RESPONSE_CACHE_SIZE)
+    return _backend
+
+def cache_key(request: Request) -> str:
+    """Route path plus the query parameters the route declares, sorted.
+
+    Unknown parameters (cache busters, tracking tags) are dropped so they
+    cannot fragment the cache; repeated and empty values are kept since
+    they can change the response.
+    """
+    route = request.scope.get("route")
+    declared = {param.alias for param in route.dependant.query_params} if route else None
+    params = sorted(
+        (name, value) for name, value in request.query_params.multi_items()
+        if declared is None or name in declared
+    )
+    raw = f"{request.url.path}?{urlencode(params)}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+def _headers(entry: CachedResponse) -> Dict[str, str]:
+    max_age = settings.RESPONSE_CACHE_MAX_AGE
+    return {
+        "ETag": entry.etag,
+        "Last-Modified": entry.last_modified,
+        "Cache-Control": f"public, max-age={max_age}" if max_age > 0 else "public, no-cache"
+    }
+
+def _not_modified(request: Request, entry: CachedResponse) -> bool:
+    # If-Modified-Since only counts when there is no If-None-Match (RFC 9110)
+    if "if-none-match" in request.headers:
+        return is_not_modified(request, entry.etag)
+    since = request.headers.get("if-modified-since")
+    if not since:
+        return False
+    try:
+        return parsedate_to_datetime(entry.last_modified) <= parsedate_to_datetime(since)
+    except (TypeError, ValueError):
+        return False
+
+def _respond(request: Request, entry: CachedResponse, state: str) -> Response:
+    headers = {**_headers(entry), "X-Cache": state}
+    if _not_modified(request, entry):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+def _build_entry(body: bytes, versions: Tuple[int, ...]) -> CachedResponse:
+    return CachedResponse(
+        body=body,
+        etag='"{}"'.format(hashlib.blake2b(body, digest_size=12).hexdigest()),
+        last_modified=formatdate(usegmt=True),
+        versions=versions
+    )
+
+# Builds in progress in this process, so concurrent misses share one
+_inflight: Dict[str, "asyncio.Future[CachedResponse]"] = {}
+
+async def _build(
+    backend: Optional[ResponseCacheBackend],
+    key: str,
+    versions: Tuple[int, ...],
+    build: Callable[[], Awaitable[Any]],
+    response_model: Any,
+    ttl: int
+) -> CachedResponse:
+    entry = _build_entry(dump_json(await build(), response_model), versions)
+    if backend is not None:
+        try:
+            # Stored under the versions read before the build: if a write
+            # bumped a tag meanwhile, the entry is already stale and unused
+            await backend.store(key, entry, ttl)
+        except Exception:
+            logger.exception("Response cache unavailable, not storing")
+    return entry
+
+async def cached_response(
+    request: Request,
+    build: Callable[[], Awaitable[Any]],
+    response_model: Any,
+    tags: Iterable[str],
+    ttl: Optional[int] = None
+) -> Response:
+    """Serve a public GET from the response cache, building it on a miss.
+
+    `build` returns what the endpoint would have returned; it is rendered
+    once through `response_model` and the bytes are reused until TTL or
+    until one of `tags` is invalidated. Clients holding the current ETag
+    or Last-Modified get an empty 304.
+    """
+    tags = tuple(tags)
+    ttl = settings.RESPONSE_CACHE_TTL if ttl is None else ttl
+    backend = get_response_cache()
+    key = cache_key(request)
+
+    versions: Tuple[int, ...] = ()
+    if backend is not None:
+        try:
+            entry, versions = await backend.lookup(key, tags)
+        except Exception:
+            logger.exception("Response cache unavailable, building the response")
+            entry, backend = None, None
+        if entry is not None and entry.versions == versions:
+            return _respond(request, entry, "HIT")
+
+    pending = _inflight.get(key)
+    if pending is not None:
+        try:
+            return _respond(request, await asyncio.shield(pending), "HIT")
+        except asyncio.CancelledError:
+            if not pending.cancelled():
+                raise
+            # Only the leading request was cancelled; build it here instead
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        entry = await _build(backend, key, versions, build, response_model, ttl)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as exc:
+        future.set_exception(exc)
+        # Mark it retrieved so a build nobody else waited on is not logged
+        future.exception()
+        raise
+    else:
+        future.set_result(entry)
+    finally:
+        if _inflight.get(key) is future:
+            del _inflight[key]
+    return _respond(request, entry, "MISS")
+
+async def invalidate(*tags: str) -> None:
+    """Drop every cached response carrying one of `tags`."""
+    backend = get_response_cache()
+    if backend is None or not tags:
+        return
+    try:
+        await backend.bump(tags)
+    except Exception:
+        logger.exception("Response cache unavailable, %s will expire by TTL", ", ".join(tags))
+
+def post_tags(*post_ids: int) -> List[str]:
+    """Tags for a change to posts: every post list plus each post's detail."""
+    return ["posts", *(f"post:{post_id}" for post_id in post_ids)]
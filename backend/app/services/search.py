@@ -0,0 +1,237 @@
+import asyncio
+import html
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import select, func, cast, literal, literal_column, null, or_, tuple_
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+from ..config import settings
+from ..models import Post, Comment
+from ..utils.pagination import encode_cursor, decode_cursor
+
+# kind -> (model, table, title column or None, body column)
+TARGETS = {
+    "post": (Post, "posts", Post.title, Post.content),
+    "comment": (Comment, "comments", None, Comment.content),
+}
+
+# Rejected or deleted content drops out of search
+SEARCHABLE_STATUS = "active"
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+SNIPPET_WORDS = 30
+
+def _target(kind: str):
+    try:
+        return TARGETS[kind]
+    except KeyError:
+        raise HTTPException(status_code=400, detail=f"Invalid search type: {kind}")
+
+def _is_postgres(db: AsyncSession) -> bool:
+    return db.bind.dialect.name == "postgresql"
+
+# Postgres: generated tsvector columns with GIN indexes (migration 011)
+
+def _tsquery(q: str):
+    return func.websearch_to_tsquery(cast(literal(settings.SEARCH_LANGUAGE), REGCONFIG), q)
+
+def _pg_match(kind: str, q: str):
+    """(match clause, rank expression) for the tsvector and trigram indexes."""
+    model, table, title, _ = _target(kind)
+    vector = literal_column(f"{table}.search_vector")
+    query = _tsquery(q)
+    match = vector.op("@@")(query)
+    rank = func.ts_rank(vector, query)
+    if title is not None:
+        # Near-miss titles ("pyhton") through the trigram index
+        match = or_(match, title.op("%")(q))
+        rank = rank + func.similarity(title, q)
+    return match, rank
+
+def _html_escaped(column):
+    # ts_headline returns the text as is; only its <mark> tags may be markup
+    for char, entity in (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;")):
+        column = func.replace(column, char, entity)
+    return column
+
+async def _pg_search(db: AsyncSession, kind: str, q: str, position: Optional[dict], limit: int) -> List[dict]:
+    model, _, title, body = _target(kind)
+    match, rank = _pg_match(kind, q)
+    snippet = func.ts_headline(
+        cast(literal(settings.SEARCH_LANGUAGE), REGCONFIG),
+        _html_escaped(body),
+        _tsquery(q),
+        f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxWords={SNIPPET_WORDS}, MinWords=10"
+    )
+    post_id = model.id if kind == "post" else model.post_id
+
+    stmt = select(
+        model.id.label("id"),
+        post_id.label("post_id"),
+        (title if title is not None else null()).label("title"),
+        model.created_at.label("created_at"),
+        snippet.label("snippet"),
+        rank.label("score")
+    ).where(match, model.status == SEARCHABLE_STATUS)
+    if position:
+        stmt = stmt.where(tuple_(rank, model.id) < (position["score"], position["id"]))
+    stmt = stmt.order_by(rank.desc(), model.id.desc()).limit(limit)
+    return [dict(row) for row in (await db.execute(stmt)).mappings()]
+
+# Everything else (SQLite in tests): an in-process inverted index
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return [token.lower() for token in _TOKEN.findall(text or "")]
+
+class InvertedIndex:
+    """term -> {doc id: weighted term frequency}, scored with tf-idf.
+
+    Title terms count double, mirroring the A/B weights of the tsvector.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self.documents: Dict[int, Dict[str, Any]] = {}
+
+    def add(self, doc_id: int, document: Dict[str, Any]) -> None:
+        self.remove(doc_id)
+        terms = Counter(tokenize(document.get("title")) * 2 + tokenize(document["body"]))
+        for term, frequency in terms.items():
+            self.postings[term][doc_id] = frequency
+        self.documents[doc_id] = {**document, "terms": set(terms)}
+
+    def remove(self, doc_id: int) -> None:
+        document = self.documents.pop(doc_id, None)
+        if document is None:
+            return
+        for term in document["terms"]:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self.postings[term]
+
+    def search(self, q: str) -> List[Tuple[float, int]]:
+        """(score, doc id) for documents containing every query term."""
+        terms = set(tokenize(q))
+        if not terms:
+            return []
+        postings = [self.postings.get(term, {}) for term in terms]
+        candidates = set.intersection(*(set(p) for p in postings))
+        total = len(self.documents)
+        results = []
+        for doc_id in candidates:
+            score = sum(p[doc_id] * math.log(1 + total / len(p)) for p in postings)
+            results.append((score, doc_id))
+        return results
+
+def _snippet(text: Optional[str], q: str, words: int = SNIPPET_WORDS) -> str:
+    """A window of `words` words around the first match, matches highlighted."""
+    terms = set(tokenize(q))
+    tokens = (text or "").split()
+    first = next(
+        (i for i, token in enumerate(tokens) if set(tokenize(token)) & terms),
+        0
+    )
+    start = max(first - words // 3, 0)
+    window = []
+    for token in tokens[start:start + words]:
+        escaped = html.escape(token)
+        window.append(
+            f"{HIGHLIGHT_START}{escaped}{HIGHLIGHT_STOP}" if set(tokenize(token)) & terms else escaped
+        )
+    return " ".join(window)
+
+_indexes: Dict[str, InvertedIndex] = {}
+_build_lock = asyncio.Lock()
+
+def _document(kind: str, obj) -> Dict[str, Any]:
+    return {
+        "title": obj.title if kind == "post" else None,
+        "body": obj.content or "",
+        "post_id": obj.id if kind == "post" else obj.post_id,
+        "created_at": obj.created_at,
+    }
+
+async def _fallback_index(db: AsyncSession, kind: str) -> InvertedIndex:
+    index = _indexes.get(kind)
+    if index is None:
+        async with _build_lock:
+            index = _indexes.get(kind)
+            if index is None:
+                model = _target(kind)[0]
+                index = InvertedIndex()
+                rows = await db.execute(select(model).where(model.status == SEARCHABLE_STATUS))
+                for obj in rows.scalars():
+                    index.add(obj.id, _document(kind, obj))
+                _indexes[kind] = index
+    return index
+
+def index_document(kind: str, obj) -> None:
+    """Keep the fallback index current after a write; Postgres needs nothing."""
+    index = _indexes.get(kind)
+    if index is None:
+        return
+    if obj.status == SEARCHABLE_STATUS:
+        index.add(obj.id, _document(kind, obj))
+    else:
+        index.remove(obj.id)
+
+def remove_document(kind: str, doc_id: int) -> None:
+    index = _indexes.get(kind)
+    if index is not None:
+        index.remove(doc_id)
+
+async def _fallback_search(db: AsyncSession, kind: str, q: str, position: Optional[dict], limit: int) -> List[dict]:
+    index = await _fallback_index(db, kind)
+    hits = sorted(index.search(q), reverse=True)
+    if position:
+        after = (position["score"], position["id"])
+        hits = [hit for hit in hits if hit < after]
+    results = []
+    for score, doc_id in hits[:limit]:
+        document = index.documents[doc_id]
+        results.append({
+            "id": doc_id,
+            "post_id": document["post_id"],
+            "title": document["title"],
+            "created_at": document["created_at"],
+            "snippet": _snippet(document["body"], q),
+            "score": score,
+        })
+    return results
+
+async def search(
+    db: AsyncSession,
+    q: str,
+    kind: str = "post",
+    cursor: Optional[str] = None,
+    limit: int = 20
+) -> Tuple[List[dict], Optional[str]]:
+    """Ranked matches for `q`, paged on (score, id) with an opaque cursor."""
+    _target(kind)
+    position = decode_cursor(cursor, "score", "id")
+    run = _pg_search if _is_postgres(db) else _fallback_search
+    results = await run(db, kind, q, position, limit + 1)
+
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        last = results[-1]
+        next_cursor = encode_cursor({"score": last["score"], "id": last["id"]})
+    return [{"type": kind, **result} for result in results], next_cursor
+
+def match_criteria(db: AsyncSession, kind: str, q: str):
+    """WHERE clause for filtering by search text, index-backed on Postgres."""
+    if _is_postgres(db):
+        return _pg_match(kind, q)[0]
+    _, _, title, body = _target(kind)
+    if title is None:
+        return body.ilike(f"%{q}%")
+    return or_(title.ilike(f"%{q}%"), body.ilike(f"%{q}%"))
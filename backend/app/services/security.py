@@ -1,3 +1,7 @@
+import hashlib
+import secrets
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional, AsyncGenerator
 from jose import JWTError, jwt
@@ -5,12 +9,14 @@ from fastapi.security import OAuth2PasswordBearer
 from fastapi import Depends, HTTPException, status
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Session
+from sqlalchemy.future import select
 from ..database import get_db
-from ..models import User
+from ..models import User, UserRole, OTP
 from bcrypt import hashpw, gensalt, checkpw
 from passlib.context import CryptContext
 from ..config import settings
+from ..utils.cache import TTLCache
+from ..utils.worker_pool import BoundedExecutor, PoolSaturated
 
 # Security settings
 SECRET_KEY = settings.SECRET_KEY
@@ -27,13 +33,53 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     username: Optional[str] = None
 
+# bcrypt holds the CPU for 100ms+ per call, so async handlers run it here
+password_hash_pool = BoundedExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    name="bcrypt"
+)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
 def get_password_hash(password: str) -> str:
-    salt = gensalt()
+    salt = gensalt(rounds=settings.BCRYPT_ROUNDS)
     return hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True when a stored hash was made with a different bcrypt cost."""
+    try:
+        return int(hashed_password.split('$')[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+async def _run_hash_job(func, *args):
+    try:
+        return await password_hash_pool.run(func, *args)
+    except PoolSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please try again shortly",
+            headers={"Retry-After": "1"}
+        )
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hash_job(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_hash_job(get_password_hash, password)
+
+async def rehash_password_if_needed(user: User, password: str) -> bool:
+    """Re-hash a just-verified password whose stored hash has another cost.
+
+    Sets user.hashed_password for the caller to commit; returns whether it did.
+    """
+    if not password_needs_rehash(user.hashed_password):
+        return False
+    user.hashed_password = await get_password_hash_async(password)
+    return True
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -44,44 +90,113 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
+@dataclass(frozen=True)
+class UserPrincipal:
+    """Identity of an authenticated caller, cached between requests."""
+    id: int
+    username: str
+    role: str
+    is_active: bool
+
+# Decoded claims keyed by token hash, each kept until the token's exp
+_token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE)
+# Principals keyed by username; the TTL bounds staleness across workers
+_principal_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL)
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+def decode_access_token(token: str) -> dict:
+    """Verify a JWT and return its claims, caching them until expiry."""
+    key = _token_key(token)
+    payload = _token_cache.get(key)
+    if payload is None:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        exp = payload.get("exp")
+        if exp is not None:
+            _token_cache.set(key, payload, ttl=exp - time.time())
+    return payload
+
+def forget_token(token: str) -> None:
+    _token_cache.pop(_token_key(token))
+
+def invalidate_user_cache(username: str) -> None:
+    """Drop a cached principal after logout, password, role or ban changes."""
+    _principal_cache.pop(username)
+
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> UserPrincipal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(token)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
-        token_data = TokenData(username=username)
     except JWTError:
         raise credentials_exception
-    
-    user = db.query(User).filter(User.username == token_data.username).first()
+
+    principal = _principal_cache.get(username)
+    if principal is None:
+        result = await db.execute(
+            select(User.id, User.username, User.role, User.is_active)
+            .where(User.username == username)
+        )
+        row = result.first()
+        if row is None:
+            raise credentials_exception
+        principal = UserPrincipal(id=row.id, username=row.username, role=row.role, is_active=row.is_active)
+        _principal_cache.set(username, principal)
+    return principal
+
+async def get_current_user(
+    principal: UserPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """Load the caller's User row, for handlers that modify it."""
+    user = await db.get(User, principal.id)
     if user is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
+async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+    if not current_user.is_active:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user")
+    return current_user
+
+async def get_current_admin(principal: UserPrincipal = Depends(get_current_principal)) -> UserPrincipal:
+    if principal.role != UserRole.ADMIN or not principal.is_active:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges required")
+    return principal
+
 def generate_otp(length: int = 6) -> str:
     """Generate a random OTP of specified length."""
     digits = "0123456789"
-    otp = ''.join(random.choice(digits) for _ in range(length))
+    otp = ''.join(secrets.choice(digits) for _ in range(length))
     return otp
 
-def verify_otp(db: AsyncSession, user_id: int, otp_code: str) -> bool:
+async def verify_otp(db: AsyncSession, user_id: int, otp_code: str) -> bool:
     """Verify if the provided OTP matches the stored one for the user."""
-    otp = db.query(OTP).filter(
+    result = await db.execute(select(OTP).where(
         OTP.user_id == user_id,
         OTP.code == otp_code,
         OTP.expires_at > datetime.utcnow()
-    ).first()
-    
+    ).limit(1))
+    otp = result.scalars().first()
+
     if otp:
         # Delete the used OTP
-        db.delete(otp)
-        db.commit()
+        await db.delete(otp)
+        await db.commit()
         return True
     return False
 
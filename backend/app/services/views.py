@@ -0,0 +1,156 @@
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+from sqlalchemy import update, bindparam, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import SessionLocal
+from ..models import Post
+from ..config import settings
+from ..utils.bloom import RotatingBloomFilter
+from ..utils.scheduler import periodic
+
+logger = logging.getLogger(__name__)
+
+class ViewBuffer(ABC):
+    """View increments recorded but not yet written to posts.views."""
+
+    @abstractmethod
+    async def incr(self, post_id: int) -> None:
+        ...
+
+    @abstractmethod
+    async def pending(self, post_id: int) -> int:
+        ...
+
+    @abstractmethod
+    async def take(self) -> Dict[int, int]:
+        """Atomically swap out every pending delta and return it.
+
+        Increments that arrive afterwards start a fresh buffer, so they are
+        never lost or written twice by the flush in progress.
+        """
+
+    @abstractmethod
+    async def restore(self, deltas: Dict[int, int]) -> None:
+        """Put back deltas whose UPDATE failed."""
+
+class InMemoryViewBuffer(ViewBuffer):
+    def __init__(self):
+        self.deltas: Dict[int, int] = {}
+
+    async def incr(self, post_id: int) -> None:
+        self.deltas[post_id] = self.deltas.get(post_id, 0) + 1
+
+    async def pending(self, post_id: int) -> int:
+        return self.deltas.get(post_id, 0)
+
+    async def take(self) -> Dict[int, int]:
+        deltas, self.deltas = self.deltas, {}
+        return deltas
+
+    async def restore(self, deltas: Dict[int, int]) -> None:
+        for post_id, delta in deltas.items():
+            self.deltas[post_id] = self.deltas.get(post_id, 0) + delta
+
+# Read and clear the hash atomically so no increment lands in between
+TAKE_SCRIPT = """
+local deltas = redis.call('HGETALL', KEYS[1])
+redis.call('DEL', KEYS[1])
+return deltas
+"""
+
+class RedisViewBuffer(ViewBuffer):
+    """Pending deltas in one Redis hash shared by every worker."""
+
+    def __init__(self, client, key: str = "views:pending"):
+        self.client = client
+        self.key = key
+        self.script = client.register_script(TAKE_SCRIPT)
+
+    async def incr(self, post_id: int) -> None:
+        await self.client.hincrby(self.key, post_id, 1)
+
+    async def pending(self, post_id: int) -> int:
+        value = await self.client.hget(self.key, post_id)
+        return int(value) if value else 0
+
+    async def take(self) -> Dict[int, int]:
+        flat = await self.script(keys=[self.key])
+        return {int(flat[i]): int(flat[i + 1]) for i in range(0, len(flat), 2)}
+
+    async def restore(self, deltas: Dict[int, int]) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for post_id, delta in deltas.items():
+                pipe.hincrby(self.key, post_id, delta)
+            await pipe.execute()
+
+_buffer: Optional[ViewBuffer] = None
+
+def get_view_buffer() -> ViewBuffer:
+    global _buffer
+    if _buffer is None:
+        if settings.VIEW_COUNTER_BACKEND == "redis":
+            from redis import asyncio as aioredis
+            _buffer = RedisViewBuffer(aioredis.from_url(settings.REDIS_URL))
+        else:
+            _buffer = InMemoryViewBuffer()
+    return _buffer
+
+# Per-process, so a refresh served by another worker may still count
+_recent_viewers = RotatingBloomFilter(
+    capacity=settings.VIEW_DEDUP_CAPACITY,
+    window=max(settings.VIEW_DEDUP_WINDOW, 1)
+)
+
+async def record_view(post_id: int, viewer: Optional[str] = None) -> bool:
+    """Buffer one view; False if the viewer already counted within the window."""
+    if viewer and settings.VIEW_DEDUP_WINDOW > 0 and _recent_viewers.add(f"{viewer}:{post_id}"):
+        return False
+    await get_view_buffer().incr(post_id)
+    return True
+
+async def pending_views(post_id: int) -> int:
+    try:
+        return await get_view_buffer().pending(post_id)
+    except Exception:
+        logger.exception("View buffer unavailable, showing stored views")
+        return 0
+
+async def flush_views(db: AsyncSession) -> int:
+    """Write buffered views with one executemany UPDATE; returns posts updated."""
+    buffer = get_view_buffer()
+    deltas = await buffer.take()
+    if not deltas:
+        return 0
+
+    posts = Post.__table__
+    # Core table statement: ORM update() would treat the parameter list
+    # as a bulk update by primary key
+    stmt = (
+        update(posts)
+        .where(posts.c.id == bindparam("post_id"))
+        .values(views=func.coalesce(posts.c.views, 0) + bindparam("delta"))
+    )
+    try:
+        await db.execute(stmt, [{"post_id": post_id, "delta": delta} for post_id, delta in deltas.items()])
+    except Exception:
+        # Nothing was written, so the deltas go back for the next flush
+        await db.rollback()
+        await buffer.restore(deltas)
+        raise
+    try:
+        await db.commit()
+    except Exception:
+        # The commit may have landed; restoring could count these views
+        # twice, so they are dropped instead
+        logger.exception("Commit of view counts failed, dropping %d deltas", len(deltas))
+        await db.rollback()
+        raise
+    return len(deltas)
+
+@periodic(settings.VIEW_FLUSH_INTERVAL)
+async def flush_views_job() -> None:
+    async with SessionLocal() as db:
+        flushed = await flush_views(db)
+    if flushed:
+        logger.debug("Flushed view counts for %d posts", flushed)
@@ -0,0 +1,227 @@
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Set
+from fastapi import Request, WebSocket, WebSocketDisconnect
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "realtime:notifications"
+PING = {"type": "ping"}
+# Sent in place of whatever a slow client missed; it should refetch
+RESYNC = {"type": "resync"}
+
+class Broker(ABC):
+    """Carries hub messages to every worker process, including the sender."""
+
+    @abstractmethod
+    async def publish(self, message: str) -> None:
+        ...
+
+    @abstractmethod
+    def listen(self) -> AsyncIterator[str]:
+        ...
+
+class InMemoryBroker(Broker):
+    """Single-process broker, for one worker and for tests."""
+
+    def __init__(self):
+        self._listeners: Set[asyncio.Queue] = set()
+
+    async def publish(self, message: str) -> None:
+        for queue in self._listeners:
+            queue.put_nowait(message)
+
+    async def listen(self) -> AsyncIterator[str]:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._listeners.add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._listeners.discard(queue)
+
+class RedisBroker(Broker):
+    def __init__(self, client, channel: str = CHANNEL):
+        self.client = client
+        self.channel = channel
+
+    async def publish(self, message: str) -> None:
+        await self.client.publish(self.channel, message)
+
+    async def listen(self) -> AsyncIterator[str]:
+        pubsub = self.client.pubsub()
+        await pubsub.subscribe(self.channel)
+        try:
+            async for item in pubsub.listen():
+                if item["type"] == "message":
+                    data = item["data"]
+                    yield data.decode() if isinstance(data, bytes) else data
+        finally:
+            await pubsub.unsubscribe(self.channel)
+            await pubsub.aclose()
+
+class Connection:
+    """Outbound queue of one connected client.
+
+    The queue is bounded: when a client stops reading, its backlog is
+    replaced by a single resync event rather than growing without limit.
+    """
+
+    def __init__(self, user_id: int, maxsize: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += self.queue.qsize() + 1
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def next_event(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """The next event, or None once `timeout` passes and a heartbeat is due."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+class Hub:
+    """Per-process registry of connected clients, fed from the broker."""
+
+    def __init__(self, broker: Broker, queue_size: int):
+        self.broker = broker
+        self.queue_size = queue_size
+        self._connections: Dict[int, Set[Connection]] = defaultdict(set)
+        self._task: Optional[asyncio.Task] = None
+
+    def connect(self, user_id: int) -> Connection:
+        connection = Connection(user_id, self.queue_size)
+        self._connections[user_id].add(connection)
+        return connection
+
+    def disconnect(self, connection: Connection) -> None:
+        connections = self._connections.get(connection.user_id)
+        if connections is not None:
+            connections.discard(connection)
+            if not connections:
+                del self._connections[connection.user_id]
+
+    async def publish(self, user_ids: Iterable[int], event_type: str, data: Any = None) -> None:
+        """Push an event to every connection of the given users, on any worker.
+
+        Never raises: a push is best effort and must not fail the write
+        that triggered it.
+        """
+        message = json.dumps(
+            {"user_ids": list(user_ids), "type": event_type, "data": data},
+            default=str
+        )
+        try:
+            await self.broker.publish(message)
+        except Exception:
+            logger.exception("Realtime broker unavailable, delivering to this worker only")
+            self._dispatch(message)
+
+    def _dispatch(self, message: str) -> None:
+        payload = json.loads(message)
+        event = {"type": payload["type"], "data": payload["data"]}
+        for user_id in payload["user_ids"]:
+            for connection in list(self._connections.get(user_id, ())):
+                connection.offer(event)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async for message in self.broker.listen():
+                    self._dispatch(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Realtime broker subscription lost, reconnecting")
+                await asyncio.sleep(1)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        connections = [c for group in self._connections.values() for c in group]
+        return {
+            "users": len(self._connections),
+            "connections": len(connections),
+            "dropped_events": sum(c.dropped for c in connections),
+        }
+
+_hub: Optional[Hub] = None
+
+def get_hub() -> Hub:
+    global _hub
+    if _hub is None:
+        if settings.REALTIME_BROKER == "redis":
+            from redis import asyncio as aioredis
+            broker = RedisBroker(aioredis.from_url(settings.REDIS_URL))
+        else:
+            broker = InMemoryBroker()
+        _hub = Hub(broker, settings.REALTIME_QUEUE_SIZE)
+    return _hub
+
+async def publish(user_ids: Iterable[int], event_type: str, data: Any = None) -> None:
+    await get_hub().publish(user_ids, event_type, data)
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    # Client frames (pongs included) only matter as proof of life
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+async def serve_websocket(websocket: WebSocket, user_id: int) -> None:
+    """Stream a user's events over an accepted WebSocket until it closes."""
+    hub = get_hub()
+    connection = hub.connect(user_id)
+    closed = asyncio.create_task(_wait_for_disconnect(websocket))
+    try:
+        while True:
+            # Wait for the next event and for the close together, so a
+            # disconnect is noticed without sitting out the heartbeat
+            pending = asyncio.ensure_future(connection.next_event(settings.REALTIME_HEARTBEAT_INTERVAL))
+            await asyncio.wait((pending, closed), return_when=asyncio.FIRST_COMPLETED)
+            if closed.done():
+                pending.cancel()
+                break
+            # A client whose socket buffer stays full is cut off
+            await asyncio.wait_for(websocket.send_json(pending.result() or PING), settings.REALTIME_SEND_TIMEOUT)
+    except (WebSocketDisconnect, asyncio.TimeoutError, RuntimeError):
+        pass
+    finally:
+        closed.cancel()
+        hub.disconnect(connection)
+
+async def event_stream(request: Request, user_id: int) -> AsyncIterator[str]:
+    """Server-Sent Events body for a user's events."""
+    hub = get_hub()
+    connection = hub.connect(user_id)
+    try:
+        yield "retry: 3000\n\n"
+        while not await request.is_disconnected():
+            event = await connection.next_event(settings.REALTIME_HEARTBEAT_INTERVAL)
+            if event is None:
+                yield ": ping\n\n"
+            else:
+                yield f"event: {event['type']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+    finally:
+        hub.disconnect(connection)
@@ -0,0 +1,64 @@
+import hashlib
+import math
+import time
+from typing import Optional
+
+class BloomFilter:
+    """Fixed-size set membership test with false positives but no false negatives."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        # Kirsch-Mitzenmacher: k positions from two 64-bit hashes
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, key: str) -> bool:
+        """Add a key; True if it was (probably) already present."""
+        present = True
+        for position in self._positions(key):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                present = False
+                self.bits[byte] |= 1 << bit
+        return present
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self.bits[position // 8] & (1 << (position % 8))
+            for position in self._positions(key)
+        )
+
+class RotatingBloomFilter:
+    """Bloom filter that forgets keys after one to two `window`s.
+
+    Two generations are kept; the older one is dropped every window, so
+    memory stays bounded however many keys pass through.
+    """
+
+    def __init__(self, capacity: int, window: float, error_rate: float = 0.01):
+        self.capacity = capacity
+        self.window = window
+        self.error_rate = error_rate
+        self.current = BloomFilter(capacity, error_rate)
+        self.previous: Optional[BloomFilter] = None
+        self.rotated_at = time.monotonic()
+
+    def _rotate(self) -> None:
+        now = time.monotonic()
+        if now - self.rotated_at >= self.window:
+            # More than two windows idle: both generations are stale
+            self.previous = self.current if now - self.rotated_at < 2 * self.window else None
+            self.current = BloomFilter(self.capacity, self.error_rate)
+            self.rotated_at = now
+
+    def add(self, key: str) -> bool:
+        """Add a key; True if it was (probably) seen within the window."""
+        self._rotate()
+        seen = self.previous is not None and key in self.previous
+        return self.current.add(key) or seen
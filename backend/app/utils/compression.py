@@ -0,0 +1,232 @@
+import asyncio
+import zlib
+from typing import Any, Dict, Optional, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+# Types that are already compressed or gain nothing from it
+INCOMPRESSIBLE_TYPES = (
+    "image/", "video/", "audio/", "font/woff",
+    "application/zip", "application/gzip", "application/x-gzip",
+    "application/x-brotli", "application/pdf", "application/octet-stream",
+)
+# zlib releases the GIL, so big one-shot bodies are compressed off the loop
+THREAD_THRESHOLD = 256 * 1024
+
+class CompressionStats:
+    """Running totals across every compressed response."""
+
+    def __init__(self):
+        self.responses = 0
+        self.streamed = 0
+        self.skipped = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.by_encoding: Dict[str, int] = {}
+
+    def record(self, encoding: str, bytes_in: int, bytes_out: int, streamed: bool) -> None:
+        self.responses += 1
+        self.streamed += streamed
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        self.by_encoding[encoding] = self.by_encoding.get(encoding, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "compressed_responses": self.responses,
+            "streamed_responses": self.streamed,
+            "skipped_responses": self.skipped,
+            "by_encoding": dict(self.by_encoding),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "bytes_saved": self.bytes_in - self.bytes_out,
+            "ratio": round(self.bytes_out / self.bytes_in, 3) if self.bytes_in else None,
+        }
+
+compression_stats = CompressionStats()
+
+class _Encoder:
+    """Incremental compressor; `chunk` output is flushed so streams stay live."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self.compressor = brotli.Compressor(quality=brotli_quality, mode=brotli.MODE_TEXT)
+        else:
+            self.compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self.compressor.process(data) + self.compressor.flush()
+        return self.compressor.compress(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self.compressor.process(data) + self.compressor.finish()
+        return self.compressor.compress(data) + self.compressor.flush()
+
+def _accepted(header: str) -> Dict[str, float]:
+    """Accept-Encoding as {coding: q}."""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            accepted[coding.lower()] = q
+    return accepted
+
+def negotiate(header: Optional[str], supported: Tuple[str, ...]) -> Optional[str]:
+    """The client's preferred coding among `supported` (in server preference order)."""
+    if not header:
+        return None
+    accepted = _accepted(header)
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in supported:
+        q = accepted.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+class CompressionMiddleware:
+    """Negotiated br/gzip compression for HTTP responses.
+
+    Single-body responses under `minimum_size` are sent as is. Streaming
+    responses (SSE included) are compressed chunk by chunk, each chunk
+    flushed so the client sees it immediately. Responses that already
+    have a Content-Encoding, an incompressible type or `no-transform`
+    pass through untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        stats: CompressionStats = compression_stats
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.stats = stats
+        self.supported = ("br", "gzip") if brotli is not None else ("gzip",)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"), self.supported)
+        await _CompressedResponse(self, encoding, send).run(scope, receive)
+
+class _CompressedResponse:
+    def __init__(self, middleware: CompressionMiddleware, encoding: Optional[str], send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start: Optional[Message] = None
+        # None until the first body message decides the mode
+        self.encoder: Optional[_Encoder] = None
+        self.passthrough = False
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    async def run(self, scope: Scope, receive: Receive) -> None:
+        await self.middleware.app(scope, receive, self.on_send)
+
+    def _compressible(self, headers: MutableHeaders, status: int) -> bool:
+        if status < 200 or status in (204, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        if "no-transform" in headers.get("cache-control", "").lower():
+            return False
+        content_type = headers.get("content-type", "").lower()
+        return not content_type.startswith(INCOMPRESSIBLE_TYPES)
+
+    async def on_send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = MutableHeaders(scope=message)
+            if not self._compressible(headers, message["status"]):
+                self.passthrough = True
+                await self.send(message)
+                return
+            # The body depends on Accept-Encoding even when sent as is
+            headers.add_vary_header("Accept-Encoding")
+            if self.encoding is None:
+                self.passthrough = True
+                await self.send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.encoder is None:
+            if not more_body:
+                await self._send_whole(body)
+                return
+            await self._begin_stream()
+
+        self.bytes_in += len(body)
+        if more_body:
+            compressed = self.encoder.chunk(body) if body else b""
+        else:
+            compressed = self.encoder.finish(body)
+        self.bytes_out += len(compressed)
+        if compressed or not more_body:
+            await self.send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+        if not more_body:
+            self.middleware.stats.record(self.encoding, self.bytes_in, self.bytes_out, streamed=True)
+
+    async def _send_whole(self, body: bytes) -> None:
+        headers = MutableHeaders(scope=self.start)
+        if len(body) < self.middleware.minimum_size:
+            self.middleware.stats.skipped += 1
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": body})
+            return
+
+        encoder = self._encoder()
+        if len(body) >= THREAD_THRESHOLD:
+            compressed = await asyncio.to_thread(encoder.finish, body)
+        else:
+            compressed = encoder.finish(body)
+        self._mark_encoded(headers)
+        headers["Content-Length"] = str(len(compressed))
+        self.middleware.stats.record(self.encoding, len(body), len(compressed), streamed=False)
+        await self.send(self.start)
+        await self.send({"type": "http.response.body", "body": compressed})
+
+    async def _begin_stream(self) -> None:
+        headers = MutableHeaders(scope=self.start)
+        self._mark_encoded(headers)
+        del headers["Content-Length"]
+        self.encoder = self._encoder()
+        await self.send(self.start)
+
+    def _encoder(self) -> _Encoder:
+        return _Encoder(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+
+    def _mark_encoded(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self.encoding
+        # The compressed bytes differ, so a strong validator must become weak
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
@@ -0,0 +1,18 @@
+import hashlib
+from fastapi import Request
+
+def make_etag(*parts) -> str:
+    """Strong ETag derived from the values a response is built from."""
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:16]}"'
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match already names `etag`."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 prescribes for If-None-Match
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
@@ -0,0 +1,62 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional
+from fastapi import HTTPException, status
+
+# Opaque keyset cursors. A cursor is the sort key of the last row on a page,
+# serialized as urlsafe base64 JSON so clients treat it as an opaque token.
+
+_DATETIME_TAG = "$dt"
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {_DATETIME_TAG: value.isoformat()}
+    return value
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and _DATETIME_TAG in value:
+        return datetime.fromisoformat(value[_DATETIME_TAG])
+    return value
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Encode a keyset position into an opaque cursor string."""
+    payload = json.dumps(
+        {key: _encode_value(value) for key, value in values.items()},
+        separators=(",", ":"),
+        sort_keys=True
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: Optional[str], *keys: str, **bound: Any) -> Optional[Dict[str, Any]]:
+    """Decode a cursor produced by encode_cursor.
+
+    Returns None for an empty cursor (first page). Raises a 400 if the cursor
+    is malformed, does not carry the expected keys, or was issued for a
+    different ordering: every `bound` value (e.g. sort=..., order=...) must
+    match what the cursor was encoded with.
+    """
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = {key: _decode_value(value) for key, value in raw.items()}
+    except (ValueError, TypeError, AttributeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+    if any(key not in values for key in keys):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+    if any(values.get(key) != value for key, value in bound.items()):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Pagination cursor does not match the requested sort order"
+        )
+    return values
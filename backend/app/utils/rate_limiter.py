@@ -1,35 +1,175 @@
-from datetime import datetime, timedelta
-from typing import Dict, Optional, Callable
+import logging
+import math
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
 from functools import wraps
-import asyncio
+from fastapi import HTTPException, Request, status
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+class RateLimitBackend(ABC):
+    """Records a hit for `key` and decides whether it is allowed.
+
+    `hit` returns (allowed, retry_after_seconds).
+    """
+
+    @abstractmethod
+    async def hit(self, key: str, max_requests: int, time_window: int) -> Tuple[bool, float]:
+        ...
+
+class InMemoryBackend(RateLimitBackend):
+    """Per-process sliding window using two fixed-window counters per key.
+
+    The request count over the last `time_window` seconds is estimated as
+    the current window's count plus the previous window's count weighted
+    by how much of it still overlaps. Each check is O(1) and each key holds
+    three numbers; the least recently seen keys are evicted past max_keys.
+    """
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        # key -> [window index, current count, previous count]
+        self.counters: "OrderedDict[str, list]" = OrderedDict()
+
+    async def hit(self, key: str, max_requests: int, time_window: int) -> Tuple[bool, float]:
+        now = time.monotonic()
+        index = int(now // time_window)
+
+        counter = self.counters.get(key)
+        if counter is None:
+            counter = self.counters[key] = [index, 0, 0]
+            if len(self.counters) > self.max_keys:
+                self.counters.popitem(last=False)
+        else:
+            self.counters.move_to_end(key)
+
+        if counter[0] != index:
+            counter[2] = counter[1] if counter[0] == index - 1 else 0
+            counter[1] = 0
+            counter[0] = index
+
+        elapsed = now - index * time_window
+        remaining = time_window - elapsed
+        estimated = counter[2] * remaining / time_window + counter[1]
+
+        if estimated + 1 > max_requests:
+            if counter[1] + 1 > max_requests or not counter[2]:
+                retry_after = remaining
+            else:
+                # Time until the previous window's weight has decayed enough
+                allowance = (max_requests - 1 - counter[1]) * time_window / counter[2]
+                retry_after = max(remaining - allowance, 0.0)
+            return False, retry_after
+
+        counter[1] += 1
+        return True, 0.0
+
+# KEYS[1] = sorted set of hit timestamps; ARGV = now, window, limit, member
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    return {0, tostring(tonumber(oldest[2]) + window - now)}
+end
+redis.call('ZADD', KEYS[1], now, ARGV[4])
+redis.call('PEXPIRE', KEYS[1], math.ceil(window * 1000))
+return {1, '0'}
+"""
+
+class RedisBackend(RateLimitBackend):
+    """Exact sliding window shared by every worker, evaluated atomically in Lua."""
+
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+        self.script = client.register_script(SLIDING_WINDOW_SCRIPT)
+
+    async def hit(self, key: str, max_requests: int, time_window: int) -> Tuple[bool, float]:
+        allowed, retry_after = await self.script(
+            keys=[self.prefix + key],
+            args=[time.time(), time_window, max_requests, uuid.uuid4().hex]
+        )
+        return bool(int(allowed)), float(retry_after)
+
+_backend: Optional[RateLimitBackend] = None
+_fallback = InMemoryBackend()
+# Monotonic time before which a failed backend is not tried again
+_retry_at = 0.0
+
+def get_backend() -> RateLimitBackend:
+    global _backend
+    if _backend is None:
+        if settings.RATE_LIMIT_BACKEND == "redis":
+            from redis import asyncio as aioredis
+            _backend = RedisBackend(aioredis.from_url(settings.REDIS_URL))
+        else:
+            _backend = InMemoryBackend(settings.RATE_LIMIT_MAX_KEYS)
+    return _backend
+
+def set_backend(backend: Optional[RateLimitBackend]) -> None:
+    """Swap the limiter backend (e.g. in tests); None restores the default."""
+    global _backend, _retry_at
+    _backend = backend
+    _retry_at = 0.0
+
+async def _hit(key: str, max_requests: int, time_window: int) -> Tuple[bool, float]:
+    """Hit the configured backend, or the in-process one while it is down.
+
+    A failure opens the circuit for RATE_LIMIT_RETRY_SECONDS: requests skip
+    the backend until then, so an outage costs one failed call and one
+    logged traceback per interval rather than one per request.
+    """
+    global _retry_at
+    now = time.monotonic()
+    if now >= _retry_at:
+        try:
+            return await get_backend().hit(key, max_requests, time_window)
+        except Exception:
+            _retry_at = now + settings.RATE_LIMIT_RETRY_SECONDS
+            logger.exception(
+                "Rate limit backend unavailable, using in-process limits for %ss",
+                settings.RATE_LIMIT_RETRY_SECONDS
+            )
+    return await _fallback.hit(key, max_requests, time_window)
 
 class RateLimiter:
-    def __init__(self, max_requests: int, time_window: int):
+    def __init__(self, max_requests: int, time_window: int, scope: Optional[str] = None):
         self.max_requests = max_requests
         self.time_window = time_window
-        self.requests: Dict[str, list] = {}
+        self.scope = scope
 
-    def __call__(self, func: Callable):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            ip = kwargs.get('ip_address')
-            if not ip:
-                return await func(*args, **kwargs)
+    async def check(self, request: Request) -> None:
+        """Count a request from the client's address, raising 429 when over the limit."""
+        client_ip = request.client.host if request.client else "unknown"
+        key = f"{self.scope}:{client_ip}"
 
-            now = datetime.utcnow()
-            if ip not in self.requests:
-                self.requests[ip] = []
+        allowed, retry_after = await _hit(key, self.max_requests, self.time_window)
 
-            # Remove expired requests
-            self.requests[ip] = [
-                req for req in self.requests[ip]
-                if req > now - timedelta(seconds=self.time_window)
-            ]
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Rate limit exceeded: {self.max_requests} requests per {self.time_window} seconds",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+            )
 
-            if len(self.requests[ip]) >= self.max_requests:
-                raise Exception(f"Rate limit exceeded: {self.max_requests} requests per {self.time_window} seconds")
+    def __call__(self, func: Callable):
+        if self.scope is None:
+            self.scope = f"{func.__module__}.{func.__qualname__}"
 
-            self.requests[ip].append(now)
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            request = next(
+                (value for value in (*args, *kwargs.values()) if isinstance(value, Request)),
+                None
+            )
+            if request is not None:
+                await self.check(request)
             return await func(*args, **kwargs)
 
         return wrapper
@@ -0,0 +1,55 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, List
+
+logger = logging.getLogger(__name__)
+
+# In-process periodic jobs started with the app. Each job runs in its own
+# asyncio task; a failing run is logged and retried on the next tick.
+
+class PeriodicTask:
+    def __init__(self, func: Callable[[], Awaitable[None]], interval: float):
+        self.func = func
+        self.interval = interval
+        self.task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.func()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Periodic task %s failed", self.func.__name__)
+
+    def start(self):
+        # A non-positive interval disables the job
+        if self.task is None and self.interval > 0:
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+_tasks: List[PeriodicTask] = []
+
+def periodic(interval: float):
+    """Register a coroutine function to run every `interval` seconds."""
+    def decorator(func: Callable[[], Awaitable[None]]):
+        _tasks.append(PeriodicTask(func, interval))
+        return func
+    return decorator
+
+def start_periodic_tasks():
+    for task in _tasks:
+        task.start()
+
+async def stop_periodic_tasks():
+    for task in _tasks:
+        await task.stop()
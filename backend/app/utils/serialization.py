@@ -0,0 +1,45 @@
+from functools import lru_cache
+from typing import Any, List, Optional, Type
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+
+@lru_cache(maxsize=None)
+def _adapter(response_model: Any) -> TypeAdapter:
+    return TypeAdapter(response_model)
+
+def dump_json(value: Any, response_model: Any) -> bytes:
+    """Validate `value` against `response_model` once and encode it to JSON bytes.
+
+    ORM objects and SQL rows are read by attribute, and both steps run in
+    pydantic-core, skipping FastAPI's second validation pass and its
+    jsonable_encoder + json.dumps encoding.
+    """
+    adapter = _adapter(response_model)
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+def schema_columns(model: Any, schema: Type[BaseModel]) -> List[Any]:
+    """The mapped columns of `model` that `schema` reads, for a column-only select."""
+    return [getattr(model, name) for name in schema.model_fields if hasattr(model, name)]
+
+class FastJSONResponse(Response):
+    """Opt-in JSON response rendered through `dump_json`.
+
+    Return it from an endpoint with the same model as its `response_model`;
+    FastAPI passes Response objects through untouched, so the content is
+    validated and encoded exactly once. Without a model, content (including
+    pydantic models) is encoded as is.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, content: Any, model: Optional[Any] = None, **kwargs: Any):
+        self.model = model
+        super().__init__(content, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if self.model is not None:
+            return dump_json(content, self.model)
+        return to_json(content)
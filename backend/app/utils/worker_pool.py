@@ -0,0 +1,65 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+class PoolSaturated(Exception):
+    """Raised when a BoundedExecutor already has max_pending jobs."""
+
+class BoundedExecutor:
+    """Thread pool for blocking CPU work with a cap on queued jobs.
+
+    Jobs beyond `max_pending` (running + waiting) are rejected immediately
+    instead of queueing without bound, so callers can shed load. Queue wait
+    and run time are recorded for every completed job.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, name: str):
+        self.name = name
+        self.max_pending = max_pending
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+        self.max_run = 0.0
+
+    async def run(self, func: Callable, *args: Any) -> Any:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PoolSaturated(f"{self.name} pool saturated")
+
+        self.pending += 1
+        submitted = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            result = func(*args)
+            return result, started, time.perf_counter()
+
+        try:
+            result, started, finished = await asyncio.get_running_loop().run_in_executor(self.executor, timed)
+        finally:
+            self.pending -= 1
+
+        wait, run = started - submitted, finished - started
+        self.completed += 1
+        self.total_wait += wait
+        self.total_run += run
+        self.max_wait = max(self.max_wait, wait)
+        self.max_run = max(self.max_run, run)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        completed = self.completed or 1
+        return {
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_queue_wait_ms": round(self.total_wait / completed * 1000, 3),
+            "max_queue_wait_ms": round(self.max_wait * 1000, 3),
+            "avg_run_ms": round(self.total_run / completed * 1000, 3),
+            "max_run_ms": round(self.max_run * 1000, 3),
+        }
@@ -0,0 +1,32 @@
+"""Celery application for background work.
+
+Start a worker with:
+
+    celery -A app.worker worker --loglevel=info
+"""
+import asyncio
+from celery import Celery
+from app.config import settings
+
+celery_app = Celery("rianzel", broker=settings.CELERY_BROKER_URL, include=["app.services.fanout"])
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    task_ignore_result=True,
+    task_acks_late=True,
+    worker_prefetch_multiplier=4,
+)
+
+_loop = None
+
+def run_async(coro):
+    """Run a coroutine on this worker process's long-lived event loop.
+
+    Pooled database connections belong to the loop that opened them, so
+    tasks share one loop per process instead of calling asyncio.run().
+    """
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(coro)
@@ -0,0 +1,14 @@
+"""Benchmark harness for the backend.
+
+From backend/:
+
+    python -m benchmarks seed --users 5000 --posts 50000
+    python -m benchmarks run --output before.json
+    python -m benchmarks compare before.json after.json
+    python -m pytest benchmarks/bench_services.py
+    python -m pytest benchmarks/bench_serialization.py
+
+The database defaults to a local SQLite file; point BENCH_DATABASE_URL (or
+--database-url) at a scratch Postgres database to measure the production
+dialect. Seeding drops and recreates every table in that database.
+"""
@@ -0,0 +1,87 @@
+import argparse
+import asyncio
+import os
+from dataclasses import fields
+from sqlalchemy.ext.asyncio import create_async_engine
+from .dataset import SeedConfig, seed
+from .load import default_scenarios, run_load
+from .report import build_report, write_report, load_report, compare
+
+DEFAULT_DATABASE_URL = "sqlite+aiosqlite:///./benchmark.db"
+
+def _add_seed_arguments(parser: argparse.ArgumentParser) -> None:
+    for option in fields(SeedConfig):
+        parser.add_argument(
+            f"--{option.name.replace('_', '-')}",
+            type=type(option.default),
+            default=option.default,
+            help=f"dataset {option.name} (default: {option.default})"
+        )
+
+def _seed_config(args: argparse.Namespace) -> SeedConfig:
+    return SeedConfig(**{option.name: getattr(args, option.name) for option in fields(SeedConfig)})
+
+async def _seed(database_url: str, config: SeedConfig) -> dict:
+    engine = create_async_engine(database_url)
+    try:
+        return await seed(engine, config)
+    finally:
+        await engine.dispose()
+
+async def _run(args: argparse.Namespace) -> None:
+    config = _seed_config(args)
+    if args.skip_seed:
+        counts = {"users": config.users, "posts": config.posts}
+    else:
+        counts = await _seed(args.database_url, config)
+        print(f"seeded {counts}")
+
+    results = await run_load(
+        args.database_url,
+        default_scenarios(counts),
+        requests=args.requests,
+        concurrency=args.concurrency,
+        warmup=args.warmup
+    )
+    report = build_report(
+        args.database_url,
+        {**config.as_dict(), "rows": counts},
+        {"requests": args.requests, "concurrency": args.concurrency, "warmup": args.warmup},
+        results
+    )
+    write_report(report, args.output)
+    for name, result in results.items():
+        print(f"{name:<32} {result['throughput_rps']:>9.1f} rps  p50 {result['p50_ms']:>8.2f} ms  p99 {result['p99_ms']:>8.2f} ms")
+    print(f"report written to {args.output}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help="create and fill the benchmark database")
+    seed_parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL", DEFAULT_DATABASE_URL))
+    _add_seed_arguments(seed_parser)
+
+    run_parser = commands.add_parser("run", help="seed, load-test the app and write a JSON report")
+    run_parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL", DEFAULT_DATABASE_URL))
+    run_parser.add_argument("--skip-seed", action="store_true", help="reuse an already seeded database")
+    run_parser.add_argument("--requests", type=int, default=500, help="requests per endpoint")
+    run_parser.add_argument("--concurrency", type=int, default=10)
+    run_parser.add_argument("--warmup", type=int, default=20)
+    run_parser.add_argument("--output", default="benchmark-report.json")
+    _add_seed_arguments(run_parser)
+
+    compare_parser = commands.add_parser("compare", help="diff two JSON reports")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("head")
+
+    args = parser.parse_args()
+    if args.command == "seed":
+        print(asyncio.run(_seed(args.database_url, _seed_config(args))))
+    elif args.command == "run":
+        asyncio.run(_run(args))
+    else:
+        print(compare(load_report(args.base), load_report(args.head)))
+
+if __name__ == "__main__":
+    main()
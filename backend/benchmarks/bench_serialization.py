@@ -0,0 +1,77 @@
+"""Serialization cost of list endpoints: FastAPI's response_model path vs FastJSONResponse.
+
+Run from backend/ with:
+
+    python -m pytest benchmarks/bench_serialization.py --benchmark-json=serialization.json
+
+Each round encodes one PAGE_SIZE page; divide by PAGE_SIZE (stored in
+extra_info) for the per-item cost. The data is fetched once, so only
+serialization is timed.
+"""
+import json
+from typing import List
+import pytest
+from fastapi.routing import serialize_response
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from app.models import Post, Notification
+from app.schemas import forum, notification
+from app.utils.serialization import FastJSONResponse, schema_columns
+
+try:
+    from fastapi.utils import create_model_field
+except ImportError:  # fastapi < 0.115
+    from fastapi.utils import create_response_field as create_model_field
+
+PAGE_SIZE = 100
+
+CASES = {
+    "posts": (Post, forum.Post),
+    "notifications": (Notification, notification.Notification),
+}
+
+@pytest.fixture(params=sorted(CASES))
+def case(request, run):
+    model, schema = CASES[request.param]
+
+    async def fetch(db):
+        objects = (await db.execute(select(model).order_by(model.id).limit(PAGE_SIZE))).scalars().all()
+        rows = (await db.execute(
+            select(*schema_columns(model, schema)).order_by(model.id).limit(PAGE_SIZE)
+        )).all()
+        return objects, rows
+
+    objects, rows = run(fetch)
+    assert len(objects) == len(rows) == PAGE_SIZE
+    return schema, objects, rows
+
+def _fastapi_render(bench_loop, schema, content) -> bytes:
+    # What FastAPI does for `response_model=List[schema]`: validate, dump
+    # to Python, then the stdlib encoder in JSONResponse
+    field = create_model_field(name="response", type_=List[schema], mode="serialization")
+    encoded = bench_loop.run_until_complete(serialize_response(field=field, response_content=content))
+    return JSONResponse(encoded).body
+
+def test_response_model_orm(benchmark, bench_loop, case):
+    schema, objects, _ = case
+    benchmark.extra_info["items"] = PAGE_SIZE
+    body = benchmark(_fastapi_render, bench_loop, schema, objects)
+    assert body.startswith(b"[{")
+
+def test_fast_json_orm(benchmark, case):
+    schema, objects, _ = case
+    benchmark.extra_info["items"] = PAGE_SIZE
+    body = benchmark(lambda: FastJSONResponse(objects, model=List[schema]).body)
+    assert body.startswith(b"[{")
+
+def test_fast_json_rows(benchmark, case):
+    schema, _, rows = case
+    benchmark.extra_info["items"] = PAGE_SIZE
+    body = benchmark(lambda: FastJSONResponse(rows, model=List[schema]).body)
+    assert body.startswith(b"[{")
+
+def test_outputs_match(bench_loop, case):
+    schema, objects, rows = case
+    expected = json.loads(_fastapi_render(bench_loop, schema, objects))
+    assert json.loads(FastJSONResponse(objects, model=List[schema]).body) == expected
+    assert json.loads(FastJSONResponse(rows, model=List[schema]).body) == expected
@@ -0,0 +1,59 @@
+"""pytest-benchmark micro-benchmarks for service-layer hot paths.
+
+Run from backend/ with:
+
+    python -m pytest benchmarks/bench_services.py --benchmark-json=services.json
+
+Compare runs with `pytest-benchmark compare`.
+"""
+import pytest
+from app import crud
+from app.services.forum import ForumService
+from app.services.profile import ProfileService
+
+# Low ids are the heavy hitters in the seeded dataset
+HOT_USER_ID = 1
+
+@pytest.fixture
+def forum():
+    return ForumService()
+
+def test_forum_posts_first_page(benchmark, run, forum):
+    posts = benchmark(run, lambda db: forum.get_posts(db, skip=0, limit=20))
+    assert len(posts) == 20
+
+def test_forum_posts_deep_offset(benchmark, run, forum, bench_config):
+    skip = bench_config.posts // 2
+    posts = benchmark(run, lambda db: forum.get_posts(db, skip=skip, limit=20))
+    assert len(posts) == 20
+
+def test_forum_posts_by_likes(benchmark, run, forum):
+    posts = benchmark(run, lambda db: forum.get_posts(db, limit=20, sort_by="likes"))
+    assert len(posts) == 20
+
+def test_forum_posts_cursor_page(benchmark, run, forum):
+    _, cursor = run(lambda db: forum.get_posts_page(db, cursor="", limit=20))
+    posts, _ = benchmark(run, lambda db: forum.get_posts_page(db, cursor=cursor, limit=20))
+    assert len(posts) == 20
+
+def test_forum_post_detail(benchmark, run, forum):
+    post = benchmark(run, lambda db: forum.get_post(db, 1))
+    assert post.id == 1
+
+def test_crud_posts_first_page(benchmark, run):
+    posts = benchmark(run, lambda db: crud.get_posts(db, skip=0, limit=20))
+    assert len(posts) == 20
+
+def test_profile_hot_user(benchmark, run):
+    profile = ProfileService()
+    data = benchmark(run, lambda db: profile.get_user_profile(db, HOT_USER_ID))
+    assert data["user"]["id"] == HOT_USER_ID
+
+def test_profile_stats_hot_user(benchmark, run):
+    profile = ProfileService()
+    stats = benchmark(run, lambda db: profile.get_user_stats(db, HOT_USER_ID))
+    assert stats["posts"] > 0
+
+def test_admin_dashboard_stats(benchmark, run):
+    admin = pytest.importorskip("app.services.admin")
+    benchmark(run, lambda db: admin.get_dashboard_stats(db))
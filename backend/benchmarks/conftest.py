@@ -0,0 +1,57 @@
+import asyncio
+import os
+import pytest
+from .dataset import SeedConfig
+
+# Micro-benchmarks use a smaller dataset than load runs; BENCH_SCALE grows it
+BENCH_SCALE = float(os.getenv("BENCH_SCALE", "0.25"))
+
+@pytest.fixture(scope="session")
+def bench_loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+@pytest.fixture(scope="session")
+def bench_config() -> SeedConfig:
+    defaults = SeedConfig()
+    return SeedConfig(
+        users=max(int(defaults.users * BENCH_SCALE), 10),
+        posts=max(int(defaults.posts * BENCH_SCALE), 100),
+        comments=int(defaults.comments * BENCH_SCALE),
+        likes=int(defaults.likes * BENCH_SCALE),
+        notifications=int(defaults.notifications * BENCH_SCALE),
+    )
+
+@pytest.fixture(scope="session")
+def bench_engine(bench_loop, bench_config, tmp_path_factory):
+    """Engine on BENCH_DATABASE_URL (a temporary SQLite file by default), seeded once."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from .dataset import seed
+
+    url = os.getenv("BENCH_DATABASE_URL") or f"sqlite+aiosqlite:///{tmp_path_factory.mktemp('bench') / 'bench.db'}"
+    engine = create_async_engine(url)
+    if not os.getenv("BENCH_SKIP_SEED"):
+        bench_loop.run_until_complete(seed(engine, bench_config))
+    yield engine
+    bench_loop.run_until_complete(engine.dispose())
+
+@pytest.fixture
+def run(bench_loop, bench_engine):
+    """Run `call(db)` to completion in a fresh session and return its result.
+
+    Pass it to pytest-benchmark as `benchmark(run, call)` so each round pays
+    for one session checkout, like a request does.
+    """
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import sessionmaker
+
+    factory = sessionmaker(bench_engine, class_=AsyncSession, expire_on_commit=False)
+
+    def execute(call):
+        async def scoped():
+            async with factory() as db:
+                return await call(db)
+        return bench_loop.run_until_complete(scoped())
+
+    return execute
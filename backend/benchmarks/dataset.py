@@ -0,0 +1,170 @@
+import itertools
+import random
+from collections import Counter
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Sequence
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.models import Base, User, Post, Category, Comment, Like, Notification
+
+@dataclass
+class SeedConfig:
+    users: int = 2000
+    posts: int = 20000
+    comments: int = 100000
+    likes: int = 200000
+    notifications: int = 50000
+    categories: int = 12
+    # Exponent of the power law; higher values concentrate activity on fewer rows
+    alpha: float = 1.1
+    days: int = 365
+    batch_size: int = 5000
+    seed: int = 42
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+class PowerLaw:
+    """Draws ids 1..n where id k is picked with weight 1 / k**alpha.
+
+    Low ids are the heavy hitters: user 1 writes the most posts and post 1
+    collects the most comments and likes.
+    """
+
+    def __init__(self, n: int, alpha: float, rng: random.Random):
+        self.ids = range(1, n + 1)
+        self.cum_weights = list(itertools.accumulate(1 / k ** alpha for k in self.ids))
+        self.rng = rng
+
+    def sample(self, k: int) -> List[int]:
+        return self.rng.choices(self.ids, cum_weights=self.cum_weights, k=k)
+
+def _chunks(rows: Sequence[dict], size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+async def seed(engine: AsyncEngine, config: SeedConfig) -> Dict[str, int]:
+    """Recreate the schema and fill it with a synthetic forum.
+
+    Ids are assigned explicitly so scenarios can target the hottest rows
+    (id 1) and the long tail (the highest ids) deterministically.
+    """
+    rng = random.Random(config.seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    span = timedelta(days=config.days).total_seconds()
+
+    def moment(after: datetime = None) -> datetime:
+        start = after or now - timedelta(seconds=span)
+        return start + timedelta(seconds=rng.uniform(0, (now - start).total_seconds()))
+
+    users = [{
+        "id": i,
+        "username": f"user{i}",
+        "email": f"user{i}@example.com",
+        # Not a valid bcrypt hash, so seeded accounts cannot log in
+        "hashed_password": "!",
+        "role": "admin" if i == 1 else "member",
+        "is_active": True,
+        "is_verified": True,
+        "created_at": moment(),
+        "last_login": moment(),
+    } for i in range(1, config.users + 1)]
+
+    categories = [{
+        "id": i,
+        "name": f"category-{i}",
+        "description": f"Benchmark category {i}",
+        "parent_id": None,
+    } for i in range(1, config.categories + 1)]
+
+    authors = PowerLaw(config.users, config.alpha, rng)
+    posts = [{
+        "id": i,
+        "title": f"Post {i}",
+        "content": f"Body of post {i}. " * rng.randint(5, 60),
+        "category_id": category_id,
+        "author_id": author_id,
+        "created_at": created_at,
+        "updated_at": created_at,
+        "views": 0,
+        "likes_count": 0,
+        "comments_count": 0,
+        "last_activity_at": created_at,
+    } for i, author_id, category_id, created_at in zip(
+        range(1, config.posts + 1),
+        authors.sample(config.posts),
+        PowerLaw(config.categories, config.alpha, rng).sample(config.posts),
+        (moment() for _ in range(config.posts))
+    )]
+
+    targets = PowerLaw(config.posts, config.alpha, rng)
+    comments = []
+    for i, post_id, author_id in zip(
+        range(1, config.comments + 1),
+        targets.sample(config.comments),
+        authors.sample(config.comments)
+    ):
+        post = posts[post_id - 1]
+        created_at = moment(post["created_at"])
+        comments.append({
+            "id": i,
+            "content": f"Comment {i} on post {post_id}. " * rng.randint(1, 10),
+            "post_id": post_id,
+            "author_id": author_id,
+            "parent_id": None,
+            "created_at": created_at,
+        })
+        post["last_activity_at"] = max(post["last_activity_at"], created_at)
+
+    # A user likes a post at most once, so duplicate draws are dropped
+    pairs = dict.fromkeys(zip(authors.sample(config.likes), targets.sample(config.likes)))
+    likes = []
+    for i, (user_id, post_id) in enumerate(pairs, start=1):
+        post = posts[post_id - 1]
+        created_at = moment(post["created_at"])
+        likes.append({"id": i, "user_id": user_id, "post_id": post_id, "created_at": created_at})
+        post["last_activity_at"] = max(post["last_activity_at"], created_at)
+
+    for post_id, total in Counter(row["post_id"] for row in comments).items():
+        posts[post_id - 1]["comments_count"] = total
+    for post_id, total in Counter(row["post_id"] for row in likes).items():
+        posts[post_id - 1]["likes_count"] = total
+
+    notifications = [{
+        "id": i,
+        "user_id": user_id,
+        "message": f"Benchmark notification {i}",
+        "read": rng.random() < 0.7,
+        "created_at": moment(),
+    } for i, user_id in zip(
+        range(1, config.notifications + 1),
+        authors.sample(config.notifications)
+    )]
+
+    tables = [
+        (User, users),
+        (Category, categories),
+        (Post, posts),
+        (Comment, comments),
+        (Like, likes),
+        (Notification, notifications),
+    ]
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        for model, rows in tables:
+            for chunk in _chunks(rows, config.batch_size):
+                await conn.execute(insert(model), chunk)
+
+        if engine.dialect.name == "postgresql":
+            # Explicit ids leave the serial sequences behind; move them past the data
+            for model, rows in tables:
+                if rows:
+                    table = model.__tablename__
+                    await conn.execute(text(
+                        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), {len(rows)})"
+                    ))
+
+    return {model.__tablename__: len(rows) for model, rows in tables}
@@ -0,0 +1,117 @@
+import asyncio
+import math
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+import httpx
+
+@dataclass
+class Scenario:
+    name: str
+    path: str
+    params: Dict[str, object] = field(default_factory=dict)
+    # Requests carry a bearer token for this seeded username
+    user: Optional[str] = None
+
+def default_scenarios(counts: Dict[str, int]) -> List[Scenario]:
+    """Endpoints exercised by a load run, sized to the seeded dataset."""
+    deep_offset = max(counts.get("posts", 0) // 2, 0)
+    return [
+        Scenario("health", "/health"),
+        Scenario("posts.offset.first_page", "/api/posts", {"limit": 20}),
+        Scenario("posts.offset.deep_page", "/api/posts", {"skip": deep_offset, "limit": 20}),
+        Scenario("posts.cursor.first_page", "/api/posts", {"cursor": "", "limit": 20}),
+        Scenario("categories", "/api/categories"),
+        # user1 is the most active account in the power-law dataset
+        Scenario("users.me.hot", "/api/users/me", user="user1"),
+        Scenario("notifications.hot", "/api/notifications", {"limit": 20}, user="user1"),
+        Scenario("notifications.cold", "/api/notifications", {"limit": 20}, user=f"user{counts.get('users', 1)}"),
+    ]
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+def summarize(latencies: List[float], statuses: Counter, elapsed: float) -> Dict[str, object]:
+    latencies = sorted(latencies)
+    ms = lambda seconds: round(seconds * 1000, 3)
+    return {
+        "requests": len(latencies),
+        "errors": sum(count for code, count in statuses.items() if code >= 500),
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())},
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": ms(sum(latencies) / len(latencies)) if latencies else 0.0,
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p90_ms": ms(percentile(latencies, 90)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "max_ms": ms(latencies[-1]) if latencies else 0.0,
+    }
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    headers: Dict[str, str],
+    requests: int,
+    concurrency: int,
+    warmup: int
+) -> Dict[str, object]:
+    """Issue `requests` GETs from `concurrency` workers and summarize latency."""
+    for _ in range(warmup):
+        await client.get(scenario.path, params=scenario.params, headers=headers)
+
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    # Workers share one iterator, so exactly `requests` calls are made in total
+    pending = iter(range(requests))
+
+    async def worker():
+        for _ in pending:
+            started = time.perf_counter()
+            response = await client.get(scenario.path, params=scenario.params, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, statuses, time.perf_counter() - started)
+
+async def run_load(
+    database_url: str,
+    scenarios: Sequence[Scenario],
+    requests: int = 500,
+    concurrency: int = 10,
+    warmup: int = 20
+) -> Dict[str, Dict[str, object]]:
+    """Drive the real ASGI app in-process against `database_url`.
+
+    The app is imported after DATABASE_URL is set so its engine points at
+    the benchmark database. Startup events (periodic jobs) are not run, and
+    the working directory must be backend/ for the static files mount.
+    """
+    os.environ["DATABASE_URL"] = database_url
+    from app.main import app
+    from app.database import engine
+    from app.services.security import create_access_token
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for scenario in scenarios:
+                headers = {}
+                if scenario.user:
+                    token = create_access_token({"sub": scenario.user})
+                    headers["Authorization"] = f"Bearer {token}"
+                results[scenario.name] = {
+                    "path": scenario.path,
+                    "params": scenario.params,
+                    **await run_scenario(client, scenario, headers, requests, concurrency, warmup)
+                }
+    finally:
+        await engine.dispose()
+    return results
@@ -0,0 +1,63 @@
+import json
+import platform
+import subprocess
+from datetime import datetime
+from typing import Dict, Optional
+
+# Metrics compared between reports; for throughput higher is better
+COMPARED_METRICS = ("throughput_rps", "p50_ms", "p99_ms")
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def build_report(
+    database_url: str,
+    dataset: Dict[str, object],
+    settings: Dict[str, object],
+    results: Dict[str, Dict[str, object]]
+) -> Dict[str, object]:
+    return {
+        "generated_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "commit": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        # Only the driver, never the credentials
+        "database": database_url.split("://", 1)[0],
+        "dataset": dataset,
+        "settings": settings,
+        "endpoints": results,
+    }
+
+def write_report(report: Dict[str, object], path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def load_report(path: str) -> Dict[str, object]:
+    with open(path) as f:
+        return json.load(f)
+
+def compare(base: Dict[str, object], head: Dict[str, object]) -> str:
+    """Per-endpoint table of metric changes from `base` to `head`."""
+    lines = [f"{base.get('commit') or 'base'} -> {head.get('commit') or 'head'}"]
+    header = f"{'endpoint':<32}" + "".join(f"{metric:>28}" for metric in COMPARED_METRICS)
+    lines += [header, "-" * len(header)]
+
+    for name, after in head["endpoints"].items():
+        before = base["endpoints"].get(name)
+        if before is None:
+            lines.append(f"{name:<32}  (new)")
+            continue
+        cells = []
+        for metric in COMPARED_METRICS:
+            old, new = before[metric], after[metric]
+            change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+            cells.append(f"{old:>10.2f} -> {new:>8.2f} {change:>7}")
+        lines.append(f"{name:<32}" + "".join(f"{cell:>28}" for cell in cells))
+    return "\n".join(lines)
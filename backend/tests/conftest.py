@@ -0,0 +1,127 @@
+"""Shared fixtures: the app on a throwaway SQLite database.
+
+Settings are read at import time, so the environment is set up before
+anything from `app` is imported.
+"""
+import os
+import tempfile
+
+_db_dir = tempfile.mkdtemp(prefix="rianzel-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_dir}/test.db"
+os.environ.setdefault("NOTIFICATION_FANOUT", "eager")
+os.environ.setdefault("RESPONSE_CACHE_BACKEND", "memory")
+os.environ.setdefault("REALTIME_BROKER", "memory")
+os.environ.setdefault("VIEW_COUNTER_BACKEND", "memory")
+os.environ.setdefault("COMPRESSION_ENABLED", "false")
+
+import asyncio
+from datetime import datetime
+import pytest
+from fastapi.testclient import TestClient
+
+def _reset_caches() -> None:
+    """In-process caches outlive a test's database, so start each test empty."""
+    from app.services import categories, notification_counts, profile_cache, response_cache, search, security, views
+
+    categories.invalidate_category_tree()
+    notification_counts._cache.clear()
+    profile_cache._profile_cache.clear()
+    response_cache._backend = None
+    response_cache._inflight.clear()
+    search._indexes.clear()
+    security._token_cache.clear()
+    security._principal_cache.clear()
+    views._buffer = None
+
+async def _reset_schema() -> None:
+    from app.database import engine
+    from app.models import Base
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    # Pooled connections belong to this loop; the app opens its own
+    await engine.dispose()
+
+@pytest.fixture
+def client():
+    from app.database import engine
+    from app.main import app
+
+    asyncio.run(_reset_schema())
+    _reset_caches()
+    with TestClient(app) as client:
+        yield client
+        client.portal.call(engine.dispose)
+
+@pytest.fixture
+def fresh_caches():
+    """Empty in-process caches, for tests that drive the app without `client`."""
+    _reset_caches()
+
+@pytest.fixture
+def db_call(client):
+    """Run `call(db)` on the app's event loop in a fresh session."""
+    from app.database import SessionLocal
+
+    def run(call):
+        async def scoped():
+            async with SessionLocal() as db:
+                return await call(db)
+        return client.portal.call(scoped)
+
+    return run
+
+@pytest.fixture
+def make(db_call):
+    """Insert rows and return them: make(Model, field=value, ...)."""
+
+    def create(model, **fields):
+        async def insert(db):
+            obj = model(**fields)
+            db.add(obj)
+            await db.commit()
+            await db.refresh(obj)
+            return obj
+        return db_call(insert)
+
+    return create
+
+@pytest.fixture
+def user(make):
+    from app.models import User
+    return make(User, username="alice", email="alice@example.com", hashed_password="x", is_active=True)
+
+@pytest.fixture
+def auth_headers(user):
+    from app.services.security import create_access_token
+    return {"Authorization": f"Bearer {create_access_token({'sub': user.username})}"}
+
+@pytest.fixture
+def token(user):
+    from app.services.security import create_access_token
+    return create_access_token({"sub": user.username})
+
+@pytest.fixture
+def category(make):
+    from app.models import Category
+    return make(Category, name="general", description="General talk")
+
+@pytest.fixture
+def make_post(make, user, category):
+    from app.models import Post
+
+    def create(**fields):
+        values = {
+            "title": "Hello",
+            "content": "First post",
+            "category_id": category.id,
+            "author_id": user.id,
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow(),
+            "views": 0,
+            **fields,
+        }
+        return make(Post, **values)
+
+    return create
@@ -0,0 +1,95 @@
+import pytest
+from app.models import User, Role, ModerationLog
+
+@pytest.fixture
+def admin_headers(make):
+    from app.services.security import create_access_token
+    admin = make(User, username="root", email="root@example.com", hashed_password="x", role="admin", is_active=True)
+    return {"Authorization": f"Bearer {create_access_token({'sub': admin.username})}"}
+
+def test_admin_routes_require_an_admin(client, auth_headers):
+    assert client.get("/api/v1/admin/dashboard/stats").status_code == 401
+    assert client.get("/api/v1/admin/dashboard/stats", headers=auth_headers).status_code == 403
+
+def test_dashboard_and_logs(client, admin_headers, make_post):
+    make_post()
+    stats = client.get("/api/v1/admin/dashboard/stats", headers=admin_headers)
+    assert stats.status_code == 200
+    assert stats.json()["total_posts"] == 1
+
+    logs = client.get("/api/v1/admin/logs/activity", params={"sort_by": "nope"}, headers=admin_headers)
+    assert logs.status_code == 200
+    assert logs.json()["total"] == 0
+
+def test_role_lifecycle(client, admin_headers, user, db_call):
+    created = client.post(
+        "/api/v1/admin/roles",
+        json={"name": "editor", "description": "Edits posts", "permissions": ["posts:edit"]},
+        headers=admin_headers
+    )
+    assert created.status_code == 200
+    role_id = created.json()["id"]
+
+    listed = client.get("/api/v1/admin/roles", headers=admin_headers).json()
+    assert [role["name"] for role in listed["roles"]] == ["editor"]
+
+    assigned = client.post(
+        "/api/v1/admin/roles/assign",
+        json={"user_id": user.id, "role_id": role_id, "reason": "helps out"},
+        headers=admin_headers
+    )
+    assert assigned.status_code == 200
+    assert db_call(lambda db: db.get(User, user.id)).role == "editor"
+    assignments = client.get("/api/v1/admin/roles/assignments", headers=admin_headers).json()
+    assert assignments["total"] == 1
+
+    # Assigned roles cannot be deleted
+    assert client.delete(f"/api/v1/admin/roles/{role_id}", headers=admin_headers).status_code == 400
+    assert db_call(lambda db: db.get(Role, role_id)) is not None
+
+def test_category_management(client, admin_headers, make_post, category):
+    created = client.post(
+        "/api/v1/admin/categories",
+        json={"name": "news", "parent_id": category.id},
+        headers=admin_headers
+    )
+    assert created.status_code == 200
+    news_id = created.json()["id"]
+    make_post()
+
+    listed = client.get("/api/v1/admin/categories", headers=admin_headers).json()
+    counts = {row["name"]: (row["posts_count"], row["subcategories_count"]) for row in listed["categories"]}
+    assert counts == {"general": (1, 1), "news": (0, 0)}
+
+    renamed = client.put(f"/api/v1/admin/categories/{news_id}", json={"name": "updates"}, headers=admin_headers)
+    assert renamed.json()["name"] == "updates"
+    assert client.delete(f"/api/v1/admin/categories/{category.id}", headers=admin_headers).status_code == 400
+    assert client.delete(f"/api/v1/admin/categories/{news_id}", headers=admin_headers).status_code == 204
+
+def test_moderation_updates_content_and_logs_it(client, admin_headers, make_post, db_call):
+    post = make_post()
+    response = client.post(
+        "/api/v1/admin/moderation/action",
+        json={"content_id": post.id, "content_type": "post", "action": "reject", "reason": "spam"},
+        headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "rejected"
+
+    logs = client.get("/api/v1/admin/moderation/logs", headers=admin_headers).json()
+    assert [(log["action"], log["reason"]) for log in logs["logs"]] == [("reject", "spam")]
+    assert client.post(
+        "/api/v1/admin/moderation/action",
+        json={"content_id": post.id, "content_type": "post", "action": "shred"},
+        headers=admin_headers
+    ).status_code == 400
+
+def test_ban_and_unban(client, admin_headers, auth_headers, user):
+    banned = client.post(
+        f"/api/v1/admin/users/{user.id}/ban",
+        params={"reason": "abuse", "duration": 7},
+        headers=admin_headers
+    )
+    assert banned.json() == {"id": user.id, "is_active": False}
+    unbanned = client.post(f"/api/v1/admin/users/{user.id}/unban", headers=admin_headers)
+    assert unbanned.json() == {"id": user.id, "is_active": True}
@@ -0,0 +1,74 @@
+from datetime import datetime
+from sqlalchemy import func, insert, select
+from app.models import AnalyticsBucket, AnalyticsWatermark, Post
+from app.services import analytics
+
+def _posts_counted(db_call):
+    async def total(db):
+        query = select(func.sum(AnalyticsBucket.value)).where(
+            AnalyticsBucket.metric == "posts", AnalyticsBucket.granularity == "day"
+        )
+        return (await db.execute(query)).scalar() or 0
+    return db_call(total)
+
+def test_rollup_counts_late_commits_once(client, make_post, db_call):
+    make_post(id=1)
+    make_post(id=2)
+    # Id 3 was handed out to a transaction that has not committed yet
+    make_post(id=4)
+
+    assert db_call(analytics.rollup_analytics)["posts"] == 3
+    assert _posts_counted(db_call) == 3
+    watermark = db_call(lambda db: db.get(AnalyticsWatermark, "posts"))
+    assert (watermark.last_id, watermark.pending_ids) == (4, [3])
+
+    make_post(id=3)
+    make_post(id=5)
+    assert db_call(analytics.rollup_analytics)["posts"] == 2
+    assert _posts_counted(db_call) == 5
+
+    # Nothing new: re-running appends nothing
+    assert db_call(analytics.rollup_analytics)["posts"] == 0
+    assert _posts_counted(db_call) == 5
+    assert db_call(lambda db: db.get(AnalyticsWatermark, "posts")).pending_ids == []
+
+def test_rollup_forgets_gaps_past_the_overlap(client, make_post, db_call, monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "ANALYTICS_ROLLUP_OVERLAP", 2)
+
+    make_post(id=1)
+    make_post(id=5)
+    db_call(analytics.rollup_analytics)
+    # Only ids within two of the watermark are still awaited
+    assert db_call(lambda db: db.get(AnalyticsWatermark, "posts")).pending_ids == [4]
+
+def test_rollup_in_batches_matches_a_single_pass(client, make_post, db_call):
+    for post_id in range(1, 8):
+        make_post(id=post_id, created_at=datetime(2026, 1, 1, post_id))
+
+    processed = db_call(lambda db: analytics.rollup_analytics(db, batch_size=3))
+    assert processed["posts"] == 7
+    assert _posts_counted(db_call) == 7
+    assert db_call(lambda db: db.get(AnalyticsWatermark, "posts")).last_id == 7
+
+def test_rollup_counts_a_row_committed_mid_batch_once(client, make_post, db_call, user, monkeypatch):
+    make_post(id=1)
+    make_post(id=3)
+    present_ids = analytics._present_ids
+
+    async def commit_in_between(db, model, lower, upper):
+        present = await present_ids(db, model, lower, upper)
+        if model is not Post:
+            return present
+        # Id 2 commits after the ids were read but before the rows are
+        await db.execute(insert(Post).values(id=2, title="Late", content="x", author_id=user.id))
+        return present
+    monkeypatch.setattr(analytics, "_present_ids", commit_in_between)
+
+    # Id 2 is left pending by the batch and picked up by the next pass
+    assert db_call(analytics.rollup_analytics)["posts"] == 3
+    assert _posts_counted(db_call) == 3
+    monkeypatch.undo()
+
+    assert db_call(analytics.rollup_analytics)["posts"] == 0
+    assert _posts_counted(db_call) == 3
@@ -0,0 +1,10 @@
+def test_app_imports():
+    from app.main import app
+    assert app.title
+
+def test_app_starts_and_reports_health(client):
+    response = client.get("/health")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "healthy"
+    assert "realtime" in body
@@ -0,0 +1,29 @@
+"""Smoke run of the benchmark harness on a tiny dataset.
+
+It only checks that every scenario still answers successfully, so a
+change that turns a benchmarked endpoint into a stream of 500s fails
+here rather than producing a meaningless report.
+"""
+import asyncio
+import os
+from sqlalchemy.ext.asyncio import create_async_engine
+from benchmarks.dataset import SeedConfig, seed
+from benchmarks.load import default_scenarios, run_load
+
+TINY = SeedConfig(users=20, posts=60, comments=120, likes=120, notifications=60, categories=3, days=30)
+
+def test_load_harness_smoke(fresh_caches):
+    url = os.environ["DATABASE_URL"]
+
+    async def smoke():
+        engine = create_async_engine(url)
+        try:
+            counts = await seed(engine, TINY)
+        finally:
+            await engine.dispose()
+        return await run_load(url, default_scenarios(counts), requests=4, concurrency=2, warmup=1)
+
+    results = asyncio.run(smoke())
+    assert set(results) == {scenario.name for scenario in default_scenarios({})}
+    failures = {name: result["status_codes"] for name, result in results.items() if result["status_codes"] != {"200": 4}}
+    assert failures == {}
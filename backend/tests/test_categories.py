@@ -0,0 +1,48 @@
+from app.models import Category, User
+from app.services import categories
+
+def _titles(response):
+    return sorted(post["title"] for post in response.json())
+
+def test_category_feed_expands_subcategories_only_on_request(client, make, make_post, category):
+    from app.services.security import create_access_token
+    admin = make(User, username="root", email="root@example.com", hashed_password="x", role="admin", is_active=True)
+    admin_headers = {"Authorization": f"Bearer {create_access_token({'sub': admin.username})}"}
+    make_post(title="In general")
+    # Fixture rows bypass the services, so drop the tree warmed at startup
+    categories.invalidate_category_tree()
+
+    # Loads the category tree before the subcategory exists
+    assert _titles(client.get("/api/v1/posts", params={"category": "general", "include_subcategories": True})) == [
+        "In general"
+    ]
+
+    created = client.post(
+        "/api/v1/admin/categories",
+        json={"name": "news", "parent_id": category.id},
+        headers=admin_headers
+    )
+    make_post(title="In news", category_id=created.json()["id"])
+
+    assert _titles(client.get("/api/v1/posts", params={"category": "general"})) == ["In general"]
+    # The admin write invalidated the cached tree, so the new child is included
+    assert _titles(client.get("/api/v1/posts", params={"category": "general", "include_subcategories": True})) == [
+        "In general", "In news"
+    ]
+    page = client.get("/api/v1/posts", params={"category": "general", "cursor": ""}).json()
+    assert [post["title"] for post in page["posts"]] == ["In general"]
+    assert client.get("/api/v1/posts", params={"category": "missing"}).json() == []
+
+def test_get_category_posts_is_opt_in(client, make, make_post, category, db_call):
+    from app.services.forum import ForumService
+
+    child = make(Category, name="news", parent_id=category.id)
+    make_post(title="In general")
+    make_post(title="In news", category_id=child.id)
+    categories.invalidate_category_tree()
+
+    forum = ForumService()
+    only = db_call(lambda db: forum.get_category_posts(db, category.id))
+    assert [post.title for post in only] == ["In general"]
+    subtree = db_call(lambda db: forum.get_category_posts(db, category.id, include_subcategories=True))
+    assert sorted(post.title for post in subtree) == ["In general", "In news"]
@@ -0,0 +1,50 @@
+def _comment(client, headers, post_id, content, parent_id=None):
+    response = client.post(
+        "/api/v1/comments",
+        json={"content": content, "post_id": post_id, "parent_id": parent_id},
+        headers=headers
+    )
+    assert response.status_code == 200
+    return response.json()["id"]
+
+def _shape(nodes):
+    return [(node["content"], _shape(node["replies"])) for node in nodes]
+
+def test_comment_thread_nests_and_pages_by_branch(client, auth_headers, make_post):
+    post = make_post()
+    first = _comment(client, auth_headers, post.id, "first")
+    reply = _comment(client, auth_headers, post.id, "reply", first)
+    _comment(client, auth_headers, post.id, "nested", reply)
+    _comment(client, auth_headers, post.id, "second")
+
+    url = f"/api/v1/posts/{post.id}/comments"
+    whole = client.get(url).json()
+    assert _shape(whole["comments"]) == [
+        ("first", [("reply", [("nested", [])])]),
+        ("second", []),
+    ]
+    assert whole["next_cursor"] is None
+
+    page = client.get(url, params={"limit": 2}).json()
+    assert _shape(page["comments"]) == [("first", [("reply", [])])]
+    # Both open branches can be continued on their own
+    top = page["comments"][0]
+    assert top["replies_cursor"] == page["next_cursor"]
+    assert top["replies"][0]["replies_cursor"] == page["next_cursor"]
+
+    branch = client.get(url, params={"parent_id": reply, "cursor": page["next_cursor"]}).json()
+    assert _shape(branch["comments"]) == [("nested", [])]
+
+    rest = client.get(url, params={"cursor": page["next_cursor"]}).json()
+    assert [(node["content"], node["parent_id"]) for node in rest["comments"]] == [
+        ("nested", reply),
+        ("second", None),
+    ]
+
+def test_comment_thread_rejects_a_parent_from_another_post(client, auth_headers, make_post):
+    post = make_post()
+    other = make_post(title="Other")
+    parent = _comment(client, auth_headers, other.id, "elsewhere")
+
+    response = client.get(f"/api/v1/posts/{post.id}/comments", params={"parent_id": parent})
+    assert response.status_code == 404
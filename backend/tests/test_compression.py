@@ -0,0 +1,94 @@
+import gzip
+import zlib
+import brotli
+import pytest
+from app.utils.compression import CompressionMiddleware, CompressionStats, negotiate
+
+TEXT = b'{"message": "hello"}' * 200
+
+def _app(chunks, content_type="application/json", headers=()):
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", content_type.encode()), *headers],
+        })
+        for index, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": index < len(chunks) - 1})
+    return app
+
+async def _request(app, accept_encoding="br, gzip"):
+    """Run one GET through the middleware; returns (headers, body messages)."""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else [],
+    }
+    await CompressionMiddleware(app, minimum_size=100, stats=CompressionStats())(scope, receive, send)
+    headers = {name.decode().lower(): value.decode() for name, value in sent[0]["headers"]}
+    return headers, [message.get("body", b"") for message in sent[1:]]
+
+def test_negotiation_prefers_the_servers_order_among_accepted_codings():
+    assert negotiate("gzip, br", ("br", "gzip")) == "br"
+    assert negotiate("br;q=0, gzip", ("br", "gzip")) == "gzip"
+    assert negotiate("*;q=0.5", ("br", "gzip")) == "br"
+    assert negotiate("identity", ("br", "gzip")) is None
+    assert negotiate(None, ("br", "gzip")) is None
+
+@pytest.mark.parametrize("accept, encoding, decode", [
+    ("br, gzip", "br", brotli.decompress),
+    ("gzip", "gzip", gzip.decompress),
+])
+async def test_whole_bodies_are_compressed_with_the_negotiated_coding(accept, encoding, decode):
+    headers, bodies = await _request(_app([TEXT]), accept)
+    assert headers["content-encoding"] == encoding
+    assert headers["vary"] == "Accept-Encoding"
+    assert decode(b"".join(bodies)) == TEXT
+    assert int(headers["content-length"]) == len(b"".join(bodies))
+
+async def test_uncompressed_responses_still_vary_on_accept_encoding():
+    headers, bodies = await _request(_app([TEXT]), accept_encoding=None)
+    assert "content-encoding" not in headers
+    assert headers["vary"] == "Accept-Encoding"
+    assert b"".join(bodies) == TEXT
+
+async def test_small_bodies_are_sent_as_is():
+    headers, bodies = await _request(_app([b"{}"]))
+    assert "content-encoding" not in headers
+    assert bodies == [b"{}"]
+
+async def test_streamed_chunks_are_flushed_as_they_arrive():
+    chunks = [b"data: first\n\n", b"data: second\n\n", b""]
+    headers, bodies = await _request(_app(chunks, "text/event-stream"), "gzip")
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+
+    # Each chunk decodes on its own before the stream ends
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    assert decoder.decompress(bodies[0]) == chunks[0]
+    assert decoder.decompress(bodies[1]) == chunks[1]
+    assert decoder.decompress(b"".join(bodies[2:])) + decoder.flush() == b""
+    assert decoder.eof
+
+async def test_incompressible_types_pass_through():
+    image = bytes(range(256)) * 10
+    headers, bodies = await _request(_app([image], "image/png"))
+    assert "content-encoding" not in headers
+    assert "vary" not in headers
+    assert b"".join(bodies) == image
+
+async def test_strong_etags_are_weakened_when_compressed():
+    headers, _ = await _request(_app([TEXT], headers=[(b"etag", b'"v1"')]))
+    assert headers["etag"] == 'W/"v1"'
+
+    headers, _ = await _request(_app([b"{}"], headers=[(b"etag", b'"v1"')]))
+    assert headers["etag"] == '"v1"'
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from app.models import Post, Comment, Like
+from app.services.counters import reconcile_post_counters
+
+def _post(db_call, post_id):
+    return db_call(lambda db: db.get(Post, post_id))
+
+def test_comments_and_likes_keep_the_post_counters(client, auth_headers, make_post, db_call):
+    start = datetime.utcnow() - timedelta(days=1)
+    post = make_post(created_at=start, last_activity_at=start)
+
+    comment = client.post("/api/v1/comments", json={"content": "hi", "post_id": post.id}, headers=auth_headers)
+    assert comment.status_code == 200
+    assert client.post("/api/v1/likes", json={"post_id": post.id}, headers=auth_headers).status_code == 200
+    counted = _post(db_call, post.id)
+    assert (counted.comments_count, counted.likes_count) == (1, 1)
+    assert counted.last_activity_at > start
+
+    assert client.delete(f"/api/v1/likes/{post.id}", headers=auth_headers).status_code == 204
+    assert client.delete(f"/api/v1/comments/{comment.json()['id']}", headers=auth_headers).status_code == 204
+    uncounted = _post(db_call, post.id)
+    assert (uncounted.comments_count, uncounted.likes_count) == (0, 0)
+    # Removing activity does not move it back
+    assert uncounted.last_activity_at == counted.last_activity_at
+
+def test_reconciler_repairs_drifted_counters_and_activity(client, make, make_post, user, db_call):
+    start = datetime(2026, 1, 1)
+    drifted = make_post(created_at=start, likes_count=5)
+    liked = make_post(created_at=start, last_activity_at=start)
+    current = make_post(created_at=start, last_activity_at=start + timedelta(days=9))
+    make(Comment, content="c", post_id=drifted.id, author_id=user.id, created_at=start + timedelta(days=1))
+    make(Like, post_id=liked.id, user_id=user.id, created_at=start + timedelta(days=2))
+    make(Like, post_id=current.id, user_id=user.id, created_at=start + timedelta(days=3))
+
+    async def drift(db):
+        await db.execute(update(Post).where(Post.id == drifted.id).values(last_activity_at=None))
+        # The like on `current` bypassed bump_counters
+        await db.execute(update(Post).where(Post.id == current.id).values(likes_count=0))
+        await db.commit()
+    db_call(drift)
+
+    assert db_call(lambda db: reconcile_post_counters(db, batch_size=2)) == 3
+    rows = {post_id: _post(db_call, post_id) for post_id in (drifted.id, liked.id, current.id)}
+    assert (rows[drifted.id].likes_count, rows[drifted.id].comments_count) == (0, 1)
+    assert rows[drifted.id].last_activity_at == start + timedelta(days=1)
+    assert (rows[liked.id].likes_count, rows[liked.id].last_activity_at) == (1, start + timedelta(days=2))
+    # Activity newer than any source row is left alone
+    assert (rows[current.id].likes_count, rows[current.id].last_activity_at) == (1, start + timedelta(days=9))
+
+    assert db_call(reconcile_post_counters) == 0
@@ -0,0 +1,41 @@
+import pytest
+from sqlalchemy import select
+from app.models import Notification, User
+from app.services import fanout
+
+@pytest.fixture
+def liker(make):
+    return make(User, username="bob", email="bob@example.com", hashed_password="x", is_active=True)
+
+def _groups(db_call, user_id):
+    async def load(db):
+        rows = await db.execute(
+            select(Notification.group_key, Notification.group_count).where(Notification.user_id == user_id)
+        )
+        return rows.all()
+    return db_call(load)
+
+def test_failures_after_the_commit_do_not_fail_the_batch(client, db_call, make_post, user, liker, monkeypatch):
+    post = make_post()
+
+    def unavailable(*user_ids):
+        raise ConnectionError("cache down")
+    monkeypatch.setattr(fanout, "invalidate_notification_counts", unavailable)
+
+    event = {"kind": "like", "actor_id": liker.id, "post_id": post.id}
+    assert db_call(lambda db: fanout.process_events(db, [event, event])) == 1
+    assert _groups(db_call, user.id) == [(f"like:{post.id}", 2)]
+
+def test_commit_failures_are_not_retried(client, db_call, make_post, user, liker, monkeypatch):
+    post = make_post()
+
+    async def run(db):
+        async def failing_commit():
+            raise ConnectionError("connection lost during commit")
+        monkeypatch.setattr(db, "commit", failing_commit)
+        await fanout.process_events(db, [{"kind": "like", "actor_id": liker.id, "post_id": post.id}])
+
+    with pytest.raises(fanout.FanoutCommitError):
+        db_call(run)
+    assert fanout.FanoutCommitError in fanout.fanout_task.dont_autoretry_for
+    assert _groups(db_call, user.id) == []
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from app.models import LoginAttempt
+from app.services import login_attempts
+
+def _attempt(make, username, ip_address, age_minutes):
+    return make(
+        LoginAttempt,
+        username=username,
+        ip_address=ip_address,
+        created_at=datetime.utcnow() - timedelta(minutes=age_minutes)
+    )
+
+def test_failures_are_counted_by_username_or_ip_within_the_window(client, make, db_call):
+    _attempt(make, "alice", "10.0.0.1", 5)
+    _attempt(make, "alice", "10.0.0.2", 30)
+    _attempt(make, "mallory", "10.0.0.1", 10)
+    _attempt(make, "bob", "10.0.0.3", 10)
+    # Past the 60 minute window
+    _attempt(make, "alice", "10.0.0.1", 90)
+
+    count = lambda username, ip: db_call(lambda db: login_attempts.count_failed_attempts(db, username, ip))
+    assert count("alice", "10.0.0.9") == 2
+    assert count("nobody", "10.0.0.1") == 2
+    assert count("alice", "10.0.0.1") == 3
+    assert count("nobody", "10.0.0.9") == 0
+
+def test_the_in_memory_counter_serves_counts(client, db_call, monkeypatch):
+    monkeypatch.setattr(login_attempts.settings, "LOGIN_ATTEMPT_COUNTER", "memory")
+    monkeypatch.setattr(login_attempts, "_counter", None)
+
+    async def fail_twice():
+        await login_attempts.note_failed_attempt("alice", "10.0.0.1")
+        await login_attempts.note_failed_attempt("alice", "10.0.0.2")
+    db_call(lambda db: fail_twice())
+
+    count = lambda username, ip: db_call(lambda db: login_attempts.count_failed_attempts(db, username, ip))
+    assert count("alice", "10.0.0.9") == 2
+    assert count("bob", "10.0.0.1") == 1
+
+def test_prune_deletes_expired_attempts_in_batches(client, make, db_call):
+    for _ in range(5):
+        _attempt(make, "alice", "10.0.0.1", 120)
+    recent = _attempt(make, "alice", "10.0.0.1", 5)
+
+    assert db_call(lambda db: login_attempts.prune_login_attempts(db, batch_size=2)) == 5
+
+    async def remaining(db):
+        return (await db.execute(select(LoginAttempt.id))).scalars().all()
+    assert db_call(remaining) == [recent.id]
+    assert db_call(lambda db: login_attempts.prune_login_attempts(db)) == 0
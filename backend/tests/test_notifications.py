@@ -0,0 +1,67 @@
+def test_unread_count_revalidates_with_its_etag(client, user, auth_headers):
+    url = "/api/v1/notifications/unread-count"
+    assert client.get(url).status_code == 401
+
+    first = client.get(url, headers=auth_headers)
+    assert first.status_code == 200
+    assert first.json() == 0
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    etag = first.headers["ETag"]
+
+    unchanged = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["ETag"] == etag
+
+    created = client.post("/api/v1/notifications", json={"user_id": user.id, "message": "ping"}).json()
+    changed = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json() == 1
+    assert changed.headers["ETag"] != etag
+
+    client.put(f"/api/v1/notifications/{created['id']}/read", headers=auth_headers)
+    read = client.get(url, headers={**auth_headers, "If-None-Match": changed.headers["ETag"]})
+    assert read.status_code == 200
+    assert read.json() == 0
+    # Back to zero unread: the original validator matches again
+    assert read.headers["ETag"] == etag
+
+def _counts(db_call, user_id):
+    from app.repositories import UserRepository
+    return db_call(lambda db: UserRepository(db).notification_counts(user_id))
+
+def test_bulk_writes_keep_the_user_counters(client, make, user, db_call):
+    from app.models import User
+    from app.services.notification import NotificationService
+    bob = make(User, username="bob", email="bob@example.com", hashed_password="x", is_active=True)
+    service = NotificationService()
+
+    assert db_call(lambda db: service.notify_users(db, [user.id, bob.id, user.id], "hello")) == 2
+    db_call(lambda db: service.notify_users(db, [user.id], "again"))
+    assert _counts(db_call, user.id) == {"total": 2, "unread": 2}
+    assert _counts(db_call, bob.id) == {"total": 1, "unread": 1}
+
+    db_call(lambda db: service.mark_all_notifications_as_read(db, user.id))
+    assert _counts(db_call, user.id) == {"total": 2, "unread": 0}
+    assert _counts(db_call, bob.id) == {"total": 1, "unread": 1}
+    # Nothing left to flip
+    db_call(lambda db: service.mark_all_notifications_as_read(db, user.id))
+    assert _counts(db_call, user.id) == {"total": 2, "unread": 0}
+
+def test_removing_a_notification_read_in_bulk_keeps_unread(client, make, user, db_call):
+    from app.models import Notification
+    from app.repositories import NotificationRepository
+    make(Notification, user_id=user.id, message="kept", read=False)
+    removed = make(Notification, user_id=user.id, message="gone", read=False)
+    make(Notification, user_id=user.id, message="other", read=False)
+
+    async def read_all_then_remove_one(db):
+        notifications = NotificationRepository(db)
+        # Loaded unread, then flipped by the bulk UPDATE in the same session
+        loaded = await notifications.get(removed.id)
+        await notifications.users.bump_counters(user.id, notifications_count=3, unread_notifications_count=3)
+        await notifications.mark_all_read(user.id)
+        await notifications.remove(loaded)
+        await notifications.commit()
+    db_call(read_all_then_remove_one)
+    assert _counts(db_call, user.id) == {"total": 2, "unread": 0}
@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+def _make_posts(make_post, count):
+    start = datetime.utcnow() - timedelta(hours=count)
+    return [
+        make_post(title=f"Post {i}", created_at=start + timedelta(hours=i), likes_count=i)
+        for i in range(count)
+    ]
+
+def test_public_feed_list_and_cursor_forms(client, make_post):
+    _make_posts(make_post, 3)
+
+    listed = client.get("/api/posts", params={"limit": 2})
+    assert listed.status_code == 200
+    body = listed.json()
+    assert [post["title"] for post in body] == ["Post 2", "Post 1"]
+    assert body[0]["author"] == {"id": body[0]["author_id"], "username": "alice", "role": "member"}
+    assert body[0]["is_liked"] is False
+    assert body[0]["last_activity"] is not None
+
+    first = client.get("/api/posts", params={"cursor": "", "limit": 2}).json()
+    assert [post["title"] for post in first["posts"]] == ["Post 2", "Post 1"]
+    second = client.get("/api/posts", params={"cursor": first["next_cursor"], "limit": 2}).json()
+    assert [post["title"] for post in second["posts"]] == ["Post 0"]
+    assert second["next_cursor"] is None
+
+def test_cursor_is_bound_to_its_sort_order(client, make_post):
+    _make_posts(make_post, 3)
+
+    first = client.get("/api/v1/posts", params={"cursor": "", "limit": 2, "sort_by": "likes"}).json()
+    assert [post["title"] for post in first["posts"]] == ["Post 2", "Post 1"]
+
+    same = client.get("/api/v1/posts", params={"cursor": first["next_cursor"], "limit": 2, "sort_by": "likes"})
+    assert [post["title"] for post in same.json()["posts"]] == ["Post 0"]
+
+    resorted = client.get("/api/v1/posts", params={"cursor": first["next_cursor"], "sort_by": "created_at"})
+    assert resorted.status_code == 400
+    reversed_order = client.get(
+        "/api/v1/posts", params={"cursor": first["next_cursor"], "sort_by": "likes", "order": "asc"}
+    )
+    assert reversed_order.status_code == 400
+    assert client.get("/api/v1/posts", params={"cursor": "not-a-cursor"}).status_code == 400
+
+def test_v1_like_returns_the_like(client, auth_headers, make_post, user):
+    post = make_post()
+    response = client.post("/api/v1/likes", json={"post_id": post.id}, headers=auth_headers)
+    assert response.status_code == 200
+    assert (response.json()["post_id"], response.json()["user_id"]) == (post.id, user.id)
+    assert client.post("/api/v1/likes", json={"post_id": post.id}, headers=auth_headers).status_code == 400
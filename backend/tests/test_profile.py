@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+from app.models import Comment, Like
+
+def test_activity_cursor_pages_across_posts_comments_and_likes(client, make, make_post, user, auth_headers):
+    start = datetime(2026, 1, 1)
+    at = lambda hours: start + timedelta(hours=hours)
+    older = make_post(created_at=at(1))
+    newer = make_post(created_at=at(3))
+    # Ties on created_at across branches order by type, then id
+    first_comment = make(Comment, content="a", post_id=newer.id, author_id=user.id, created_at=at(3))
+    second_comment = make(Comment, content="b", post_id=newer.id, author_id=user.id, created_at=at(3))
+    like = make(Like, post_id=newer.id, user_id=user.id, created_at=at(3))
+    old_like = make(Like, post_id=older.id, user_id=user.id, created_at=at(1))
+    late_comment = make(Comment, content="c", post_id=older.id, author_id=user.id, created_at=at(2))
+
+    expected = [
+        ("post", newer.id, None, None),
+        ("like", newer.id, None, like.id),
+        ("comment", newer.id, second_comment.id, None),
+        ("comment", newer.id, first_comment.id, None),
+        ("comment", older.id, late_comment.id, None),
+        ("post", older.id, None, None),
+        ("like", older.id, None, old_like.id),
+    ]
+    key = lambda item: (item["type"], item["post_id"], item["comment_id"], item["like_id"])
+
+    offset = client.get("/api/v1/profile/activity", headers=auth_headers)
+    assert [key(item) for item in offset.json()] == expected
+
+    seen, cursor = [], ""
+    while cursor is not None:
+        page = client.get(
+            "/api/v1/profile/activity",
+            params={"cursor": cursor, "limit": 2},
+            headers=auth_headers
+        ).json()
+        assert len(page["activity"]) <= 2
+        seen += [key(item) for item in page["activity"]]
+        cursor = page["next_cursor"]
+    assert seen == expected
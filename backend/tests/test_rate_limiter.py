@@ -0,0 +1,120 @@
+from types import SimpleNamespace
+import pytest
+import fakeredis
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app.utils import rate_limiter
+from app.utils.rate_limiter import InMemoryBackend, RateLimitBackend, RedisBackend
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Drive both of the limiter's clocks by hand."""
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(rate_limiter, "time", SimpleNamespace(monotonic=lambda: now.value, time=lambda: now.value))
+    return now
+
+async def test_in_memory_window_rollover(clock):
+    backend = InMemoryBackend()
+    assert await backend.hit("k", 2, 10) == (True, 0.0)
+    assert await backend.hit("k", 2, 10) == (True, 0.0)
+    assert await backend.hit("k", 2, 10) == (False, 10.0)
+
+    # Halfway through the next window the previous one still weighs half
+    clock.value = 1015.0
+    assert await backend.hit("k", 2, 10) == (True, 0.0)
+    assert await backend.hit("k", 2, 10) == (False, 5.0)
+
+    # A window with no hits in between resets the previous count
+    clock.value = 1100.0
+    assert await backend.hit("k", 2, 10) == (True, 0.0)
+    assert backend.counters["k"] == [110, 1, 0]
+
+async def test_in_memory_evicts_least_recently_seen_keys(clock):
+    backend = InMemoryBackend(max_keys=2)
+    await backend.hit("a", 5, 10)
+    await backend.hit("b", 5, 10)
+    await backend.hit("a", 5, 10)
+    await backend.hit("c", 5, 10)
+    assert list(backend.counters) == ["a", "c"]
+
+async def test_redis_sliding_window_script(clock):
+    client = fakeredis.FakeAsyncRedis()
+    backend = RedisBackend(client)
+
+    assert await backend.hit("k", 2, 60) == (True, 0.0)
+    clock.value += 10
+    assert await backend.hit("k", 2, 60) == (True, 0.0)
+    clock.value += 10
+    # The oldest hit leaves the window 40 seconds from now
+    assert await backend.hit("k", 2, 60) == (False, 40.0)
+    assert await client.zcard("ratelimit:k") == 2
+    assert 0 < await client.pttl("ratelimit:k") <= 60000
+
+    clock.value += 41
+    assert await backend.hit("k", 2, 60) == (True, 0.0)
+    assert await client.zcard("ratelimit:k") == 2
+    await client.aclose()
+
+class _BrokenBackend(RateLimitBackend):
+    async def hit(self, key, max_requests, time_window):
+        raise ConnectionError("down")
+
+@pytest.fixture
+def limited_app():
+    app = FastAPI()
+
+    @app.get("/limited")
+    @rate_limiter.rate_limiter(max_requests=2, time_window=60)
+    async def limited(request: Request):
+        return {"ok": True}
+
+    yield TestClient(app)
+    rate_limiter.set_backend(None)
+
+def test_limit_responds_429_with_retry_after(limited_app):
+    rate_limiter.set_backend(InMemoryBackend())
+    assert limited_app.get("/limited").status_code == 200
+    assert limited_app.get("/limited").status_code == 200
+
+    response = limited_app.get("/limited")
+    assert response.status_code == 429
+    assert response.json()["detail"] == "Rate limit exceeded: 2 requests per 60 seconds"
+    assert 1 <= int(response.headers["Retry-After"]) <= 60
+
+def test_unavailable_backend_falls_back_to_in_process_limits(limited_app, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "_fallback", InMemoryBackend())
+    rate_limiter.set_backend(_BrokenBackend())
+    statuses = [limited_app.get("/limited").status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
+
+def test_a_failed_backend_is_skipped_until_the_retry_interval(limited_app, clock, caplog, monkeypatch):
+    class Flaky(RateLimitBackend):
+        calls = 0
+        down = True
+
+        async def hit(self, key, max_requests, time_window):
+            self.calls += 1
+            if self.down:
+                raise ConnectionError("down")
+            return True, 0.0
+
+    monkeypatch.setattr(rate_limiter, "_fallback", InMemoryBackend())
+    monkeypatch.setattr(rate_limiter.settings, "RATE_LIMIT_RETRY_SECONDS", 5)
+    backend = Flaky()
+    rate_limiter.set_backend(backend)
+
+    assert limited_app.get("/limited").status_code == 200
+    assert limited_app.get("/limited").status_code == 200
+    # One attempt and one logged error for the whole interval
+    assert backend.calls == 1
+    assert len([r for r in caplog.records if r.name == rate_limiter.__name__]) == 1
+
+    clock.value += 5
+    assert limited_app.get("/limited").status_code == 429
+    assert backend.calls == 2
+
+    backend.down = False
+    clock.value += 5
+    assert limited_app.get("/limited").status_code == 200
+    assert limited_app.get("/limited").status_code == 200
+    assert backend.calls == 4
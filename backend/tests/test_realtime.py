@@ -0,0 +1,115 @@
+import asyncio
+import time
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+def _wait_for_connections(count, timeout=5.0):
+    from app.services import websocket
+    deadline = time.monotonic() + timeout
+    while websocket.get_hub().stats()["connections"] != count:
+        assert time.monotonic() < deadline, "client never registered with the hub"
+        time.sleep(0.01)
+
+def _notify(client, user, message):
+    response = client.post("/api/v1/notifications", json={"user_id": user.id, "message": message})
+    assert response.status_code == 200
+    return response.json()
+
+def test_websocket_delivers_notifications(client, user, token, auth_headers):
+    with client.websocket_connect(f"/api/v1/notifications/ws?token={token}") as socket:
+        _wait_for_connections(1)
+        created = _notify(client, user, "hello")
+
+        event = socket.receive_json()
+        assert event["type"] == "notification.created"
+        assert event["data"]["id"] == created["id"]
+        assert event["data"]["message"] == "hello"
+
+        client.put(f"/api/v1/notifications/{created['id']}/read", headers=auth_headers)
+        assert socket.receive_json() == {"type": "notification.read", "data": {"id": created["id"]}}
+
+    _wait_for_connections(0)
+
+def test_websocket_sends_heartbeats(client, token, monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "REALTIME_HEARTBEAT_INTERVAL", 0.05)
+
+    with client.websocket_connect(f"/api/v1/notifications/ws?token={token}") as socket:
+        assert socket.receive_json() == {"type": "ping"}
+
+def test_websocket_rejects_a_bad_token(client):
+    with pytest.raises(WebSocketDisconnect) as closed:
+        with client.websocket_connect("/api/v1/notifications/ws?token=nope"):
+            pass
+    assert closed.value.code == 1008
+
+def _open_stream(client, token, until):
+    """Drive the SSE endpoint through the ASGI app until `until(body)` holds.
+
+    TestClient buffers whole responses, so an endless stream is run on the
+    app's loop directly and disconnected once the expected events arrive.
+    """
+    from app.main import app
+
+    async def run():
+        body = bytearray()
+        start = {}
+        done = asyncio.Event()
+        requested = False
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                body.extend(message.get("body", b""))
+                if until(body.decode()):
+                    done.set()
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/api/v1/notifications/stream",
+            "raw_path": b"/api/v1/notifications/stream",
+            "root_path": "",
+            "query_string": f"token={token}".encode(),
+            "headers": [(b"host", b"testserver")],
+            "client": ("testclient", 50000),
+            "server": ("testserver", 80),
+        }
+        await asyncio.wait_for(app(scope, receive, send), timeout=5)
+        return start, body.decode()
+
+    return client.portal.start_task_soon(run)
+
+def test_sse_streams_notifications(client, user, token):
+    stream = _open_stream(client, token, lambda body: "event: notification.created" in body)
+    _wait_for_connections(1)
+    _notify(client, user, "over sse")
+
+    start, body = stream.result(timeout=10)
+    assert start["status"] == 200
+    assert (b"content-type", b"text/event-stream; charset=utf-8") in start["headers"]
+    assert body.startswith("retry: 3000\n\n")
+    assert '"message": "over sse"' in body
+    _wait_for_connections(0)
+
+def test_sse_sends_heartbeats(client, token, monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "REALTIME_HEARTBEAT_INTERVAL", 0.05)
+
+    _, body = _open_stream(client, token, lambda body: ": ping" in body).result(timeout=10)
+    assert ": ping\n\n" in body
+
+def test_sse_requires_a_valid_token(client):
+    assert client.get("/api/v1/notifications/stream", params={"token": "nope"}).status_code == 401
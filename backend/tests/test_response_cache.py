@@ -0,0 +1,65 @@
+from app.models import User
+
+def test_post_detail_miss_hit_and_not_modified(client, make_post):
+    post = make_post()
+
+    miss = client.get(f"/api/posts/{post.id}")
+    assert miss.status_code == 200
+    assert miss.headers["X-Cache"] == "MISS"
+    assert miss.json()["title"] == "Hello"
+
+    hit = client.get(f"/api/posts/{post.id}")
+    assert hit.headers["X-Cache"] == "HIT"
+    assert hit.content == miss.content
+    assert hit.headers["ETag"] == miss.headers["ETag"]
+
+    conditional = client.get(f"/api/posts/{post.id}", headers={"If-None-Match": miss.headers["ETag"]})
+    assert conditional.status_code == 304
+    assert conditional.content == b""
+
+    assert client.get("/api/posts/999").status_code == 404
+
+def test_post_write_invalidates_detail_and_lists(client, make_post, auth_headers):
+    post = make_post()
+    etag = client.get(f"/api/posts/{post.id}").headers["ETag"]
+    assert client.get("/api/posts").json()[0]["title"] == "Hello"
+
+    updated = client.put(f"/api/v1/posts/{post.id}", json={"title": "Edited"}, headers=auth_headers)
+    assert updated.status_code == 200
+
+    detail = client.get(f"/api/posts/{post.id}", headers={"If-None-Match": etag})
+    assert detail.status_code == 200
+    assert detail.headers["X-Cache"] == "MISS"
+    assert detail.json()["title"] == "Edited"
+    assert client.get("/api/posts").json()[0]["title"] == "Edited"
+
+def test_categories_are_cached_until_a_category_is_created(client, make, category):
+    from app.services.security import create_access_token
+    admin = make(User, username="root", email="root@example.com", hashed_password="x", role="admin", is_active=True)
+    admin_headers = {"Authorization": f"Bearer {create_access_token({'sub': admin.username})}"}
+
+    first = client.get("/api/categories")
+    assert first.headers["X-Cache"] == "MISS"
+    assert [row["name"] for row in first.json()] == ["general"]
+    assert client.get("/api/categories").headers["X-Cache"] == "HIT"
+
+    created = client.post("/api/v1/categories", json={"name": "announcements"}, headers=admin_headers)
+    assert created.status_code == 200
+
+    after = client.get("/api/categories")
+    assert after.headers["X-Cache"] == "MISS"
+    assert [row["name"] for row in after.json()] == ["announcements", "general"]
+
+async def test_in_memory_tag_versions_are_bounded_and_never_reused():
+    from app.services.response_cache import CachedResponse, InMemoryResponseCache
+    cache = InMemoryResponseCache(maxsize=2)
+    _, versions = await cache.lookup("k", ["post:1"])
+    await cache.store("k", CachedResponse(b"old", '"e"', "", versions), 60)
+
+    await cache.bump(["post:1"])
+    await cache.bump(["post:2", "post:3"])
+    assert list(cache.versions) == ["post:2", "post:3"]
+
+    # post:1 was evicted after its bump: it must not read as unbumped again
+    entry, current = await cache.lookup("k", ["post:1"])
+    assert entry.versions != current
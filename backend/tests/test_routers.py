@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta
+from app.models import OTP, Notification
+
+def test_v1_routers_are_mounted(client, auth_headers, make_post):
+    make_post()
+    posts = client.get("/api/v1/posts")
+    assert posts.status_code == 200
+    assert [post["title"] for post in posts.json()] == ["Hello"]
+
+    assert client.get("/api/v1/notifications").status_code == 401
+    notifications = client.get("/api/v1/notifications", headers=auth_headers)
+    assert notifications.status_code == 200
+    assert notifications.json()["total_count"] == 0
+
+    profile = client.get("/api/v1/profile", headers=auth_headers)
+    assert profile.status_code == 200
+    assert profile.json()["profile"]["username"] == "alice"
+
+def test_v1_category_create_is_admin_only(client, auth_headers):
+    response = client.post("/api/v1/categories", json={"name": "news"}, headers=auth_headers)
+    assert response.status_code == 403
+
+def test_verify_otp_consumes_the_code(client, db_call, make, user):
+    from app.services.security import generate_otp, verify_otp
+
+    code = generate_otp()
+    assert len(code) == 6 and code.isdigit()
+    make(OTP, user_id=user.id, code=code, expires_at=datetime.utcnow() + timedelta(minutes=5))
+
+    assert db_call(lambda db: verify_otp(db, user.id, code)) is True
+    assert db_call(lambda db: verify_otp(db, user.id, code)) is False
+
+def test_cached_profile_holds_no_orm_objects(client, auth_headers, make, user):
+    from app.services import profile_cache
+
+    make(Notification, user_id=user.id, message="Welcome")
+    first = client.get("/api/v1/profile", headers=auth_headers)
+    cached = profile_cache.get_cached_profile(user.id)
+    assert isinstance(cached["user"], dict) and cached["user"]["username"] == "alice"
+    assert [item["message"] for item in cached["notifications"]] == ["Welcome"]
+
+    second = client.get("/api/v1/profile", headers=auth_headers)
+    assert second.json() == first.json()
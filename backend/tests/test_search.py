@@ -0,0 +1,78 @@
+import pytest
+from app.models import User, Comment
+
+@pytest.fixture
+def admin_headers(make):
+    from app.services.security import create_access_token
+    admin = make(User, username="root", email="root@example.com", hashed_password="x", role="admin", is_active=True)
+    return {"Authorization": f"Bearer {create_access_token({'sub': admin.username})}"}
+
+def _search(client, q, **params):
+    response = client.get("/api/search", params={"q": q, **params})
+    assert response.status_code == 200
+    return response.json()
+
+def test_title_matches_rank_first_and_snippets_are_highlighted(client, make_post):
+    body_match = make_post(title="Weekend", content="Learning <python> the slow way")
+    title_match = make_post(title="Python tips", content="Short ones")
+    make_post(title="Unrelated", content="Nothing here")
+
+    results = _search(client, "python")["results"]
+    assert [hit["id"] for hit in results] == [title_match.id, body_match.id]
+    assert results[0]["type"] == "post"
+    assert results[1]["snippet"] == "Learning <mark>&lt;python&gt;</mark> the slow way"
+
+def test_every_query_term_must_match(client, make_post):
+    both = make_post(title="Async python", content="x")
+    make_post(title="Python", content="x")
+
+    assert [hit["id"] for hit in _search(client, "python async")["results"]] == [both.id]
+    assert _search(client, "   ")["results"] == []
+
+def test_cursor_pages_on_score_then_id(client, make_post):
+    posts = [make_post(title=f"Post {i}", content="shared " * (i % 2 + 1)) for i in range(5)]
+
+    first = _search(client, "shared")
+    expected = [hit["id"] for hit in first["results"]]
+    # Equal scores fall back to id, highest first
+    assert expected == [posts[i].id for i in (3, 1, 4, 2, 0)]
+
+    seen, cursor = [], ""
+    while cursor is not None:
+        page = _search(client, "shared", limit=2, **({"cursor": cursor} if cursor else {}))
+        assert len(page["results"]) <= 2
+        seen += [hit["id"] for hit in page["results"]]
+        cursor = page["next_cursor"]
+    assert seen == expected
+
+def test_comment_search_and_unknown_types(client, make, make_post, user):
+    post = make_post()
+    comment = make(Comment, content="Great answer", post_id=post.id, author_id=user.id)
+
+    [hit] = _search(client, "answer", type="comment")["results"]
+    assert (hit["type"], hit["id"], hit["post_id"], hit["title"]) == ("comment", comment.id, post.id, None)
+    assert client.get("/api/search", params={"q": "answer", "type": "user"}).status_code == 400
+
+def test_fallback_index_follows_writes_and_moderation(client, auth_headers, admin_headers, make_post):
+    post = make_post(title="Draft", content="Old words")
+    assert _search(client, "old")["results"]
+
+    updated = client.put(f"/api/v1/posts/{post.id}", json={"content": "New words"}, headers=auth_headers)
+    assert updated.status_code == 200
+    assert _search(client, "old")["results"] == []
+    assert [hit["id"] for hit in _search(client, "new")["results"]] == [post.id]
+
+    rejected = client.post(
+        "/api/v1/admin/moderation/action",
+        json={"content_id": post.id, "content_type": "post", "action": "reject", "reason": "spam"},
+        headers=admin_headers
+    )
+    assert rejected.status_code == 200
+    assert _search(client, "new")["results"] == []
+
+    client.post(
+        "/api/v1/admin/moderation/action",
+        json={"content_id": post.id, "content_type": "post", "action": "approve"},
+        headers=admin_headers
+    )
+    assert [hit["id"] for hit in _search(client, "new")["results"]] == [post.id]
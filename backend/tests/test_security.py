@@ -0,0 +1,54 @@
+import pytest
+from app.models import User, Role
+from app.services import security
+from app.utils.worker_pool import BoundedExecutor
+
+def test_a_full_password_pool_sheds_load_with_503(client, auth_headers, monkeypatch):
+    full = BoundedExecutor(max_workers=1, max_pending=0, name="bcrypt-test")
+    monkeypatch.setattr(security, "password_hash_pool", full)
+
+    response = client.put("/api/v1/profile", json={"password": "N3w-password"}, headers=auth_headers)
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert full.stats()["rejected"] == 1
+
+async def test_login_rehashes_passwords_made_with_another_cost(monkeypatch, fresh_caches):
+    monkeypatch.setattr(security.settings, "BCRYPT_ROUNDS", 4)
+    user = User(username="carol", hashed_password=security.get_password_hash("S3cret-pass"))
+    monkeypatch.setattr(security.settings, "BCRYPT_ROUNDS", 5)
+
+    assert await security.rehash_password_if_needed(user, "S3cret-pass") is True
+    assert user.hashed_password.startswith("$2b$05$")
+    assert security.verify_password("S3cret-pass", user.hashed_password)
+    # Current hashes are left alone
+    assert await security.rehash_password_if_needed(user, "S3cret-pass") is False
+
+def test_logout_drops_the_cached_token_and_principal(client, auth_headers, token, user):
+    assert client.get("/api/v1/profile", headers=auth_headers).status_code == 200
+    assert security._principal_cache.get(user.username) is not None
+    assert security._token_cache.get(security._token_key(token)) is not None
+
+    # What the logout handler does once the refresh token is cleared
+    security.forget_token(token)
+    security.invalidate_user_cache(user.username)
+    assert security._principal_cache.get(user.username) is None
+    assert security._token_cache.get(security._token_key(token)) is None
+
+@pytest.fixture
+def admin_headers(make):
+    admin = make(User, username="root", email="root@example.com", hashed_password="x", role="admin", is_active=True)
+    return {"Authorization": f"Bearer {security.create_access_token({'sub': admin.username})}"}
+
+def test_a_role_change_applies_to_the_next_request(client, make, auth_headers, admin_headers, user):
+    stats = "/api/v1/admin/dashboard/stats"
+    # Caches alice's principal with the member role
+    assert client.get(stats, headers=auth_headers).status_code == 403
+
+    role = make(Role, name="admin", permissions=[])
+    assigned = client.post(
+        "/api/v1/admin/roles/assign",
+        json={"user_id": user.id, "role_id": role.id},
+        headers=admin_headers
+    )
+    assert assigned.status_code == 200
+    assert client.get(stats, headers=auth_headers).status_code == 200
@@ -0,0 +1,40 @@
+from app.schemas import forum as forum_schemas
+from app.schemas import notification as notification_schemas
+
+def test_v1_post_list_renders_exactly_the_schema(client, make_post):
+    post = make_post(likes_count=3)
+
+    response = client.get("/api/v1/posts")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    [row] = response.json()
+    # Column-only select: every schema field, nothing else from the row
+    assert set(row) == set(forum_schemas.Post.model_fields)
+    assert row["id"] == post.id
+    assert row["likes_count"] == 3
+    assert row["created_at"] == post.created_at.isoformat()
+
+def test_v1_post_cursor_page_renders_the_envelope(client, make_post):
+    make_post(title="Older")
+    make_post(title="Newer")
+
+    page = client.get("/api/v1/posts", params={"cursor": "", "limit": 1}).json()
+    assert set(page) == {"posts", "next_cursor"}
+    assert [post["title"] for post in page["posts"]] == ["Newer"]
+    assert set(page["posts"][0]) == set(forum_schemas.Post.model_fields)
+
+    last = client.get("/api/v1/posts", params={"cursor": page["next_cursor"], "limit": 1}).json()
+    assert [post["title"] for post in last["posts"]] == ["Older"]
+    assert last["next_cursor"] is None
+
+def test_v1_notification_list_renders_the_envelope(client, user, auth_headers):
+    client.post("/api/v1/notifications", json={"user_id": user.id, "message": "one"})
+    client.post("/api/v1/notifications", json={"user_id": user.id, "message": "two"})
+
+    response = client.get("/api/v1/notifications", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    body = response.json()
+    assert (body["total_count"], body["unread_count"]) == (2, 2)
+    assert sorted(row["message"] for row in body["notifications"]) == ["one", "two"]
+    assert all(set(row) == set(notification_schemas.Notification.model_fields) for row in body["notifications"])
@@ -0,0 +1,26 @@
+from sqlalchemy import func, select
+from app import crud
+from app.models import Comment, Like, Notification, User
+
+def test_deleting_a_user_cascades_to_their_rows(client, make, make_post, user, db_call):
+    other = make(User, username="bob", email="bob@example.com", hashed_password="x", is_active=True)
+    own_post = make_post()
+    other_post = make_post(title="Bob's", author_id=other.id)
+    parent = make(Comment, content="mine", post_id=other_post.id, author_id=user.id, path="1")
+    reply = make(Comment, content="reply", post_id=other_post.id, author_id=other.id, parent_id=parent.id, path="1.2")
+    make(Comment, content="on alice's post", post_id=own_post.id, author_id=other.id, path="3")
+    make(Like, post_id=other_post.id, user_id=user.id)
+    make(Like, post_id=own_post.id, user_id=other.id)
+    make(Notification, user_id=user.id, message="hi")
+
+    assert db_call(lambda db: crud.delete_user(db, user.id)) is True
+
+    async def count(db, model):
+        return (await db.execute(select(func.count()).select_from(model))).scalar_one()
+
+    assert [post.title for post in db_call(lambda db: crud.get_posts(db))] == ["Bob's"]
+    # Rows on alice's post go with it; bob's reply to her comment is kept
+    assert db_call(lambda db: count(db, Comment)) == 1
+    assert db_call(lambda db: db.get(Comment, reply.id)).parent_id is None
+    assert db_call(lambda db: count(db, Like)) == 0
+    assert db_call(lambda db: count(db, Notification)) == 0
@@ -0,0 +1,67 @@
+import pytest
+from app.models import Post
+
+@pytest.fixture(autouse=True)
+def fresh_viewers(monkeypatch):
+    from app.services import views
+    from app.utils.bloom import RotatingBloomFilter
+    monkeypatch.setattr(views, "_recent_viewers", RotatingBloomFilter(capacity=1000, window=60))
+
+def test_views_are_buffered_deduplicated_and_flushed(client, make_post, db_call):
+    from app.services import views
+
+    post = make_post()
+    url = f"/api/v1/posts/{post.id}/views"
+
+    assert client.get(url, headers={"User-Agent": "a"}).json()["views"] == 1
+    # The same viewer refreshing inside the dedup window is not counted again
+    assert client.get(url, headers={"User-Agent": "a"}).json()["views"] == 1
+    assert client.get(url, headers={"User-Agent": "b"}).json()["views"] == 2
+
+    # Still buffered: the row is untouched until a flush
+    assert db_call(lambda db: db.get(Post, post.id)).views == 0
+    assert db_call(views.flush_views) == 1
+    assert db_call(lambda db: db.get(Post, post.id)).views == 2
+    assert db_call(views.flush_views) == 0
+
+    assert client.get(url, headers={"User-Agent": "c"}).json()["views"] == 3
+    assert client.get("/api/v1/posts/999/views").status_code == 404
+
+class _FailingSession:
+    """Session proxy whose `execute` or `commit` raises."""
+
+    def __init__(self, db, fail):
+        self.db = db
+        self.fail = fail
+
+    async def execute(self, *args, **kwargs):
+        if self.fail == "execute":
+            raise RuntimeError("update failed")
+        return await self.db.execute(*args, **kwargs)
+
+    async def commit(self):
+        if self.fail == "commit":
+            raise RuntimeError("commit failed")
+        await self.db.commit()
+
+    async def rollback(self):
+        await self.db.rollback()
+
+def test_flush_restores_only_when_the_update_fails(client, make_post, db_call):
+    from app.services import views
+
+    post = make_post()
+
+    async def record_and_flush(db, fail):
+        await views.record_view(post.id)
+        with pytest.raises(RuntimeError):
+            await views.flush_views(_FailingSession(db, fail))
+        return await views.pending_views(post.id)
+
+    # The UPDATE never ran: the view is back in the buffer
+    assert db_call(lambda db: record_and_flush(db, "execute")) == 1
+    assert db_call(views.flush_views) == 1
+    assert db_call(lambda db: db.get(Post, post.id)).views == 1
+
+    # The commit's outcome is unknown: never restored, so never counted twice
+    assert db_call(lambda db: record_and_flush(db, "commit")) == 0